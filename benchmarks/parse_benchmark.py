@@ -0,0 +1,67 @@
+"""Compare the parse time per episode of the full and fast parse paths of the origins.
+
+Save some episode pages of each origin under a fixtures directory, one
+folder per origin code, and run:
+
+    python benchmarks/parse_benchmark.py FIXTURES_DIRECTORY [-r REPEATS]
+
+For example fixtures/syosetu_ncode/1.html, fixtures/kakuyomu/1.html and
+fixtures/jjwxc/1.html. The contents extracted by both paths are checked
+to be the same.
+"""
+
+import argparse
+import os
+import time
+
+from bs4 import BeautifulSoup
+
+from gptwntranslator.origins.base_web_origin import FAST_PARSER
+from gptwntranslator.origins.jjwxc_origin import JJWXCOrigin
+from gptwntranslator.origins.kakuyomu_origin import KakuyomuOrigin
+from gptwntranslator.origins.syosetu_ncode_origin import SyosetuNCodeOrigin
+
+
+ORIGINS = [SyosetuNCodeOrigin, KakuyomuOrigin, JJWXCOrigin]
+
+def time_parse(origin, html, fast, repeats):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        if fast:
+            soup = BeautifulSoup(html, FAST_PARSER, parse_only=origin.sub_chapter_strainer)
+        else:
+            soup = BeautifulSoup(html, "html.parser")
+        contents = origin._get_sub_chapter_contents(soup)
+    return (time.perf_counter() - start) / repeats, contents
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the parsing of saved episode pages")
+    parser.add_argument("fixtures", type=str, help="Directory with one folder of saved episode pages per origin code")
+    parser.add_argument("-r", "--repeats", type=int, default=10, help="Times each page is parsed")
+    args = parser.parse_args()
+
+    print(f"Fast parser: {FAST_PARSER}")
+    print(f"{'origin':<16}{'pages':>6}{'full ms':>10}{'fast ms':>10}{'speedup':>9}")
+    for origin_class in ORIGINS:
+        directory = os.path.join(args.fixtures, origin_class.code)
+        if not os.path.isdir(directory):
+            continue
+
+        origin = origin_class()
+        full_time = fast_time = 0.0
+        pages = sorted(name for name in os.listdir(directory) if name.endswith(".html"))
+        for name in pages:
+            with open(os.path.join(directory, name), "rb") as f:
+                html = origin._decode_html(f.read())
+            page_full_time, full_contents = time_parse(origin, html, False, args.repeats)
+            page_fast_time, fast_contents = time_parse(origin, html, True, args.repeats)
+            if full_contents != fast_contents:
+                print(f"Warning: {origin_class.code}/{name} parses differently on the fast path")
+            full_time += page_full_time
+            fast_time += page_fast_time
+
+        if pages:
+            print(f"{origin_class.code:<16}{len(pages):>6}{full_time / len(pages) * 1000:>10.2f}{fast_time / len(pages) * 1000:>10.2f}{full_time / fast_time:>8.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Compare the time to count the tokens of the lines of a text per call and in batches.
+
+The per call path looks the encoding of the model up and encodes each line
+on its own, as the token counting helpers used to. The batched path takes
+the encoding from the process wide registry and counts every line in one
+call. Run it on any text, for example the contents of a sub chapter:
+
+    python benchmarks/token_count_benchmark.py TEXT_FILE [-m MODEL] [-r REPEATS]
+
+The counts of both paths are checked to be the same.
+"""
+
+import argparse
+import time
+
+import tiktoken
+
+from gptwntranslator.api.openai_api import count_tokens_many, get_encoding
+
+
+def time_per_call(lines, model, repeats):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        counts = [len(tiktoken.encoding_for_model(model).encode(line)) for line in lines]
+    return (time.perf_counter() - start) / repeats, counts
+
+def time_batched(lines, model, repeats):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        counts = count_tokens_many(lines, encoding=get_encoding(model))
+    return (time.perf_counter() - start) / repeats, counts
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the token counting of the lines of a text")
+    parser.add_argument("text_file", type=str, help="Text file whose lines are counted")
+    parser.add_argument("-m", "--model", type=str, default="gpt-3.5-turbo", help="Model whose encoding is used")
+    parser.add_argument("-r", "--repeats", type=int, default=10, help="Times the lines are counted")
+    args = parser.parse_args()
+
+    with open(args.text_file, "r", encoding="utf-8") as f:
+        lines = f.read().splitlines()
+
+    # The first lookup builds the encoding, so both paths are timed with it built
+    get_encoding(args.model)
+
+    per_call_time, per_call_counts = time_per_call(lines, args.model, args.repeats)
+    batched_time, batched_counts = time_batched(lines, args.model, args.repeats)
+    if per_call_counts != batched_counts:
+        print("Warning: the batched counts differ from the per call counts")
+
+    print(f"Model: {args.model}, lines: {len(lines)}, tokens: {sum(batched_counts)}")
+    print(f"{'path':<12}{'ms':>10}{'speedup':>9}")
+    print(f"{'per call':<12}{per_call_time * 1000:>10.2f}{1:>8.1f}x")
+    print(f"{'batched':<12}{batched_time * 1000:>10.2f}{per_call_time / batched_time:>8.1f}x")
+
+if __name__ == "__main__":
+    main()
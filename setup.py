@@ -17,6 +17,7 @@ setup(
     packages=find_packages(where="src"),
     package_dir={"": "src"},
     install_requires=[
+        "aiohttp==3.8.4",
         "asciimatics==1.14.0",
         "beautifulsoup4==4.12.2",
         "Janome==0.4.2",
@@ -44,6 +45,10 @@ setup(
     extras_require={
         "dev": [
         ],
+        "fast": [
+            "Brotli==1.0.9",
+            "lxml==4.9.2",
+        ],
     },
     classifiers=[
         "Programming Language :: Python :: 3",
@@ -61,6 +61,21 @@ This tool supports two main modes: interactive and command. You can also access
 
         gptwntranslator c -v sm syosetu_ncode n5177as
 
+    Scrape only the chapters that are new, empty, or updated on the novel index since they were stored using the
+    -i or --incremental flag. The skipped chapters are listed when done:
+
+        gptwntranslator c sc -i syosetu_ncode n5177as 1-200
+
+    Pipeline the translation of chapters using the -p or --pipeline flag. Each sub-chapter moves to the terms and
+    translation stages as soon as its own summary is ready, instead of waiting for every target at each stage:
+
+        gptwntranslator c tc -p syosetu_ncode n5177as 1-200
+
+    Ask the API again instead of answering from the response cache using the -r or --refresh flag, for example
+    to redo translations after purging them. The new answers replace the cached ones:
+
+        gptwntranslator c tc -r syosetu_ncode n5177as 1-200
+
 Both modes support the following optional arguments:
 
     -cf, --config-file PATH     Specify the path to a custom configuration file
@@ -121,15 +136,19 @@ def main():
     sc_parser.add_argument("origin", type=str, help="Provide the novel origin (check help for supported origins)")
     sc_parser.add_argument("novel", type=str, help="Provide the novel identifier (e.g., n5177as)")
     sc_parser.add_argument("chapters", type=str, help="Specify chapters to process (e.g., '1:1,3,5-7;2-4;5:1-3,6;6-8')")
+    sc_parser.add_argument("-i", "--incremental", action="store_true", help="Only scrape the sub chapters that are new, empty or updated on the novel index since they were stored")
 
     tm_parser = actions_parser.add_parser("tm", help="Translate metadata", aliases=["translate-metadata"])
     tm_parser.add_argument("origin", type=str, help="Provide the novel origin (check help for supported origins)")
     tm_parser.add_argument("novel", type=str, help="Provide the novel identifier (e.g., n5177as)")
+    tm_parser.add_argument("-r", "--refresh", action="store_true", help="Ask the API again instead of answering from the response cache")
 
     tc_parser = actions_parser.add_parser("tc", help="Translate chapters", aliases=["translate-chapters"])
     tc_parser.add_argument("origin", type=str, help="Provide the novel origin (check help for supported origins)")
     tc_parser.add_argument("novel", type=str, help="Provide the novel identifier (e.g., n5177as)")
     tc_parser.add_argument("chapters", type=str, help="Specify chapters to process (e.g., '1:1,3,5-7;2-4;5:1-3,6;6-8')")
+    tc_parser.add_argument("-p", "--pipeline", action="store_true", help="Move each sub chapter through summary, terms and translation as soon as it is ready, instead of waiting for every target at each stage")
+    tc_parser.add_argument("-r", "--refresh", action="store_true", help="Ask the API again instead of answering from the response cache")
 
     ec_parser = actions_parser.add_parser("ec", help="Export chapters", aliases=["export-chapters"])
     ec_parser.add_argument("origin", type=str, help="Provide the novel origin (check help for supported origins)")
@@ -220,11 +239,11 @@ def main():
         if args.action == "sm":
             run_scrape_metadata(args.origin, args.novel)
         elif args.action == "sc":
-            run_scrape_chapters(args.origin, args.novel, args.chapters)
+            run_scrape_chapters(args.origin, args.novel, args.chapters, args.incremental)
         elif args.action == "tm":
-            run_translate_metadata(args.origin, args.novel)
+            run_translate_metadata(args.origin, args.novel, args.refresh)
         elif args.action == "tc":
-            run_translate_chapters(args.origin, args.novel, args.chapters)
+            run_translate_chapters(args.origin, args.novel, args.chapters, args.pipeline, args.refresh)
         elif args.action == "ec":
             run_export_chapters(args.origin, args.novel, args.chapters)
 
@@ -1,16 +1,42 @@
+import asyncio
+import contextvars
+import os
+import threading
+import aiohttp
 import openai
 import tiktoken
 
+from gptwntranslator.helpers.circuit_breaker_helper import CircuitBreakers
 from gptwntranslator.helpers.config_helper import Config
 from gptwntranslator.helpers.logger_helper import CustomLogger
+from gptwntranslator.helpers.rate_limit_helper import RateLimiter
+from gptwntranslator.storage.response_cache import ResponseCache
 
 logger = CustomLogger(__name__)
 
+_encodings = {}
+_encodings_lock = threading.Lock()
+_async_semaphore = contextvars.ContextVar("async_semaphore", default=None)
+# Errors telling that the endpoint itself is unhealthy, as opposed to the request being wrong
+_unhealthy_errors = (openai.error.APIError, openai.error.Timeout, openai.error.APIConnectionError, openai.error.ServiceUnavailableError)
+
 class OpenAI_APIException(Exception):
     pass
 
 def initialize(api_key):
     openai.api_key = api_key
+    cf = Config()
+    models = cf.data.config.openai.models
+    if models:
+        RateLimiter().configure(models)
+    circuit_breaker = cf.data.config.openai.circuit_breaker
+    if circuit_breaker:
+        CircuitBreakers().configure(circuit_breaker.failure_threshold or 5, circuit_breaker.reset_timeout or 30)
+    response_cache = cf.data.config.openai.response_cache or {}
+    persistent_file_path = cf.vars.get("persistent_file_path")
+    if persistent_file_path and response_cache.get("enabled", True):
+        cache_directory = os.path.join(os.path.dirname(os.path.abspath(persistent_file_path)), "response_cache")
+        ResponseCache().initialize(cache_directory, int(response_cache.get("max_size_mb", 256) * 1024 * 1024))
 
 def validate_model(model: dict) -> bool:
     """Validate a model dictionary and see if it has a correct structure.
@@ -41,6 +67,10 @@ def validate_model(model: dict) -> bool:
         return False
     if not isinstance(model["max_tokens"], int):
         return False
+    if model.get("rpm") is not None and not isinstance(model["rpm"], int):
+        return False
+    if model.get("tpm") is not None and not isinstance(model["tpm"], int):
+        return False
 
     return True
 
@@ -53,20 +83,64 @@ def get_model(model):
         raise OpenAI_APIException(f"Model {model} not available")
     return available_models[model]
 
+def get_encoding(model="gpt-3.5-turbo"):
+    """Get the tiktoken encoding for a model, building it only once per process.
+
+    Parameters
+    ----------
+    model : str, optional
+        The name of the model, by default "gpt-3.5-turbo"
+
+    Returns
+    -------
+    tiktoken.Encoding
+        The encoding of the model, or cl100k_base if the model is unknown to tiktoken.
+    """
+
+    encoding = _encodings.get(model)
+    if encoding is None:
+        with _encodings_lock:
+            encoding = _encodings.get(model)
+            if encoding is None:
+                try:
+                    encoding = tiktoken.encoding_for_model(model)
+                except KeyError:
+                    encoding = tiktoken.get_encoding("cl100k_base")
+                _encodings[model] = encoding
+    return encoding
+
+def count_tokens_many(lines, model="gpt-3.5-turbo", encoding=None):
+    """Count the tokens of many lines in a single batched encoder call.
+
+    Parameters
+    ----------
+    lines : list[str]
+        The lines to count the tokens of.
+    model : str, optional
+        The name of the model, by default "gpt-3.5-turbo"
+    encoding : tiktoken.Encoding, optional
+        The encoding to use, by default the cached encoding of the model
+
+    Returns
+    -------
+    list[int]
+        The token count of each line.
+    """
+
+    if encoding is None:
+        encoding = get_encoding(model)
+    if not lines:
+        return []
+    return [len(tokens) for tokens in encoding.encode_batch(lines)]
+
 def get_line_token_count(line, model="gpt-3.5-turbo", encoding=None):
     if encoding is None:
-        try:
-            encoding = tiktoken.encoding_for_model(model)
-        except KeyError:
-            encoding = tiktoken.get_encoding("cl100k_base")
+        encoding = get_encoding(model)
     return len(encoding.encode(line))
 
 def get_message_token_count(message, model="gpt-3.5-turbo", encoding=None):
     if encoding is None:
-        try:
-            encoding = tiktoken.encoding_for_model(model)
-        except KeyError:
-            encoding = tiktoken.get_encoding("cl100k_base")
+        encoding = get_encoding(model)
     num_tokens = 4
     for key, value in message.items():
         num_tokens += len(encoding.encode(value))
@@ -76,10 +150,7 @@ def get_message_token_count(message, model="gpt-3.5-turbo", encoding=None):
 
 def get_text_token_count(text, model="gpt-3.5-turbo", encoding=None):
     if encoding is None:
-        try:
-            encoding = tiktoken.encoding_for_model(model)
-        except KeyError:
-            encoding = tiktoken.get_encoding("cl100k_base")
+        encoding = get_encoding(model)
     num_tokens = 0
     for line in text.splitlines():
         num_tokens += len(encoding.encode(line))
@@ -87,23 +158,195 @@ def get_text_token_count(text, model="gpt-3.5-turbo", encoding=None):
 
 def get_messages_token_count(messages, model="gpt-3.5-turbo", encoding=None):
     if encoding is None:
-        try:
-            encoding = tiktoken.encoding_for_model(model)
-        except KeyError:
-            encoding = tiktoken.get_encoding("cl100k_base")
+        encoding = get_encoding(model)
     num_tokens = 0
     for message in messages:
         num_tokens += get_message_token_count(message, model, encoding)
     num_tokens += 2
     return num_tokens
 
-def call_api(messages, model="gpt-3.5-turbo"):
+def _reserve_tokens(messages, model):
+    limiter = RateLimiter().get(model)
+    if limiter is None:
+        return None, 0
+    return limiter, get_messages_token_count(messages, model)
+
+def _settle_tokens(limiter, reserved_tokens, response):
+    if limiter is None:
+        return
+    try:
+        used_tokens = response['usage']['total_tokens']
+    except (KeyError, TypeError):
+        return
+    limiter.adjust(reserved_tokens, used_tokens)
+
+def _record_outcome(breaker, error):
+    if error is None:
+        breaker.record_success()
+    elif isinstance(error, _unhealthy_errors):
+        breaker.record_failure()
+    else:
+        breaker.release()
+
+def get_retry_after(error):
+    """Get the seconds the server asked to wait before retrying.
+
+    Parameters
+    ----------
+    error : Exception
+        The error raised by the API.
+
+    Returns
+    -------
+    float
+        The seconds from the Retry-After header, or None if there is no usable header.
+    """
+
+    headers = getattr(error, "headers", None)
+    if not headers:
+        return None
+    value = next((value for key, value in headers.items() if key.lower() == "retry-after"), None)
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+def call_api(messages, model="gpt-3.5-turbo", refresh=False):
+    cache = ResponseCache()
+    response = None if refresh else cache.get(model, messages)
+    if response is not None:
+        logger.debug(f"Serving OpenAI API call from the response cache")
+        return response
+    breaker = CircuitBreakers().get(model)
+    breaker.before_call()
+    limiter, reserved_tokens = _reserve_tokens(messages, model)
+    if limiter is not None:
+        limiter.acquire(reserved_tokens)
     try:
         response = openai.ChatCompletion.create(
             model=model,
             messages=messages,
         )  
+    except Exception as e:
+        _record_outcome(breaker, e)
+        logger.warning(f"OpenAI API call failed: {e}")
+        raise e
+    except BaseException:
+        breaker.release()
+        raise
+    _record_outcome(breaker, None)
+    _settle_tokens(limiter, reserved_tokens, response)
+    cache.set(model, messages, response)
+    return response
+
+async def acall_api(messages, model="gpt-3.5-turbo", refresh=False):
+    """Call the chat completion API as a coroutine.
+
+    When running inside an AsyncAPISession the request reuses the session's
+    pooled connections and waits for a free concurrency slot. Like call_api,
+    it answers from the response cache when it can, fails fast while the
+    circuit breaker of the model is open and first waits for the rate
+    limiter budgets of the model.
+
+    Parameters
+    ----------
+    messages : list[dict]
+        The messages to send.
+    model : str, optional
+        The name of the model, by default "gpt-3.5-turbo"
+    refresh : bool, optional
+        Whether to skip the cached response and ask the API again, storing the new answer, by default False
+
+    Returns
+    -------
+    dict
+        The API response.
+    """
+
+    cache = ResponseCache()
+    response = None if refresh else cache.get(model, messages)
+    if response is not None:
+        logger.debug(f"Serving OpenAI API call from the response cache")
         return response
+    breaker = CircuitBreakers().get(model)
+    breaker.before_call()
+    limiter, reserved_tokens = _reserve_tokens(messages, model)
+    if limiter is not None:
+        await limiter.aacquire(reserved_tokens)
+    semaphore = _async_semaphore.get()
+    try:
+        if semaphore is None:
+            response = await openai.ChatCompletion.acreate(model=model, messages=messages)
+        else:
+            async with semaphore:
+                response = await openai.ChatCompletion.acreate(model=model, messages=messages)
     except Exception as e:
+        _record_outcome(breaker, e)
         logger.warning(f"OpenAI API call failed: {e}")
         raise e
+    except BaseException:
+        breaker.release()
+        raise
+    _record_outcome(breaker, None)
+    _settle_tokens(limiter, reserved_tokens, response)
+    cache.set(model, messages, response)
+    return response
+
+class AsyncAPISession:
+    """Async context manager sharing one keep-alive HTTP session between every acall_api made inside it."""
+
+    def __init__(self, max_concurrency: int=32) -> None:
+        """Initialize an AsyncAPISession object.
+
+        Parameters
+        ----------
+        max_concurrency : int, optional
+            The maximum amount of requests in flight at once, by default 32
+        """
+
+        # Validate parameters
+        if not isinstance(max_concurrency, int):
+            raise TypeError("Max concurrency must be an integer")
+        if max_concurrency <= 0:
+            raise ValueError("Max concurrency must be greater than 0")
+
+        self.max_concurrency = max_concurrency
+        self._session = None
+        self._session_token = None
+        self._semaphore_token = None
+
+    async def __aenter__(self) -> "AsyncAPISession":
+        connector = aiohttp.TCPConnector(limit=self.max_concurrency, keepalive_timeout=60)
+        self._session = aiohttp.ClientSession(connector=connector)
+        self._session_token = openai.aiosession.set(self._session)
+        self._semaphore_token = _async_semaphore.set(asyncio.Semaphore(self.max_concurrency))
+        logger.info(f"Opened async API session with max_concurrency={self.max_concurrency}")
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        _async_semaphore.reset(self._semaphore_token)
+        openai.aiosession.reset(self._session_token)
+        await self._session.close()
+        logger.info(f"Closed async API session")
+
+def run_async(coroutine, max_concurrency: int=32):
+    """Run a coroutine to completion inside an AsyncAPISession.
+
+    Parameters
+    ----------
+    coroutine : Coroutine
+        The coroutine to run.
+    max_concurrency : int, optional
+        The maximum amount of requests in flight at once, by default 32
+
+    Returns
+    -------
+    object
+        The result of the coroutine.
+    """
+
+    async def runner():
+        async with AsyncAPISession(max_concurrency):
+            return await coroutine
+
+    return asyncio.run(runner())
@@ -1,4 +1,3 @@
-import copy
 import os
 import sys
 
@@ -8,19 +7,31 @@ from gptwntranslator.helpers.file_helper import write_md_as_epub
 from gptwntranslator.helpers.text_helper import parse_chapters, write_novel_md
 from gptwntranslator.origins.origin_factory import OriginFactory
 from gptwntranslator.storage.json_storage import JsonStorage, JsonStorageException, JsonStorageFileException, JsonStorageFormatException
+from gptwntranslator.storage.chunk_checkpoint import ChunkCheckpoints
+from gptwntranslator.storage.plan_cache import PlanCache
+from gptwntranslator.storage.scrape_cache import ScrapeCache
 from gptwntranslator.translators.gpt_translator import GPTTranslatorSingleton
 
+def retries_message(retry_counts: dict[tuple[int, int], int]) -> str:
+    retried = {key: count for key, count in retry_counts.items() if count}
+    if not retried:
+        return ""
+    return f" Retried {sum(retried.values())} times across {len(retried)} of {len(retry_counts)} sub chapters."
+
 def setup() -> None:
     print("Initializing... ", end="")
     sys.stdout.flush()
     cf = Config()
     storage = JsonStorage()
     storage.initialize(cf.vars["persistent_file_path"])
+    PlanCache().initialize(os.path.join(os.path.dirname(os.path.abspath(cf.vars["persistent_file_path"])), "plan_cache.json"))
+    ChunkCheckpoints().initialize(os.path.join(os.path.dirname(os.path.abspath(cf.vars["persistent_file_path"])), "checkpoints"))
     cf.load(cf.vars["config_file_path"])
+    ScrapeCache().initialize(os.path.join(os.path.dirname(os.path.abspath(cf.vars["persistent_file_path"])), "scrape_cache"), int(((cf.data.config.scraper or {}).get("cache_max_size_mb") or 128) * 1024 * 1024))
     cf.vars["target_language"] = cf.get_language_name_for_code(cf.data.config.translator.target_language)
     openai_api.initialize(cf.data.config.openai.api_key)
     try:
-        storage.get_data()
+        storage.get_index()
         print("success.")
         return
     except JsonStorageFormatException as e:
@@ -54,7 +65,7 @@ def run_scrape_metadata(novel_origin: str, novel_code: str) -> None:
     try:
         print("(1/3) Loading local storage... ", end="")
         storage = JsonStorage()
-        novels = storage.get_data()
+        novel_stored = any(entry["novel_origin"] == novel_origin and entry["novel_code"] == novel_code for entry in storage.get_index())
         print("success.")
     except Exception as e:
         print("failed.")
@@ -74,9 +85,8 @@ def run_scrape_metadata(novel_origin: str, novel_code: str) -> None:
     try:
         print("(3/3) Saving novel data to local storage... ", end="")
         sys.stdout.flush()
-        if any(novel_old.novel_code == novel_data.novel_code and novel_old.novel_origin == novel_data.novel_origin for novel_old in novels):
-            novel_original = [novel for novel in novels if novel.novel_code == novel_code and novel.novel_origin == novel_origin][0]
-            novel_old = copy.deepcopy(novel_original)
+        if novel_stored:
+            novel_old = storage.get_novel(novel_origin, novel_code).snapshot()
             novel_old.title = novel_data.title
             novel_old.author = novel_data.author
             novel_old.description = novel_data.description
@@ -85,9 +95,7 @@ def run_scrape_metadata(novel_origin: str, novel_code: str) -> None:
                 if chapter not in novel_old.chapters:
                     novel_old.chapters.append(chapter)
             novel_data = novel_old
-            novels.remove(novel_original)
-        novels.append(novel_data)
-        storage.set_data(novels)
+        storage.save_novel(novel_data)
         print("success.")
     except Exception as e:
         print("failed.")
@@ -96,7 +104,7 @@ def run_scrape_metadata(novel_origin: str, novel_code: str) -> None:
 
     print("Done.")
 
-def run_scrape_chapters(novel_origin: str, novel_code: str, chapter_targets_str: str) -> None:
+def run_scrape_chapters(novel_origin: str, novel_code: str, chapter_targets_str: str, incremental: bool=False) -> None:
     setup()
     origin = OriginFactory.get_origin(novel_origin)
     print(f"Scraping chapters for novel: {novel_code}")
@@ -114,9 +122,8 @@ def run_scrape_chapters(novel_origin: str, novel_code: str, chapter_targets_str:
     try:
         print("(2/4) Loading local storage... ", end="")
         storage = JsonStorage()
-        novels = storage.get_data()
-        novel_old = [novel for novel in novels if novel.novel_code == novel_code and novel.novel_origin == novel_origin][0]
-        novel_data = copy.deepcopy(novel_old)
+        novel_old = storage.get_novel(novel_origin, novel_code)
+        novel_data = novel_old.snapshot()
         print("success.")
     except Exception as e:
         print("failed.")
@@ -124,10 +131,12 @@ def run_scrape_chapters(novel_origin: str, novel_code: str, chapter_targets_str:
         sys.exit(1)
 
     try:
-        print("(3/4) Scraping chapters... ", end="")
+        print("(3/4) Scraping chapters (incremental)... " if incremental else "(3/4) Scraping chapters... ", end="")
         sys.stdout.flush()
-        origin.process_targets(novel_data, chapter_targets)
+        skipped = origin.process_targets(novel_data, chapter_targets, incremental)
         print("success.")
+        if skipped:
+            print(f"Skipped {len(skipped)} sub chapters already up to date: {', '.join(f'{sub_chapter.chapter_index}:{sub_chapter.sub_chapter_index}' for sub_chapter in skipped)}")
     except Exception as e:
         print("failed.")
         print(f"Failed to scrape chapters. {e}")
@@ -136,9 +145,7 @@ def run_scrape_chapters(novel_origin: str, novel_code: str, chapter_targets_str:
     try:
         print(f"(4/4) Saving novel data to local storage... ", end="")
         sys.stdout.flush()
-        novels.remove(novel_old)
-        novels.append(novel_data)
-        storage.set_data(novels)
+        storage.save_novel(novel_data)
         print("success.")
     except Exception as e:
         print("failed.")
@@ -147,16 +154,15 @@ def run_scrape_chapters(novel_origin: str, novel_code: str, chapter_targets_str:
 
     print("Done.")
 
-def run_translate_metadata(novel_origin: str, novel_code: str) -> None:
+def run_translate_metadata(novel_origin: str, novel_code: str, refresh: bool=False) -> None:
     setup()
     print(f"Translating metadata for novel: {novel_code}")
 
     try:
         print(f"(1/4) Loading local storage... ", end="")
         storage = JsonStorage()
-        novels = storage.get_data()
-        novel_old = [novel for novel in novels if novel.novel_code == novel_code and novel.novel_origin == novel_origin][0]
-        novel_data = copy.deepcopy(novel_old)
+        novel_old = storage.get_novel(novel_origin, novel_code)
+        novel_data = novel_old.snapshot()
         print("success.")
     except Exception as e:
         print("failed.")
@@ -168,6 +174,7 @@ def run_translate_metadata(novel_origin: str, novel_code: str) -> None:
         sys.stdout.flush()
         translator = GPTTranslatorSingleton()
         translator.set_original_language(novel_data.original_language)
+        translator.set_refresh_responses(refresh)
         print("success.")
     except Exception as e:
         print("failed.")
@@ -190,9 +197,7 @@ def run_translate_metadata(novel_origin: str, novel_code: str) -> None:
     try:
         print(f"(4/4) Saving novel data to local storage... ", end="")
         sys.stdout.flush()
-        novels.remove(novel_old)
-        novels.append(novel_data)
-        storage.set_data(novels)
+        storage.save_novel(novel_data)
         print("success.")
     except Exception as e:
         print("failed.")
@@ -201,9 +206,10 @@ def run_translate_metadata(novel_origin: str, novel_code: str) -> None:
 
     print("Done.")
 
-def run_translate_chapters(novel_origin: str, novel_code: str, chapter_targets_str: str) -> None:
+def run_translate_chapters(novel_origin: str, novel_code: str, chapter_targets_str: str, pipeline: bool=False, refresh: bool=False) -> None:
     setup()
     print(f"Translating chapters for novel: {novel_code}")
+    pipeline = pipeline or bool(Config().data.config.translator.pipeline)
 
     try:
         print("(1/13) Parsing targets... ", end="")
@@ -218,9 +224,8 @@ def run_translate_chapters(novel_origin: str, novel_code: str, chapter_targets_s
     try:
         print("(2/13) Loading local storage... ", end="")
         storage = JsonStorage()
-        novels = storage.get_data()
-        novel_old = [novel for novel in novels if novel.novel_code == novel_code and novel.novel_origin == novel_origin][0]
-        novel_data = copy.deepcopy(novel_old)
+        novel_old = storage.get_novel(novel_origin, novel_code)
+        novel_data = novel_old.snapshot()
         print("success.")
     except Exception as e:
         print("failed.")
@@ -232,33 +237,38 @@ def run_translate_chapters(novel_origin: str, novel_code: str, chapter_targets_s
         sys.stdout.flush()
         translator = GPTTranslatorSingleton()
         translator.set_original_language(novel_data.original_language)
+        translator.set_refresh_responses(refresh)
         print("success.")
     except Exception as e:
         print("failed.")
         print(f"Failed to initialize translator. {e}")
         sys.exit(1)
 
+    stage_error = "Failed to run the translation pipeline" if pipeline else "Failed to generate summaries"
     try:
-        print("(4/13) Generating summaries... ", end="")
-        sys.stdout.flush()
-        exceptions = translator.summarize_sub_chapters(novel_data, chapter_targets)
+        if pipeline:
+            print("(4/13) Generating summaries, terms and translations (pipelined)... ", end="")
+            sys.stdout.flush()
+            exceptions, retry_counts = translator.translate_sub_chapters_pipelined(novel_data, chapter_targets)
+        else:
+            print("(4/13) Generating summaries... ", end="")
+            sys.stdout.flush()
+            exceptions, retry_counts = translator.summarize_sub_chapters(novel_data, chapter_targets)
         if exceptions:
-            raise Exception(f"Failed to generate summaries.\n\n{exceptions}")
+            raise Exception(f"{stage_error}.{retries_message(retry_counts)}\n\n{exceptions}")
         else:
-            print("success.")
+            print(f"success.{retries_message(retry_counts)}")
     except Exception as e:
         print("failed.")
-        print(f"Failed to generate summaries. {e}")
+        print(f"{stage_error}. {e}")
         sys.exit(1)
 
     try:
         print("(5/13) Saving novel data to local storage... ", end="")
         sys.stdout.flush()
-        novels.remove(novel_old)
-        novels.append(novel_data)
-        storage.set_data(novels)
+        storage.save_novel(novel_data)
         novel_old = novel_data
-        novel_data = copy.deepcopy(novel_old)
+        novel_data = novel_old.snapshot()
         print("success.")
     except Exception as e:
         print("failed.")
@@ -268,11 +278,11 @@ def run_translate_chapters(novel_origin: str, novel_code: str, chapter_targets_s
     try:
         print("(6/13) Updating novel terms sheet... ", end="")
         sys.stdout.flush()
-        exceptions = translator.gather_terms_for_sub_chapters(novel_data, chapter_targets)
+        exceptions, retry_counts = ([], {}) if pipeline else translator.gather_terms_for_sub_chapters(novel_data, chapter_targets)
         if exceptions:
-            raise Exception(f"Failed to update novel terms sheet.\n\n{exceptions}")
+            raise Exception(f"Failed to update novel terms sheet.{retries_message(retry_counts)}\n\n{exceptions}")
         else:
-            print("success.")
+            print(f"success.{retries_message(retry_counts)}")
     except Exception as e:
         print("failed.")
         print(f"Failed to update novel terms sheet. {e}")
@@ -281,11 +291,9 @@ def run_translate_chapters(novel_origin: str, novel_code: str, chapter_targets_s
     try:
         print("(7/13) Saving novel data to local storage... ", end="")
         sys.stdout.flush()
-        novels.remove(novel_old)
-        novels.append(novel_data)
-        storage.set_data(novels)
+        storage.save_novel(novel_data)
         novel_old = novel_data
-        novel_data = copy.deepcopy(novel_old)
+        novel_data = novel_old.snapshot()
         print("success.")
     except Exception as e:
         print("failed.")
@@ -295,7 +303,7 @@ def run_translate_chapters(novel_origin: str, novel_code: str, chapter_targets_s
     try:
         print("(8/13) Updating terms sheet weights... ", end="")
         sys.stdout.flush()
-        novel_data.terms_sheet.update_dimensions(novel_data.original_body(), novel_data.original_language)
+        novel_data.terms_sheet.update_dimensions(novel_data.original_segments(), novel_data.original_language)
         print("success.")
     except Exception as e:
         print("failed.")
@@ -305,11 +313,9 @@ def run_translate_chapters(novel_origin: str, novel_code: str, chapter_targets_s
     try:
         print("(9/13) Saving novel data to local storage... ", end="")
         sys.stdout.flush()
-        novels.remove(novel_old)
-        novels.append(novel_data)
-        storage.set_data(novels)
+        storage.save_novel(novel_data)
         novel_old = novel_data
-        novel_data = copy.deepcopy(novel_old)
+        novel_data = novel_old.snapshot()
         print("success.")
     except Exception as e:
         print("failed.")
@@ -319,11 +325,11 @@ def run_translate_chapters(novel_origin: str, novel_code: str, chapter_targets_s
     try:
         print("(10/13) Translating chapters... ", end="")
         sys.stdout.flush()
-        exceptions = translator.translate_sub_chapters(novel_data, chapter_targets)
+        exceptions, retry_counts = ([], {}) if pipeline else translator.translate_sub_chapters(novel_data, chapter_targets)
         if exceptions:
-            raise Exception(f"Failed to translate chapters.\n\n{exceptions}")
+            raise Exception(f"Failed to translate chapters.{retries_message(retry_counts)}\n\n{exceptions}")
         else:
-            print("success.")
+            print(f"success.{retries_message(retry_counts)}")
     except Exception as e:
         print("failed.")
         print(f"Failed to translate chapters. {e}")
@@ -332,11 +338,9 @@ def run_translate_chapters(novel_origin: str, novel_code: str, chapter_targets_s
     try:
         print("(11/13) Saving novel data to local storage... ", end="")
         sys.stdout.flush()
-        novels.remove(novel_old)
-        novels.append(novel_data)
-        storage.set_data(novels)
+        storage.save_novel(novel_data)
         novel_old = novel_data
-        novel_data = copy.deepcopy(novel_old)
+        novel_data = novel_old.snapshot()
         print("success.")
     except Exception as e:
         print("failed.")
@@ -359,9 +363,7 @@ def run_translate_chapters(novel_origin: str, novel_code: str, chapter_targets_s
     try:
         print("(13/13) Saving novel data to local storage... ", end="")
         sys.stdout.flush()
-        novels.remove(novel_old)
-        novels.append(novel_data)
-        storage.set_data(novels)
+        storage.save_novel(novel_data)
         print("success.")
     except Exception as e:
         print("failed.")
@@ -388,9 +390,8 @@ def run_export_chapters(novel_origin: str, novel_code: str, chapter_targets_str:
         print("(2/3) Loading local storage... ", end="")
         sys.stdout.flush()
         storage = JsonStorage()
-        novels = storage.get_data()
-        novel_old = [novel for novel in novels if novel.novel_code == novel_code and novel.novel_origin == novel_origin][0]
-        novel_data = copy.deepcopy(novel_old)
+        novel_old = storage.get_novel(novel_origin, novel_code)
+        novel_data = novel_old.snapshot()
         print("success.")
     except Exception as e:
         print("failed.")
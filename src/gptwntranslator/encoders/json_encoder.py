@@ -34,6 +34,7 @@ class JsonEncoder(json.JSONEncoder):
                 "context_relevance": o.context_relevance,
                 "ner": o.ner,
                 "translations": o.translations,
+                "ner_processed": o.ner_processed,
                 "_type": "Term"
             }
         
@@ -42,11 +43,14 @@ class JsonEncoder(json.JSONEncoder):
                 "novel_origin": o.novel_origin,
                 "novel_code": o.novel_code,
                 "terms": o.terms,
+                "frequency_terms": sorted(o._frequency_terms),
+                "frequency_counts": o._frequency_counts,
                 "_type": "TermSheet"
             }
         
         if isinstance(o, Chunk):
             return {
+                "novel_origin": o.novel_origin,
                 "novel_code": o.novel_code,
                 "chapter_index": o.chapter_index,
                 "sub_chapter_index": o.sub_chapter_index,
@@ -100,4 +104,43 @@ class JsonEncoder(json.JSONEncoder):
                 "_type": "Novel"
             }
 
-        return super(JsonEncoder, self).default(o)
\ No newline at end of file
+        return super(JsonEncoder, self).default(o)
+
+class NovelRecordEncoder(JsonEncoder):
+    """This class is used to encode a novel without the bodies of its sub chapters.
+
+    The contents, translation and summary of the sub chapters are stored in
+    records of their own, so they are left empty here.
+    """
+
+    def default(self, o: object) -> dict:
+        """This function is used to encode objects to JSON format.
+
+        Parameters
+        ----------
+        o : object
+            The object to encode.
+
+        Returns
+        -------
+        dict
+            The encoded object.
+        """
+
+        # Built here instead of by the parent, so bodies not loaded yet stay on disk
+        if isinstance(o, SubChapter):
+            return {
+                "novel_code": o.novel_code,
+                "chapter_index": o.chapter_index,
+                "sub_chapter_index": o.sub_chapter_index,
+                "link": o.link,
+                "name": o.name,
+                "contents": "",
+                "release_date": o.release_date,
+                "translated_name": o.translated_name,
+                "translation": {},
+                "summary": {},
+                "_type": "SubChapter"
+            }
+
+        return super(NovelRecordEncoder, self).default(o)
@@ -0,0 +1,188 @@
+"""This module contains a multi-pattern string matcher"""
+
+import threading
+from collections import Counter, deque
+from typing import Iterable
+
+
+class AhoCorasick:
+    """This class represents an Aho-Corasick automaton over a growing set of patterns.
+
+    Patterns are added to the trie as they come, and the failure links are
+    rebuilt on the next search after an addition. A search finds every
+    pattern present in a text in a single pass over it.
+    """
+
+    def __init__(self, patterns: Iterable[str]=()) -> None:
+        """Initialize an AhoCorasick object.
+
+        Parameters
+        ----------
+        patterns : Iterable[str], optional
+            The initial patterns, by default none
+        """
+
+        self._transitions = [{}]
+        self._failures = [0]
+        self._patterns = [None]
+        self._outputs = [()]
+        self._built = True
+        self._lock = threading.Lock()
+
+        for pattern in patterns:
+            self.add(pattern)
+
+    def add(self, pattern: str) -> None:
+        """Add a pattern to the automaton.
+
+        Parameters
+        ----------
+        pattern : str
+            The pattern to add. Empty patterns are ignored.
+        """
+
+        # Validate parameters
+        if not isinstance(pattern, str):
+            raise TypeError("Pattern must be a string")
+        if pattern == "":
+            return
+
+        with self._lock:
+            state = 0
+            for character in pattern:
+                next_state = self._transitions[state].get(character)
+                if next_state is None:
+                    next_state = len(self._transitions)
+                    self._transitions.append({})
+                    self._failures.append(0)
+                    self._patterns.append(None)
+                    self._outputs.append(())
+                    self._transitions[state][character] = next_state
+                state = next_state
+            if self._patterns[state] is None:
+                self._patterns[state] = pattern
+                self._built = False
+
+    def find(self, text: str) -> list[str]:
+        """Find the patterns present in a text.
+
+        Parameters
+        ----------
+        text : str
+            The text to search.
+
+        Returns
+        -------
+        list[str]
+            The patterns found, each once, in the order they first end in the text.
+        """
+
+        # Validate parameters
+        if not isinstance(text, str):
+            raise TypeError("Text must be a string")
+
+        with self._lock:
+            if not self._built:
+                self._build()
+
+            transitions = self._transitions
+            failures = self._failures
+            outputs = self._outputs
+            found = {}
+            visited = set()
+            state = 0
+            for character in text:
+                while state and character not in transitions[state]:
+                    state = failures[state]
+                state = transitions[state].get(character, 0)
+                # A state's outputs only need collecting the first time it's reached
+                if outputs[state] and state not in visited:
+                    visited.add(state)
+                    for pattern in outputs[state]:
+                        found.setdefault(pattern, None)
+
+            return list(found)
+
+    def find_occurrences(self, text: str) -> list[tuple[int, int, str]]:
+        """Find the occurrences of the patterns in a text.
+
+        Occurrences of the same pattern don't overlap, like with str.count,
+        while occurrences of different patterns may.
+
+        Parameters
+        ----------
+        text : str
+            The text to search.
+
+        Returns
+        -------
+        list[tuple[int, int, str]]
+            The start, end and pattern of every occurrence, in the order they end in the text.
+        """
+
+        # Validate parameters
+        if not isinstance(text, str):
+            raise TypeError("Text must be a string")
+
+        with self._lock:
+            if not self._built:
+                self._build()
+
+            transitions = self._transitions
+            failures = self._failures
+            outputs = self._outputs
+            occurrences = []
+            last_ends = {}
+            state = 0
+            for position, character in enumerate(text):
+                while state and character not in transitions[state]:
+                    state = failures[state]
+                state = transitions[state].get(character, 0)
+                for pattern in outputs[state]:
+                    # Skip an occurrence overlapping the previous one of the same pattern
+                    if position - len(pattern) >= last_ends.get(pattern, -1):
+                        occurrences.append((position - len(pattern) + 1, position + 1, pattern))
+                        last_ends[pattern] = position
+
+            return occurrences
+
+    def count(self, text: str) -> dict[str, int]:
+        """Count the occurrences of the patterns in a text.
+
+        Occurrences of the same pattern don't overlap, like with str.count.
+
+        Parameters
+        ----------
+        text : str
+            The text to search.
+
+        Returns
+        -------
+        dict[str, int]
+            The number of occurrences of each pattern found.
+        """
+
+        return dict(Counter(pattern for _, _, pattern in self.find_occurrences(text)))
+
+    def _build(self) -> None:
+        # Breadth first, so the failure state of every state is done before its children
+        queue = deque()
+        for state in self._transitions[0].values():
+            self._failures[state] = 0
+            self._outputs[state] = self._own_outputs(state)
+            queue.append(state)
+
+        while queue:
+            parent = queue.popleft()
+            for character, state in self._transitions[parent].items():
+                failure = self._failures[parent]
+                while failure and character not in self._transitions[failure]:
+                    failure = self._failures[failure]
+                self._failures[state] = self._transitions[failure].get(character, 0)
+                self._outputs[state] = self._own_outputs(state) + self._outputs[self._failures[state]]
+                queue.append(state)
+
+        self._built = True
+
+    def _own_outputs(self, state: int) -> tuple:
+        return (self._patterns[state],) if self._patterns[state] is not None else ()
@@ -0,0 +1,142 @@
+"""This module contains the circuit breakers guarding the API models"""
+
+import threading
+import time
+
+from gptwntranslator.helpers.design_patterns_helper import singleton
+from gptwntranslator.helpers.logger_helper import CustomLogger
+
+
+logger = CustomLogger(__name__)
+
+class CircuitOpenException(Exception):
+    pass
+
+class CircuitBreaker:
+    """This class represents the health of a single model endpoint.
+
+    The breaker opens after a number of consecutive failures and rejects
+    every call until the reset timeout passes. Then a single trial call is
+    let through: success closes the breaker, failure opens it again.
+    """
+
+    def __init__(self, name: str, failure_threshold: int=5, reset_timeout: float=30) -> None:
+        """Initialize a CircuitBreaker object.
+
+        Parameters
+        ----------
+        name : str
+            The name of the guarded endpoint.
+        failure_threshold : int, optional
+            The consecutive failures that open the breaker, by default 5
+        reset_timeout : float, optional
+            The seconds the breaker stays open, by default 30
+        """
+
+        # Validate parameters
+        if not isinstance(failure_threshold, int):
+            raise TypeError("Failure threshold must be an integer")
+        if failure_threshold <= 0:
+            raise ValueError("Failure threshold must be greater than 0")
+        if not isinstance(reset_timeout, (int, float)):
+            raise TypeError("Reset timeout must be a number")
+        if reset_timeout < 0:
+            raise ValueError("Reset timeout must be positive")
+
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_progress = False
+        self._lock = threading.Lock()
+
+    def before_call(self) -> None:
+        """Check that a call may go through.
+
+        Raises
+        ------
+        CircuitOpenException
+            If the breaker is open.
+        """
+
+        with self._lock:
+            if self._opened_at is None:
+                return
+            remaining = self._opened_at + self.reset_timeout - time.monotonic()
+            if remaining > 0 or self._trial_in_progress:
+                raise CircuitOpenException(f"Circuit for {self.name} is open, failing fast ({max(remaining, 0):.0f}s until the next trial)")
+            self._trial_in_progress = True
+            logger.info(f"Circuit for {self.name} is half open, letting a trial call through")
+
+    def record_success(self) -> None:
+        """Record a successful call, closing the breaker."""
+
+        with self._lock:
+            if self._opened_at is not None:
+                logger.info(f"Circuit for {self.name} closed")
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_progress = False
+
+    def record_failure(self) -> None:
+        """Record a failed call, opening the breaker if there were too many."""
+
+        with self._lock:
+            self._failures += 1
+            if self._trial_in_progress or self._failures >= self.failure_threshold:
+                if self._opened_at is None or self._trial_in_progress:
+                    logger.warning(f"Circuit for {self.name} opened after {self._failures} consecutive failures")
+                self._opened_at = time.monotonic()
+                self._trial_in_progress = False
+
+    def release(self) -> None:
+        """Release a trial call that ended without telling anything about the endpoint health."""
+
+        with self._lock:
+            self._trial_in_progress = False
+
+@singleton
+class CircuitBreakers:
+    """Circuit breakers of the API, keyed by model name."""
+
+    def __init__(self) -> None:
+        self.failure_threshold = 5
+        self.reset_timeout = 30
+        self._breakers = {}
+        self._lock = threading.Lock()
+
+    def configure(self, failure_threshold: int=5, reset_timeout: float=30) -> None:
+        """Set the settings of the breakers created from now on.
+
+        Parameters
+        ----------
+        failure_threshold : int, optional
+            The consecutive failures that open a breaker, by default 5
+        reset_timeout : float, optional
+            The seconds a breaker stays open, by default 30
+        """
+
+        with self._lock:
+            self.failure_threshold = failure_threshold
+            self.reset_timeout = reset_timeout
+            self._breakers = {}
+
+    def get(self, model: str) -> CircuitBreaker:
+        """Get the breaker of a model, creating it if needed.
+
+        Parameters
+        ----------
+        model : str
+            The name of the model in the API.
+
+        Returns
+        -------
+        CircuitBreaker
+            The breaker of the model.
+        """
+
+        with self._lock:
+            if model not in self._breakers:
+                self._breakers[model] = CircuitBreaker(model, self.failure_threshold, self.reset_timeout)
+            return self._breakers[model]
@@ -0,0 +1,112 @@
+"""This module contains helper functions for counting term co-occurrences"""
+
+import re
+import threading
+from array import array
+from bisect import bisect_right
+from collections import Counter, deque
+
+from janome.tokenizer import Tokenizer
+
+
+# Ideographs are a token each, other words are runs of word characters, and every other symbol stands alone
+_TOKEN_PATTERN = re.compile(r"[\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff]|\w+|[^\w\s]")
+
+# The Janome tokenizer is slow to load and not safe to share between threads, so one is loaded on first use
+_janome_tokenizer = None
+_janome_lock = threading.Lock()
+
+def tokenize_offsets(text: str, language: str) -> array:
+    """Split a text into tokens, returning where each token starts.
+
+    Japanese text is tokenized with Janome, every other language with a
+    regular expression.
+
+    Parameters
+    ----------
+    text : str
+        The text to tokenize.
+    language : str
+        The code of the language of the text.
+
+    Returns
+    -------
+    array
+        The offsets of the first character of every token, in increasing order.
+    """
+
+    # Validate parameters
+    if not isinstance(text, str):
+        raise TypeError("Text must be a string")
+    if not isinstance(language, str):
+        raise TypeError("Language must be a string")
+
+    offsets = array('I')
+
+    if language == "ja":
+        global _janome_tokenizer
+        with _janome_lock:
+            if _janome_tokenizer is None:
+                _janome_tokenizer = Tokenizer(wakati=True)
+            surfaces = list(_janome_tokenizer.tokenize(text, wakati=True))
+
+        # Janome only gives the surfaces, so they're located in the text in order
+        position = 0
+        for surface in surfaces:
+            if not surface or surface.isspace():
+                continue
+            offset = text.find(surface, position)
+            if offset == -1:
+                continue
+            offsets.append(offset)
+            position = offset + len(surface)
+    else:
+        for match in _TOKEN_PATTERN.finditer(text):
+            offsets.append(match.start())
+
+    return offsets
+
+def count_cooccurrences(occurrences: list[tuple[int, int, str]], token_offsets: array, window_size: int=5) -> Counter:
+    """Count how often each term occurs near a different term.
+
+    Two occurrences are near each other when at most window_size tokens
+    apart and not overlapping. Every such pair adds one to both terms.
+
+    Parameters
+    ----------
+    occurrences : list[tuple[int, int, str]]
+        The start, end and term of every occurrence in the text.
+    token_offsets : array
+        The offsets of the first character of every token of the text.
+    window_size : int, optional
+        The maximum distance in tokens between two occurrences, by default 5
+
+    Returns
+    -------
+    Counter
+        The number of co-occurrences of each term.
+    """
+
+    # Validate parameters
+    if not isinstance(window_size, int):
+        raise TypeError("Window size must be an integer")
+    if window_size < 0:
+        raise ValueError("Window size must be positive")
+
+    counts = Counter()
+    window = deque()
+    for start, end, term in sorted(occurrences):
+        token_index = bisect_right(token_offsets, start) - 1
+
+        # Drop the occurrences too far behind, the rest of the window is near this one
+        while window and token_index - window[0][0] > window_size:
+            window.popleft()
+
+        for _, _, other_end, other_term in window:
+            if other_term != term and other_end <= start:
+                counts[term] += 1
+                counts[other_term] += 1
+
+        window.append((token_index, start, end, term))
+
+    return counts
@@ -2,6 +2,7 @@
 
 import os
 import sys
+from typing import Iterable
 import pypandoc
 
 
@@ -45,6 +46,45 @@ def write_file(file_path: str, contents: str, verbose: bool=False) -> None:
         print("Failed") if verbose else None
         raise Exception(f"Error: {e}")
 
+def write_file_chunks(file_path: str, chunks: Iterable[str], verbose: bool=False) -> None:
+    """Write a stream of strings to file_path, without joining them in memory first
+
+    Parameters
+    ----------
+    file_path : str
+        The path to the file to write to.
+    chunks : Iterable[str]
+        The strings to write to the file, in order.
+    verbose : bool, optional
+        Whether to print verbose messages, by default False
+
+    Raises
+    ------
+    Exception
+        If an error occurs while writing to the file.
+    """
+
+    # Validate the parameters
+    if not isinstance(file_path, str):
+        raise TypeError("The file path must be a string")
+    if not isinstance(verbose, bool):
+        raise TypeError("The verbose flag must be a boolean")
+
+    try:
+        print(f"Writing file {file_path}... ", end="") if verbose else None
+        sys.stdout.flush()
+
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+
+        with open(file_path, 'w', encoding='utf-8') as f:
+            for chunk in chunks:
+                f.write(chunk)
+
+        print("Done") if verbose else None
+    except Exception as e:
+        print("Failed") if verbose else None
+        raise Exception(f"Error: {e}")
+
 def read_file(file_path: str, verbose: bool=False) -> str:
     """Read contents from file_path	
 
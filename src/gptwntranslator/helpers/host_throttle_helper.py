@@ -0,0 +1,98 @@
+"""This module contains the throttles keeping the scraping polite to each host"""
+
+import threading
+import time
+from contextlib import contextmanager
+
+from gptwntranslator.helpers.config_helper import Config
+from gptwntranslator.helpers.design_patterns_helper import singleton
+from gptwntranslator.helpers.logger_helper import CustomLogger
+
+
+logger = CustomLogger(__name__)
+
+class HostThrottle:
+    """This class represents the request budget of a single host.
+
+    At most max_concurrency requests to the host are in flight at once, and
+    consecutive requests start at least delay seconds apart.
+    """
+
+    def __init__(self, host: str, max_concurrency: int=4, delay: float=0.5) -> None:
+        """Initialize a HostThrottle object.
+
+        Parameters
+        ----------
+        host : str
+            The host the requests go to.
+        max_concurrency : int, optional
+            The requests in flight at once, by default 4
+        delay : float, optional
+            The seconds between the start of two requests, by default 0.5
+        """
+
+        # Validate parameters
+        if not isinstance(max_concurrency, int):
+            raise TypeError("Max concurrency must be an integer")
+        if max_concurrency <= 0:
+            raise ValueError("Max concurrency must be greater than 0")
+        if not isinstance(delay, (int, float)):
+            raise TypeError("Delay must be a number")
+        if delay < 0:
+            raise ValueError("Delay must be positive")
+
+        self.host = host
+        self.max_concurrency = max_concurrency
+        self.delay = delay
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._next_start = 0.0
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def slot(self):
+        """Wait for a free slot and for the delay, and hold the slot while the request runs."""
+
+        with self._slots:
+            # Each request books the next start time, so waiting requests are spaced out in turn
+            with self._lock:
+                now = time.monotonic()
+                start = max(now, self._next_start)
+                self._next_start = start + self.delay
+            if start > now:
+                time.sleep(start - now)
+            yield
+
+@singleton
+class HostThrottles:
+    """Throttles of the scraped hosts, keyed by host name.
+
+    A throttle takes its settings from the scraper section of the config
+    when first requested.
+    """
+
+    def __init__(self) -> None:
+        self._throttles = {}
+        self._lock = threading.Lock()
+
+    def get(self, host: str) -> HostThrottle:
+        """Get the throttle of a host, creating it if needed.
+
+        Parameters
+        ----------
+        host : str
+            The host name.
+
+        Returns
+        -------
+        HostThrottle
+            The throttle of the host.
+        """
+
+        with self._lock:
+            if host not in self._throttles:
+                scraper = Config().data.config.scraper or {}
+                max_concurrency = scraper.get("max_concurrency_per_host") or 4
+                delay = scraper.get("politeness_delay")
+                self._throttles[host] = HostThrottle(host, max_concurrency, 0.5 if delay is None else delay)
+                logger.debug(f"Created throttle for {host} with max_concurrency={max_concurrency}, delay={self._throttles[host].delay}")
+            return self._throttles[host]
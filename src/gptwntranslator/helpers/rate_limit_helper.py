@@ -0,0 +1,209 @@
+"""This module contains the client side rate limiter of the API requests"""
+
+import asyncio
+import threading
+import time
+
+from gptwntranslator.helpers.design_patterns_helper import singleton
+from gptwntranslator.helpers.logger_helper import CustomLogger
+
+
+logger = CustomLogger(__name__)
+
+class TokenBucket:
+    """This class represents a bucket that refills continuously up to its capacity.
+
+    The capacity is the budget of a minute, so the bucket refills at a
+    sixtieth of it per second. The balance may go below zero when a
+    reservation is corrected with the real usage of a request.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        """Initialize a TokenBucket object.
+
+        Parameters
+        ----------
+        capacity : int
+            The amount of units available per minute.
+        """
+
+        # Validate parameters
+        if not isinstance(capacity, int):
+            raise TypeError("Capacity must be an integer")
+        if capacity <= 0:
+            raise ValueError("Capacity must be greater than 0")
+
+        self.capacity = capacity
+        self.rate = capacity / 60
+        self.balance = float(capacity)
+        self._last_refill = time.monotonic()
+
+    def refill(self, now: float) -> None:
+        """Add the units accumulated since the last refill.
+
+        Parameters
+        ----------
+        now : float
+            The current monotonic time.
+        """
+
+        self.balance = min(self.capacity, self.balance + (now - self._last_refill) * self.rate)
+        self._last_refill = now
+
+    def wait_time(self, amount: float) -> float:
+        """Get the seconds to wait until the amount can be taken.
+
+        Amounts bigger than the capacity only wait for a full bucket, so they
+        can never block forever.
+
+        Parameters
+        ----------
+        amount : float
+            The amount of units to take.
+
+        Returns
+        -------
+        float
+            The seconds to wait, 0 if the amount can be taken now.
+        """
+
+        amount = min(amount, self.capacity)
+        if self.balance >= amount:
+            return 0.0
+        return (amount - self.balance) / self.rate
+
+class ModelRateLimiter:
+    """This class represents the requests per minute and tokens per minute budgets of a model."""
+
+    def __init__(self, rpm: int=None, tpm: int=None) -> None:
+        """Initialize a ModelRateLimiter object.
+
+        Parameters
+        ----------
+        rpm : int, optional
+            The requests per minute of the model, by default unlimited
+        tpm : int, optional
+            The tokens per minute of the model, by default unlimited
+        """
+
+        self._requests = TokenBucket(rpm) if rpm else None
+        self._tokens = TokenBucket(tpm) if tpm else None
+        self._lock = threading.Lock()
+
+    def try_reserve(self, tokens: int) -> float:
+        """Reserve a request and its tokens if both budgets allow it.
+
+        Parameters
+        ----------
+        tokens : int
+            The estimated tokens of the request.
+
+        Returns
+        -------
+        float
+            0 if the reservation was made, otherwise the seconds to wait before trying again.
+        """
+
+        with self._lock:
+            now = time.monotonic()
+            wait = 0.0
+            if self._requests:
+                self._requests.refill(now)
+                wait = max(wait, self._requests.wait_time(1))
+            if self._tokens:
+                self._tokens.refill(now)
+                wait = max(wait, self._tokens.wait_time(tokens))
+            if wait > 0:
+                return wait
+            if self._requests:
+                self._requests.balance -= 1
+            if self._tokens:
+                self._tokens.balance -= tokens
+            return 0.0
+
+    def acquire(self, tokens: int) -> None:
+        """Block until the request and its tokens are reserved.
+
+        Parameters
+        ----------
+        tokens : int
+            The estimated tokens of the request.
+        """
+
+        while (wait := self.try_reserve(tokens)) > 0:
+            time.sleep(wait)
+
+    async def aacquire(self, tokens: int) -> None:
+        """Wait without blocking the event loop until the request and its tokens are reserved.
+
+        Parameters
+        ----------
+        tokens : int
+            The estimated tokens of the request.
+        """
+
+        while (wait := self.try_reserve(tokens)) > 0:
+            await asyncio.sleep(wait)
+
+    def adjust(self, reserved_tokens: int, used_tokens: int) -> None:
+        """Correct a reservation with the tokens the request really used.
+
+        Parameters
+        ----------
+        reserved_tokens : int
+            The tokens reserved before the request.
+        used_tokens : int
+            The tokens reported by the API.
+        """
+
+        if not self._tokens:
+            return
+        with self._lock:
+            self._tokens.refill(time.monotonic())
+            self._tokens.balance -= used_tokens - reserved_tokens
+
+@singleton
+class RateLimiter:
+    """Client side rate limiter of the API requests, keyed by model name."""
+
+    def __init__(self) -> None:
+        self._limiters = {}
+
+    def configure(self, models: dict) -> None:
+        """Set the budgets of the models.
+
+        Parameters
+        ----------
+        models : dict
+            The models of the config. The optional rpm and tpm keys of each
+            model set its requests per minute and tokens per minute.
+        """
+
+        # Validate parameters
+        if not isinstance(models, dict):
+            raise TypeError("Models must be a dictionary")
+
+        limiters = {}
+        for model in models.values():
+            rpm = model.get("rpm")
+            tpm = model.get("tpm")
+            if rpm or tpm:
+                limiters[model["name"]] = ModelRateLimiter(rpm, tpm)
+                logger.info(f"Rate limiting model {model['name']} to rpm={rpm}, tpm={tpm}")
+        self._limiters = limiters
+
+    def get(self, model: str) -> ModelRateLimiter:
+        """Get the limiter of a model.
+
+        Parameters
+        ----------
+        model : str
+            The name of the model in the API.
+
+        Returns
+        -------
+        ModelRateLimiter
+            The limiter of the model, or None if the model has no budgets.
+        """
+
+        return self._limiters.get(model)
@@ -0,0 +1,48 @@
+"""This module contains the cache of the spaCy pipelines"""
+
+import threading
+
+import spacy
+
+from gptwntranslator.helpers.design_patterns_helper import singleton
+from gptwntranslator.helpers.logger_helper import CustomLogger
+
+
+logger = CustomLogger(__name__)
+
+# Components kept when only the named entities are needed, the embedding layers feed the recognizer
+NER_COMPONENTS = ("tok2vec", "transformer", "ner")
+
+@singleton
+class SpacyPipelines:
+    """Process wide cache of the spaCy pipelines, keyed by pipeline name."""
+
+    def __init__(self) -> None:
+        self._ner_pipelines = {}
+        self._lock = threading.Lock()
+
+    def get_ner(self, pipeline: str) -> spacy.language.Language:
+        """Get a pipeline running only named entity recognition, loading it if needed.
+
+        Parameters
+        ----------
+        pipeline : str
+            The name of the spaCy pipeline.
+
+        Returns
+        -------
+        spacy.language.Language
+            The pipeline, with every component but the recognizer and its embeddings disabled.
+        """
+
+        # Validate parameters
+        if not isinstance(pipeline, str):
+            raise TypeError("Pipeline must be a string")
+
+        with self._lock:
+            if pipeline not in self._ner_pipelines:
+                logger.info(f"Loading spaCy pipeline {pipeline}")
+                nlp = spacy.load(pipeline)
+                nlp.select_pipes(enable=[name for name in nlp.pipe_names if name in NER_COMPONENTS])
+                self._ner_pipelines[pipeline] = nlp
+            return self._ner_pipelines[pipeline]
@@ -1,4 +1,11 @@
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import asyncio
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+import contextlib
+import contextvars
+import heapq
+import itertools
+import random
+import threading
 import time
 import uuid
 
@@ -7,17 +14,139 @@ from gptwntranslator.helpers.logger_helper import CustomLogger
 
 logger = CustomLogger(__name__)
 
+# The priority of the subtask the running coroutine belongs to
+current_priority = contextvars.ContextVar("current_priority", default=())
+
+class Scheduler:
+    """Shared pool of workers running work items by priority.
+
+    Lower priorities run first. A worker waiting for its own work items runs
+    queued items meanwhile, so tasks nested inside scheduled work items can't
+    exhaust the workers and deadlock. Other threads just wait, so no more than
+    max_workers items ever run at once.
+
+    Coroutines share the same ordering and limit through aslot, which admits
+    at most max_workers holders at once, the waiters with the lowest priority
+    first. Only leaf work, like a single request, should hold a slot, since a
+    holder awaiting work that needs a slot could deadlock.
+    """
+
+    def __init__(self, max_workers):
+        if not isinstance(max_workers, int):
+            raise TypeError("Max workers must be an integer")
+        if max_workers <= 0:
+            raise ValueError("Max workers must be greater than 0")
+
+        self.max_workers = max_workers
+        self._queue = []
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._workers = []
+        self._local = threading.local()
+        # The async slots are only used from the thread running the event loop
+        self._async_active = 0
+        self._async_waiters = []
+        logger.info(f'Created scheduler with max_workers={max_workers}')
+
+    def submit(self, priority, func, *args, **kwargs):
+        future = Future()
+        with self._condition:
+            if not self._workers:
+                self._start_workers()
+            heapq.heappush(self._queue, (priority, next(self._sequence), future, func, args, kwargs))
+            self._condition.notify_all()
+        return future
+
+    def wait(self, futures):
+        is_worker = getattr(self._local, 'is_worker', False)
+        while True:
+            with self._condition:
+                if all(future.done() for future in futures):
+                    return
+                if not is_worker or not self._queue:
+                    self._condition.wait()
+                    continue
+                item = heapq.heappop(self._queue)
+            self._execute(item)
+
+    @contextlib.asynccontextmanager
+    async def aslot(self, priority=None):
+        await self._aacquire(current_priority.get() if priority is None else priority)
+        try:
+            yield
+        finally:
+            self._arelease()
+
+    async def _aacquire(self, priority):
+        if self._async_active < self.max_workers and not self._async_waiters:
+            self._async_active += 1
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._async_waiters, (priority, next(self._sequence), waiter))
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            # A slot handed over to a cancelled waiter goes to the next one
+            if waiter.done() and not waiter.cancelled():
+                self._arelease()
+            raise
+
+    def _arelease(self):
+        # The slot is handed over to the first waiter still waiting
+        while self._async_waiters:
+            _, _, waiter = heapq.heappop(self._async_waiters)
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self._async_active -= 1
+
+    def _start_workers(self):
+        for _ in range(self.max_workers):
+            worker = threading.Thread(target=self._work, daemon=True)
+            worker.start()
+            self._workers.append(worker)
+
+    def _work(self):
+        self._local.is_worker = True
+        while True:
+            with self._condition:
+                while not self._queue:
+                    self._condition.wait()
+                item = heapq.heappop(self._queue)
+            self._execute(item)
+
+    def _execute(self, item):
+        _, _, future, func, args, kwargs = item
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(func(*args, **kwargs))
+        except BaseException as e:
+            future.set_exception(e)
+        # Wake up the threads waiting for this item
+        with self._condition:
+            self._condition.notify_all()
+
 class Task:
-    def __init__(self, max_workers, retry_on_exceptions=(), max_retries=3):
+    def __init__(self, max_workers, retry_on_exceptions=(), max_retries=3, base_delay=1, max_delay=60, scheduler=None, priority=()):
         self.max_workers = max_workers
         self.retry_on_exceptions = retry_on_exceptions
         self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.scheduler = scheduler
+        self.priority = priority
         self.subtasks = []
+        self.attempts = {}
         logger.info(f'Created task with max_workers={max_workers}, retry_on_exceptions={retry_on_exceptions}, max_retries={max_retries}')
 
     def add_subtask(self, subtask_func, *args, **kwargs):
+        return self.add_prioritized_subtask(self.priority + (len(self.subtasks),), subtask_func, *args, **kwargs)
+
+    def add_prioritized_subtask(self, priority, subtask_func, *args, **kwargs):
         subtask = Task(self.max_workers)
         subtask.id = uuid.uuid4()
+        subtask.priority = priority
         subtask.task_func = subtask_func
         subtask.args = args
         subtask.kwargs = kwargs
@@ -25,7 +154,12 @@ class Task:
         logger.info(f'Added subtask {subtask.id} to task')
         return subtask.id
 
+    def get_retry_counts(self):
+        return {subtask_id: attempts - 1 for subtask_id, attempts in self.attempts.items()}
+
     def run_subtasks(self):
+        if self.scheduler is not None:
+            return self._run_scheduled_subtasks()
         logger.info(f'Running subtasks of task')
         with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
             futures = {executor.submit(self._run_subtask_with_retry, subtask): subtask for subtask in self.subtasks}
@@ -40,8 +174,33 @@ class Task:
                     logger.error(f'Exception occurred while running subtask {subtask.id}: {e}')
         return results
 
+    def _run_scheduled_subtasks(self):
+        logger.info(f'Running subtasks of task on the scheduler')
+        futures = {self.scheduler.submit(subtask.priority, self._run_subtask_with_retry, subtask): subtask for subtask in self.subtasks}
+        self.scheduler.wait(list(futures))
+        results = {}
+        for future, subtask in futures.items():
+            try:
+                results[subtask.id] = future.result()
+                logger.info(f'Finished running subtask {subtask.id}')
+            except Exception as e:
+                results[subtask.id] = e
+                logger.error(f'Exception occurred while running subtask {subtask.id}: {e}')
+        return results
+
+    def _next_delay(self, previous_delay, exception):
+        # Decorrelated jitter keeps concurrent subtasks from retrying in lockstep
+        delay = min(self.max_delay, random.uniform(self.base_delay, previous_delay * 3))
+        # The server knows best when it will take requests again
+        retry_after = getattr(exception, 'retry_after', None)
+        if retry_after:
+            delay = max(delay, min(retry_after, self.max_delay))
+        return delay
+
     def _run_subtask_with_retry(self, subtask):
+        delay = self.base_delay
         for attempt in range(self.max_retries + 1):
+            self.attempts[subtask.id] = attempt + 1
             try:
                 logger.info(f'Running subtask {subtask.id}')
                 return subtask.task_func(*subtask.args, **subtask.kwargs)
@@ -49,5 +208,36 @@ class Task:
                 logger.warning(f'Exception occurred while running subtask {subtask.id}: {e}')
                 if attempt == self.max_retries:
                     raise
-                sleep_duration = 2 ** attempt
-                time.sleep(sleep_duration)
\ No newline at end of file
+                delay = self._next_delay(delay, e)
+                logger.info(f'Retrying subtask {subtask.id} in {delay:.2f} seconds')
+                time.sleep(delay)
+
+    async def arun_subtasks(self):
+        logger.info(f'Running subtasks of task asynchronously')
+        # The requests made by the subtasks take the slots of the scheduler, so the subtasks themselves aren't bounded
+        semaphore = None if self.scheduler is not None else asyncio.Semaphore(self.max_workers)
+        results = await asyncio.gather(*[self._arun_subtask_with_retry(subtask, semaphore) for subtask in self.subtasks], return_exceptions=True)
+        for subtask, result in zip(self.subtasks, results):
+            if isinstance(result, Exception):
+                logger.error(f'Exception occurred while running subtask {subtask.id}: {result}')
+            else:
+                logger.info(f'Finished running subtask {subtask.id}')
+        return {subtask.id: result for subtask, result in zip(self.subtasks, results)}
+
+    async def _arun_subtask_with_retry(self, subtask, semaphore):
+        # Each subtask runs in its own copy of the context, so this only orders its own requests
+        current_priority.set(subtask.priority)
+        delay = self.base_delay
+        for attempt in range(self.max_retries + 1):
+            self.attempts[subtask.id] = attempt + 1
+            try:
+                async with semaphore if semaphore is not None else contextlib.nullcontext():
+                    logger.info(f'Running subtask {subtask.id}')
+                    return await subtask.task_func(*subtask.args, **subtask.kwargs)
+            except self.retry_on_exceptions as e:
+                logger.warning(f'Exception occurred while running subtask {subtask.id}: {e}')
+                if attempt == self.max_retries:
+                    raise
+                delay = self._next_delay(delay, e)
+                logger.info(f'Retrying subtask {subtask.id} in {delay:.2f} seconds')
+                await asyncio.sleep(delay)
@@ -3,12 +3,20 @@
 import os
 import sys
 import re
+from typing import Iterable, Iterator
 from gptwntranslator.helpers.config_helper import Config
 from gptwntranslator.helpers.data_helper import get_targeted_sub_chapters
 
 from gptwntranslator.models.novel import Novel
 
 
+# Characters kept by make_printable even though they aren't printable
+LINE_BREAK_CHARACTERS = frozenset(["\n", "\r"])
+
+# Pattern of the characters removed by make_printable, compiled on first use
+_noprint_pattern = None
+
+
 def parse_chapters(input_string: str) -> dict[str, list[str]]:
     """Parse a string of chapter numbers and ranges into a dictionary.
 
@@ -103,6 +111,46 @@ def parse_chapters(input_string: str) -> dict[str, list[str]]:
     
     return result
 
+def _get_noprint_pattern() -> re.Pattern:
+    """Return the pattern matching the characters removed by make_printable.
+
+    The pattern is built on first use and shared by every later call. The
+    non-printable ranges of the basic multilingual plane make a character
+    class, while characters outside of it are matched one by one and checked
+    by _remove_noprint, as long character classes of astral ranges are slow
+    to match.
+
+    Returns
+    -------
+    re.Pattern
+        The compiled pattern.
+    """
+
+    global _noprint_pattern
+
+    if _noprint_pattern is None:
+        # Collect the ranges of non-printable code points, keeping the line breaks
+        ranges = []
+        start = None
+        for i in range(0x10001):
+            removable = i <= 0xFFFF and not chr(i).isprintable() and chr(i) not in LINE_BREAK_CHARACTERS
+            if removable and start is None:
+                start = i
+            elif not removable and start is not None:
+                ranges.append((start, i - 1))
+                start = None
+
+        character_class = "".join(re.escape(chr(first)) if first == last else f"{re.escape(chr(first))}-{re.escape(chr(last))}" for first, last in ranges)
+        _noprint_pattern = re.compile(f"[{character_class}]+|[\U00010000-\U0010FFFF]")
+
+    return _noprint_pattern
+
+def _remove_noprint(match: re.Match) -> str:
+    characters = match.group(0)
+    if characters > "\uffff" and characters.isprintable():
+        return characters
+    return ""
+
 def make_printable(s: str) -> str:
     """Return a string with all non-printable characters removed.
 
@@ -110,8 +158,6 @@ def make_printable(s: str) -> str:
     ----------
     s : str
         The string to process.
-    verbose : bool, optional
-        If True, print the number of non-printable characters removed, by default False
 
     Returns
     -------
@@ -123,16 +169,33 @@ def make_printable(s: str) -> str:
     if not isinstance(s, str):
         raise TypeError("The string must be a string")
 
-    LINE_BREAK_CHARACTERS = set(["\n", "\r"])
-    NOPRINT_TRANS_TABLE = {
-        i: None for i in range(0, sys.maxunicode + 1) if not chr(i).isprintable() and not chr(i) in LINE_BREAK_CHARACTERS
-    }
-
     try:
-        new_str = s.translate(NOPRINT_TRANS_TABLE)
-        return new_str
+        return _get_noprint_pattern().sub(_remove_noprint, s)
     except Exception as e:
         raise Exception(f"Error: {e}")
+
+def make_printable_chunks(chunks: Iterable[str]) -> Iterator[str]:
+    """Remove the non-printable characters from a stream of strings.
+
+    Characters are filtered one by one, so the chunks can be split anywhere,
+    like the output of a JSON encoder's iterencode.
+
+    Parameters
+    ----------
+    chunks : Iterable[str]
+        The strings to process.
+
+    Yields
+    ------
+    str
+        Each string with all non-printable characters removed.
+    """
+
+    pattern = _get_noprint_pattern()
+    for chunk in chunks:
+        if not isinstance(chunk, str):
+            raise TypeError("The chunks must be strings")
+        yield pattern.sub(_remove_noprint, chunk)
     
 def txt_to_md(input_txt: str) -> str:
     """Convert a text file to a markdown file.
@@ -67,13 +67,16 @@ def generic_object_hook(dct: dict):
                 dct['contents'], 
                 dct['prev_line'], 
                 dct['next_line'], 
-                translation=dct['translation']) 
+                translation=dct['translation'],
+                novel_origin=dct.get('novel_origin', '')) 
         
         elif dct['_type'] == 'TermSheet':
             return TermSheet(
                 dct['novel_origin'],
                 dct['novel_code'], 
-                terms=dct['terms']) 
+                terms=dct['terms'],
+                frequency_terms=dct.get('frequency_terms', []),
+                frequency_counts=dct.get('frequency_counts', {})) 
         
         elif dct['_type'] == 'Term':
             return Term(
@@ -82,6 +85,7 @@ def generic_object_hook(dct: dict):
                 document_frequency=dct['document_frequency'],
                 context_relevance=dct['context_relevance'],
                 ner=dct['ner'],
-                translations=dct['translations'])
+                translations=dct['translations'],
+                ner_processed=dct.get('ner_processed', False))
         
     return dct
@@ -6,6 +6,9 @@ from gptwntranslator.api import openai_api
 from gptwntranslator.helpers.config_helper import Config
 from gptwntranslator.helpers.logger_helper import CustomLogger
 from gptwntranslator.storage.json_storage import JsonStorage, JsonStorageException, JsonStorageFileException, JsonStorageFormatException
+from gptwntranslator.storage.chunk_checkpoint import ChunkCheckpoints
+from gptwntranslator.storage.plan_cache import PlanCache
+from gptwntranslator.storage.scrape_cache import ScrapeCache
 from gptwntranslator.ui.page_exit import PageExit
 from gptwntranslator.ui.page_message import PageMessage
 from gptwntranslator.ui.page_novel_list import PageNovelList
@@ -21,10 +24,13 @@ def _ui(screen):
 
     storage = JsonStorage()
     storage.initialize(persistent_data_file_path)
+    PlanCache().initialize(os.path.join(os.path.dirname(os.path.abspath(persistent_data_file_path)), "plan_cache.json"))
+    ChunkCheckpoints().initialize(os.path.join(os.path.dirname(os.path.abspath(persistent_data_file_path)), "checkpoints"))
 
     while True:
         try:
             config.load(config_file_path)
+            ScrapeCache().initialize(os.path.join(os.path.dirname(os.path.abspath(persistent_data_file_path)), "scrape_cache"), int(((config.data.config.scraper or {}).get("cache_max_size_mb") or 128) * 1024 * 1024))
             language = config.get_language_name_for_code(config.data.config.translator.target_language)
             config.vars["target_language"] = language
             openai_api.initialize(config.data.config.openai.api_key)
@@ -40,7 +46,7 @@ def _ui(screen):
             break
 
         try:
-            storage.get_data()
+            storage.get_index()
             logger.info("Persistent data file loaded successfully.")
             page = PageNovelList
             parameters = {"page_index": 0}
@@ -5,7 +5,11 @@ from gptwntranslator.models.sub_chapter import SubChapter
 
 
 class Chapter:
-    """This class represents a chapter in a novel."""
+    """This class represents a chapter in a novel.
+
+    The translated name dictionary may be shared with snapshots of the
+    chapter, so it's replaced rather than changed in place.
+    """
 
     def __init__(self, novel_code: str, chapter_index: int, name: str, translated_name: dict[str, str]={}, sub_chapters: list[SubChapter]=[]) -> None:
         """Initialize a Chapter object.
@@ -79,12 +83,23 @@ class Chapter:
             The original body of the chapter.
         """
 
-        body = self.name
+        return "\n\n".join(self.original_segments().values())
+
+    def original_segments(self) -> dict[str, str]:
+        """Return the pieces of text making up the original body of the chapter.
+
+        Returns
+        -------
+        dict[str, str]
+            The name of the chapter, followed by the contents of every sub
+            chapter, by an id unique within the novel.
+        """
+
+        segments = {f"{self.chapter_index}": self.name}
         for sub_chapter in self.sub_chapters:
-            body += "\n\n"
-            body += sub_chapter.contents
+            segments[f"{self.chapter_index}.{sub_chapter.sub_chapter_index}"] = sub_chapter.contents
 
-        return body
+        return segments
     
     def __deepcopy__(self, memo) -> "Chapter":
         """Return a copy of the Chapter object.
@@ -107,6 +122,22 @@ class Chapter:
             translated_name=copy.deepcopy(self.translated_name, memo), 
             sub_chapters=copy.deepcopy(self.sub_chapters, memo))
 
+    def snapshot(self) -> "Chapter":
+        """Return a copy of the Chapter object sharing its values.
+
+        Returns
+        -------
+        Chapter
+            A copy of the Chapter object, with snapshots of its sub chapters.
+        """
+
+        return Chapter(
+            self.novel_code,
+            self.chapter_index,
+            self.name,
+            translated_name=self.translated_name,
+            sub_chapters=[sub_chapter.snapshot() for sub_chapter in self.sub_chapters])
+
 
     def __str__(self) -> str:
         """Return the string representation of a Chapter object."""
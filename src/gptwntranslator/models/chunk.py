@@ -4,7 +4,7 @@
 class Chunk:
     """This class represents a chunk of text from a sub chapter."""
 
-    def __init__(self, novel_code: str, chapter_index: int, sub_chapter_index: int, chunk_index: int, contents: str, prev_line: str, next_line: str, translation: str="") -> None:
+    def __init__(self, novel_code: str, chapter_index: int, sub_chapter_index: int, chunk_index: int, contents: str, prev_line: str, next_line: str, translation: str="", novel_origin: str="") -> None:
         """Initializes a Chunk object.
 
         Parameters
@@ -25,6 +25,8 @@ class Chunk:
             The first japanese line of the next chunk.
         translation : str, optional
             The translation of the chunk, by default ""
+        novel_origin : str, optional
+            The origin of the novel, by default ""
         """
 
         # Validate parameters
@@ -44,6 +46,8 @@ class Chunk:
             raise TypeError("Next line must be a string")
         if not isinstance(translation, str):
             raise TypeError("Translation must be a string")
+        if not isinstance(novel_origin, str):
+            raise TypeError("Novel origin must be a string")
         
         # Set attributes
         self.novel_code = novel_code
@@ -54,6 +58,7 @@ class Chunk:
         self.prev_line = prev_line
         self.next_line = next_line
         self.translation = translation
+        self.novel_origin = novel_origin
     
     def __str__(self):
         """Return the string representation of a Chunk object."""
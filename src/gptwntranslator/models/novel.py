@@ -7,7 +7,12 @@ from gptwntranslator.models.term_sheet import TermSheet
 
 
 class Novel:
-    """Model for a japanese web novel."""
+    """Model for a japanese web novel.
+
+    The translation dictionaries of the novel, its chapters and sub chapters
+    may be shared with snapshots, see snapshot, so they're replaced rather
+    than changed in place.
+    """
 
     def __init__(self, novel_origin: str, novel_code: str, title: str, author: str, description: str, original_language: str, title_translation: dict[str, str]={}, author_translation: dict[str, str]={}, author_link: str="", description_translation: dict[str, str]={}, chapters: list[Chapter]=[], terms_sheet: TermSheet|NoneType=None) -> None:
         """Initialize a novel object.
@@ -125,12 +130,22 @@ class Novel:
         """
 
         # Return the whole body of text available
-        body = self.title
+        return "\n\n".join(self.original_segments().values())
+
+    def original_segments(self) -> dict[str, str]:
+        """Return the pieces of text making up the body of this novel.
+
+        Returns
+        -------
+        dict[str, str]
+            The title, followed by the segments of every chapter, by id.
+        """
+
+        segments = {"title": self.title}
         for chapter in self.chapters:
-            body += "\n\n"
-            body += chapter.original_body()
+            segments.update(chapter.original_segments())
 
-        return body
+        return segments
     
     def __deepcopy__(self, memo) -> 'Novel':
         """Return a copy of the novel object.
@@ -162,6 +177,36 @@ class Novel:
             terms_sheet=copy.deepcopy(self.terms_sheet, memo)
         )
 
+    def snapshot(self) -> 'Novel':
+        """Return a copy of the novel object sharing its values.
+
+        The snapshot shares the text, translations and terms of the novel
+        instead of copying them. Changes must replace a value, like assigning
+        a new translation dictionary to a sub chapter, rather than change it
+        in place, so they only show in the object they were made on. Terms
+        are copied by the terms sheet the first time they're changed.
+
+        Returns
+        -------
+        Novel
+            A copy of the novel object.
+        """
+
+        return Novel(
+            self.novel_origin,
+            self.novel_code,
+            self.title,
+            self.author,
+            self.description,
+            self.original_language,
+            title_translation=self.title_translation,
+            author_translation=self.author_translation,
+            author_link=self.author_link,
+            description_translation=self.description_translation,
+            chapters=[chapter.snapshot() for chapter in self.chapters],
+            terms_sheet=self.terms_sheet.snapshot()
+        )
+
     def __str__(self):
         """Return the string representation of a Novel object."""
         return f"{self.novel_code}-{self.novel_origin}"
@@ -1,11 +1,23 @@
 """Sub chapter model."""
 
 import copy
+import threading
+from typing import Callable
 from gptwntranslator.models.chunk import Chunk
 
 
+# Serializes the deferred loading of the sub chapter bodies
+_body_lock = threading.Lock()
+
+
 class SubChapter:
-    """This class represents a sub chapter in a chapter."""
+    """This class represents a sub chapter in a chapter.
+
+    The translated name, translation and summary dictionaries may be shared
+    with snapshots of the sub chapter, so they must never be changed in
+    place. A change is made by assigning a new dictionary, as in
+    ``sub_chapter.summary = {**sub_chapter.summary, language: summary}``.
+    """
 
     def __init__(self, novel_code: str, chapter_index: int, sub_chapter_index: int, link: str, name: str, contents: str, release_date: str, translated_name: dict[str, str]={}, translation: dict[str, str]={}, summary: dict[str, str]={}) -> None:
         """Initialize a SubChapter object.
@@ -69,6 +81,7 @@ class SubChapter:
             raise TypeError("Summary values must be strings")       
         
         # Set attributes
+        self._body_loader = None
         self.novel_code = novel_code
         self.chapter_index = chapter_index
         self.sub_chapter_index = sub_chapter_index
@@ -80,18 +93,107 @@ class SubChapter:
         self.translation = translation
         self.summary = summary
 
+    @property
+    def contents(self) -> str:
+        self._load_body()
+        return self._contents
+
+    @contents.setter
+    def contents(self, contents: str) -> None:
+        self._load_body()
+        self._contents = contents
+
+    @property
+    def translation(self) -> dict[str, str]:
+        self._load_body()
+        return self._translation
+
+    @translation.setter
+    def translation(self, translation: dict[str, str]) -> None:
+        self._load_body()
+        self._translation = translation
+
+    @property
+    def summary(self) -> dict[str, str]:
+        self._load_body()
+        return self._summary
+
+    @summary.setter
+    def summary(self, summary: dict[str, str]) -> None:
+        self._load_body()
+        self._summary = summary
+
+    @property
+    def body_loaded(self) -> bool:
+        """Whether the contents, translation and summary are in memory."""
+
+        return self._body_loader is None
+
+    def set_body_loader(self, body_loader: Callable[[], dict]) -> None:
+        """Defer loading the contents, translation and summary until one of them is used.
+
+        Parameters
+        ----------
+        body_loader : Callable[[], dict]
+            A function returning a dictionary with the contents, translation and summary keys.
+        """
+
+        self._body_loader = body_loader
+
+    def _load_body(self) -> None:
+        if self._body_loader is None:
+            return
+        with _body_lock:
+            if self._body_loader is None:
+                return
+            body = self._body_loader()
+            self._contents = body["contents"]
+            self._translation = body["translation"]
+            self._summary = body["summary"]
+            self._body_loader = None
+
+    def snapshot(self) -> "SubChapter":
+        """Return a copy of the sub chapter sharing its values.
+
+        The values of a sub chapter are replaced rather than changed in place,
+        so the copy and the original can change independently without copying
+        their text.
+
+        Returns
+        -------
+        SubChapter
+            The copy of the sub chapter.
+        """
+
+        return copy.copy(self)
+
     def __deepcopy__(self, memo):
+        # Keep a sub chapter whose body isn't loaded lazy in the copy
+        body_loader = self._body_loader
+        if body_loader is not None:
+            sub_chapter = SubChapter(
+                self.novel_code,
+                self.chapter_index,
+                self.sub_chapter_index,
+                self.link,
+                self.name,
+                "",
+                self.release_date,
+                translated_name=copy.deepcopy(self.translated_name, memo))
+            sub_chapter.set_body_loader(body_loader)
+            return sub_chapter
+
         return SubChapter(
             self.novel_code,
             self.chapter_index,
             self.sub_chapter_index,
             self.link,
             self.name,
-            self.contents,
+            self._contents,
             self.release_date,
             translated_name=copy.deepcopy(self.translated_name, memo),
-            translation=copy.deepcopy(self.translation, memo),
-            summary=copy.deepcopy(self.summary, memo)
+            translation=copy.deepcopy(self._translation, memo),
+            summary=copy.deepcopy(self._summary, memo)
         )
 
     def __str__(self):
@@ -6,7 +6,7 @@ import copy
 class Term:
     """This class represents a term."""
 
-    def __init__(self, original_term, pho_rom_term, document_frequency: int=0, context_relevance: int=0, ner: int=0, translations: dict[str, str]=dict()) -> None:
+    def __init__(self, original_term, pho_rom_term, document_frequency: int=0, context_relevance: int=0, ner: int=0, translations: dict[str, str]=dict(), ner_processed: bool=False) -> None:
         """Initialize the term.
 
         Parameters
@@ -21,6 +21,10 @@ class Term:
             The context relevance of the term.
         ner : int
             The NER (named entity recognition) value of the term.
+        translations : dict[str, str]
+            The translations of the term, by language.
+        ner_processed : bool
+            Whether the NER value of the term was already calculated.
         """
 
         # Validate parameters
@@ -34,14 +38,18 @@ class Term:
             raise TypeError("Context relevance must be an integer")
         if not isinstance(ner, int):
             raise TypeError("NER value must be an integer")
+        if not isinstance(ner_processed, bool):
+            raise TypeError("NER processed flag must be a boolean")
         
         # Set the properties
+        self._weight = None
         self.original_term = original_term
         self.pho_rom_term = pho_rom_term
         self.document_frequency = document_frequency
         self.context_relevance = context_relevance
         self.ner = ner
         self.translations = translations
+        self.ner_processed = ner_processed
 
     def __deepcopy__(self, memo) -> "Term":
         """Deep copy the term.
@@ -64,10 +72,41 @@ class Term:
             document_frequency=self.document_frequency, 
             context_relevance=self.context_relevance, 
             ner=self.ner, 
-            translations=copy.deepcopy(self.translations, memo))
+            translations=copy.deepcopy(self.translations, memo),
+            ner_processed=self.ner_processed)
 
         return copy_term
 
+    @property
+    def document_frequency(self) -> int:
+        """The document frequency of the term."""
+        return self._document_frequency
+
+    @document_frequency.setter
+    def document_frequency(self, value: int) -> None:
+        self._document_frequency = value
+        self._weight = None
+
+    @property
+    def context_relevance(self) -> int:
+        """The context relevance of the term."""
+        return self._context_relevance
+
+    @context_relevance.setter
+    def context_relevance(self, value: int) -> None:
+        self._context_relevance = value
+        self._weight = None
+
+    @property
+    def ner(self) -> int:
+        """The NER (named entity recognition) value of the term."""
+        return self._ner
+
+    @ner.setter
+    def ner(self, value: int) -> None:
+        self._ner = value
+        self._weight = None
+
     def add_translation(self, language: str, translation: str):
         """Add a translation to the term.
 
@@ -98,8 +137,12 @@ class Term:
         -------
         int
             The weight of the term. Calculated as a weighted sum of the document frequency, context relevance and NER value.
+            Cached until one of them changes.
         """
 
+        if self._weight is not None:
+            return self._weight
+
         # Define weights for each property
         w_document_frequency = 1
         w_context_relevance = 2
@@ -109,6 +152,7 @@ class Term:
         weight = (self.document_frequency * w_document_frequency +
                 self.context_relevance * w_context_relevance +
                 self.ner * w_ner)
+        self._weight = weight
 
         return weight
     
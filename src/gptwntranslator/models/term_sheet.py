@@ -1,19 +1,25 @@
 """Terms sheet model."""
 
 import copy
+import hashlib
+import heapq
+import threading
+from bisect import bisect_left, insort
+from collections import Counter
 from types import NoneType
-import spacy
 import re
 
-from janome.tokenizer import Tokenizer
+from gptwntranslator.helpers.aho_corasick_helper import AhoCorasick
 from gptwntranslator.helpers.config_helper import Config
+from gptwntranslator.helpers.cooccurrence_helper import count_cooccurrences, tokenize_offsets
+from gptwntranslator.helpers.spacy_helper import SpacyPipelines
 
 from gptwntranslator.models.term import Term
 
 class TermSheet:
     """This class represents a terms sheet."""
 
-    def __init__(self, novel_origin: str, novel_code: str, terms: dict[str, Term]={}) -> None:
+    def __init__(self, novel_origin: str, novel_code: str, terms: dict[str, Term]={}, frequency_terms: list[str]=[], frequency_counts: dict[str, dict]={}) -> None:
         """Initialize a terms sheet object.
 
         Parameters
@@ -22,6 +28,10 @@ class TermSheet:
             The code of the novel.
         terms : dict[str, Term]|NoneType, optional
             The terms in the terms sheet, by default None
+        frequency_terms : list[str], optional
+            The terms the kept frequency counts were made for, by default none
+        frequency_counts : dict[str, dict], optional
+            The hash and the term counts of each segment of the novel, by segment id, by default none
         """
 
         # Validate parameters
@@ -35,11 +45,30 @@ class TermSheet:
             raise TypeError("Terms must be a dictionary of terms by string")
         if not all(isinstance(term, str) for term in terms.keys()):
             raise TypeError("Terms must be a dictionary of terms by string")
+        if not isinstance(frequency_terms, list):
+            raise TypeError("Frequency terms must be a list")
+        if not isinstance(frequency_counts, dict):
+            raise TypeError("Frequency counts must be a dictionary")
         
         # Initialize properties
         self.novel_origin = novel_origin
         self.novel_code = novel_code
         self.terms = terms
+        self._shared_terms = set()
+        self._automaton = None
+        # A snapshot borrows the automaton of its sheet, which may go on adding the terms it gets later
+        self._automaton_owned = True
+        self._automaton_lock = threading.Lock()
+        self._frequency_counts = dict(frequency_counts)
+        self._frequency_terms = set(frequency_terms)
+        self._relevance_segments = {}
+        self._relevance_terms = set()
+        self._relevance_window_size = None
+        self._weight_index = None
+        self._weight_keys = {}
+        self._weight_sequence = 0
+        self._weight_dirty = set()
+        self._weight_lock = threading.RLock()
 
     def __deepcopy__(self, memo: dict) -> 'TermSheet':
         """Deep copy the terms sheet.
@@ -61,13 +90,77 @@ class TermSheet:
         # Return the deep copy
         return TermSheet(self.novel_origin, self.novel_code, terms=terms)
 
-    def process_new_terms(self, term_list_str: str):
+    def snapshot(self) -> 'TermSheet':
+        """Return a copy of the terms sheet sharing its terms.
+
+        The terms stay shared by both sheets until one of them changes a term,
+        at which point that sheet copies the term first. The copy borrows the
+        automaton of the terms, so it's only built again if the copy gets new
+        terms of its own.
+
+        Returns
+        -------
+        TermSheet
+            The copy of the terms sheet.
+        """
+
+        terms_sheet = TermSheet(self.novel_origin, self.novel_code, terms=dict(self.terms))
+        self._shared_terms = set(self.terms)
+        terms_sheet._shared_terms = set(self.terms)
+        with self._automaton_lock:
+            terms_sheet._automaton = self._automaton
+            terms_sheet._automaton_owned = False
+        terms_sheet._frequency_counts = dict(self._frequency_counts)
+        terms_sheet._frequency_terms = set(self._frequency_terms)
+        terms_sheet._relevance_segments = dict(self._relevance_segments)
+        terms_sheet._relevance_terms = set(self._relevance_terms)
+        terms_sheet._relevance_window_size = self._relevance_window_size
+        with self._weight_lock:
+            if self._weight_index is not None:
+                terms_sheet._weight_index = list(self._weight_index)
+                terms_sheet._weight_keys = dict(self._weight_keys)
+                terms_sheet._weight_sequence = self._weight_sequence
+                terms_sheet._weight_dirty = set(self._weight_dirty)
+
+        return terms_sheet
+
+    def get_writable_term(self, original_term: str) -> Term:
+        """Return a term of the sheet that can be changed in place.
+
+        Parameters
+        ----------
+        original_term : str
+            The original term of the term.
+
+        Returns
+        -------
+        Term
+            The term, copied first if it's shared with a snapshot.
+        """
+
+        if original_term in self._shared_terms:
+            self.terms[original_term] = copy.deepcopy(self.terms[original_term])
+            self._shared_terms.discard(original_term)
+
+        # The weight of the term may change, so its place in the index is checked on the next query
+        with self._weight_lock:
+            if self._weight_index is not None:
+                self._weight_dirty.add(original_term)
+
+        return self.terms[original_term]
+
+    def process_new_terms(self, term_list_str: str) -> list[str]:
         """Parse a string of terms into a dictionary of terms.
 
         Parameters
         ----------
         term_list_str : str
             The string of terms to parse
+
+        Returns
+        -------
+        list[str]
+            The original terms that weren't in the sheet before.
         """
 
         # Validate parameters
@@ -77,6 +170,7 @@ class TermSheet:
         # Initialize variables
         lines = term_list_str.splitlines()
         cf = Config()
+        new_terms = []
 
         # Parse the cheat sheet
         for line in lines:
@@ -93,119 +187,416 @@ class TermSheet:
 
             # Add the term to the list of terms
             if original_term not in self.terms:
-                self.terms[original_term] = Term(original_term, ro_pho_term)
+                self.terms[original_term] = Term(original_term, ro_pho_term, translations={})
+                self._add_to_automaton(original_term)
+                self._index_new_term(original_term)
+                new_terms.append(original_term)
 
             # Add the translation to the term
             language = cf.data.config.translator.target_language
-            term = copy.deepcopy(self.terms[original_term])
-            term.add_translation(language, translated_term)
-            self.terms[original_term] = term
+            self.get_writable_term(original_term).add_translation(language, translated_term)
+
+        return new_terms
 
-    def update_dimensions(self, novel_str: str, original_language: str) -> None:
+    def update_dimensions(self, novel_segments: dict[str, str], original_language: str) -> None:
         """Update the dimensions of the terms sheet.
 
         Parameters
         ----------
-        novel_str : str
-            The novel to update the dimensions for.
+        novel_segments : dict[str, str]
+            The pieces of text of the novel to update the dimensions for, by segment id.
+        original_language : str
+            The original language of the novel.
         """
 
         # Validate parameters
-        if not isinstance(novel_str, str):
-            raise TypeError("Novel string must be a string")
+        if not isinstance(novel_segments, dict):
+            raise TypeError("Novel segments must be a dictionary")
+        if not all(isinstance(segment_id, str) and isinstance(segment, str) for segment_id, segment in novel_segments.items()):
+            raise TypeError("Novel segments must be strings by string")
+
+        # The kept counts are matched to the segments by id and hash, so the text itself isn't kept
+        segment_hashes = {segment_id: hashlib.sha256(segment.encode("utf-8")).hexdigest() for segment_id, segment in novel_segments.items()}
 
         # Calculate the term document frequencies
-        self._calc_term_document_frequencies(novel_str)
+        self._calc_term_document_frequencies(novel_segments, segment_hashes)
 
         # Calculate the term context relevance
-        self._calc_term_context_relevance(novel_str)
+        self._calc_term_context_relevance(novel_segments, segment_hashes, original_language)
 
         # Calculate the terms NER value
         self._calc_term_ner(original_language)
 
 
-    def _calc_term_document_frequencies(self, novel_str: str) -> None:
+    def weigh_terms(self, original_terms: list[str], novel_segments: dict[str, str], original_language: str, window_size: int=5) -> None:
+        """Weigh some terms on part of the novel, leaving the kept counts alone.
+
+        Gives the terms found while translating a weight from the text they
+        were found in, without scanning the whole novel, until the next
+        update of the dimensions weighs them on all of it.
+
+        Parameters
+        ----------
+        original_terms : list[str]
+            The original terms to weigh.
+        novel_segments : dict[str, str]
+            The pieces of text of the novel to weigh the terms on, by segment id.
+        original_language : str
+            The original language of the novel.
+        window_size : int
+            The size of the window in tokens to calculate the context relevance for, defaults to 5.
+        """
+
+        # Validate parameters
+        if not isinstance(original_terms, list):
+            raise TypeError("Original terms must be a list")
+        if not isinstance(novel_segments, dict):
+            raise TypeError("Novel segments must be a dictionary")
+        if not isinstance(original_language, str):
+            raise TypeError("Original language must be a string")
+
+        original_terms = [original_term for original_term in original_terms if original_term in self.terms]
+        if not original_terms:
+            return
+
+        try:
+            weighed_terms = set(original_terms)
+            frequencies = Counter()
+            relevances = Counter()
+            for segment in novel_segments.values():
+                occurrences = self._find_term_occurrences(segment)
+                frequencies.update(term for _, _, term in occurrences if term in weighed_terms)
+                if any(term in weighed_terms for _, _, term in occurrences):
+                    relevances.update(count_cooccurrences(occurrences, tokenize_offsets(segment, original_language), window_size))
+
+            for original_term in original_terms:
+                term = self.get_writable_term(original_term)
+                term.document_frequency = frequencies[original_term]
+                term.context_relevance = relevances[original_term]
+        except Exception as e:
+            raise Exception(f"Error weighing terms: {e}")
+
+        # Calculate the terms NER value
+        self._calc_term_ner(original_language)
+
+    def _calc_term_document_frequencies(self, novel_segments: dict[str, str], segment_hashes: dict[str, str]) -> None:
         """Calculate the document frequencies of the terms in the terms sheet.
 
+        The frequencies are counted from scratch, in a single pass over each
+        segment. The counts of every segment are kept with the sheet, by
+        segment id along with the hash of its text, so a later call only scans
+        the segments that are new or changed, and the others only for the
+        terms added since.
+
         Parameters
         ----------
-        novel_str : str
-            The novel to calculate the document frequencies for.
+        novel_segments : dict[str, str]
+            The pieces of text of the novel to calculate the document frequencies for, by segment id.
+        segment_hashes : dict[str, str]
+            The hash of each segment, by segment id.
         """
 
         # Validate parameters
-        if not isinstance(novel_str, str):
-            raise TypeError("Novel string must be a string")
+        if not isinstance(novel_segments, dict):
+            raise TypeError("Novel segments must be a dictionary")
 
-        try: 
-            for term in self.terms.values():
-                self.terms[term.original_term].document_frequency += novel_str.count(term.original_term)
+        try:
+            # Forget the counts of text that's no longer part of the novel
+            segment_counts = {segment_id: self._frequency_counts[segment_id] for segment_id, segment_hash in segment_hashes.items() if self._frequency_counts.get(segment_id, {}).get("hash") == segment_hash}
+
+            # Count the terms added since the unchanged segments were scanned
+            new_terms = [original_term for original_term in self.terms if original_term not in self._frequency_terms]
+            if new_terms and segment_counts:
+                new_terms_automaton = AhoCorasick(new_terms)
+                for segment_id, entry in segment_counts.items():
+                    segment_counts[segment_id] = {"hash": entry["hash"], "counts": {**entry["counts"], **new_terms_automaton.count(novel_segments[segment_id])}}
+
+            # Count every term in the segments new or changed
+            for segment_id, segment in novel_segments.items():
+                if segment_id not in segment_counts:
+                    segment_counts[segment_id] = {"hash": segment_hashes[segment_id], "counts": self._count_terms(segment)}
+
+            self._frequency_counts = segment_counts
+            self._frequency_terms = set(self.terms)
+
+            # Add up the counts of every segment
+            frequencies = Counter()
+            for entry in segment_counts.values():
+                frequencies.update(entry["counts"])
+
+            for original_term, term in list(self.terms.items()):
+                if term.document_frequency != frequencies[original_term]:
+                    self.get_writable_term(original_term).document_frequency = frequencies[original_term]
         except Exception as e:
             raise Exception(f"Error calculating term chunk frequencies: {e}")
         
-    def _calc_term_context_relevance(self, novel_str: str, window_size: int=5) -> None:
+    def _calc_term_context_relevance(self, novel_segments: dict[str, str], segment_hashes: dict[str, str], original_language: str, window_size: int=5) -> None:
         """Calculate the context relevance of the terms in the terms sheet.
 
+        The context relevance of a term is the number of times it occurs
+        within a window of tokens of a different term. The tokens, the term
+        occurrences and the counts of every segment are kept by segment id
+        along with the hash of its text, so a later call only scans the
+        segments that are new or changed, and the others only for the terms
+        added since.
+
         Parameters
         ----------
-        novel_str : str
-            The novel to calculate the context relevance for.
+        novel_segments : dict[str, str]
+            The pieces of text of the novel to calculate the context relevance for, by segment id.
+        segment_hashes : dict[str, str]
+            The hash of each segment, by segment id.
+        original_language : str
+            The original language of the novel.
         window_size : int
-            The size of the window to calculate the context relevance for, defaults to 5.
+            The size of the window in tokens to calculate the context relevance for, defaults to 5.
         """
 
         # Validate parameters
-        if not isinstance(novel_str, str):
-            raise TypeError("Novel string must be a string")
+        if not isinstance(novel_segments, dict):
+            raise TypeError("Novel segments must be a dictionary")
+        if not isinstance(original_language, str):
+            raise TypeError("Original language must be a string")
         if not isinstance(window_size, int):
             raise TypeError("Window size must be an integer")
 
         try:
-            # Get the terms and the number of terms
-            terms = self.terms.values()
-            num_terms = len(terms)
-
-            # Calculate the context relevance for each term
-            for term in terms:
-                original_term = term.original_term
-                indices = [i for i, x in enumerate(novel_str) if x == original_term]
-
-                for index in indices:
-                    start, end = max(0, index - window_size), min(num_terms, index + window_size + 1)
-                    for i in range(start, end):
-                        if novel_str[i] != original_term:
-                            if novel_str[i] in self.terms:
-                                self.terms[novel_str[i]].context_relevance += 1
+            # Occurrences of a term don't depend on the other terms, so the kept ones are completed with the terms added since
+            new_terms = [original_term for original_term in self.terms if original_term not in self._relevance_terms]
+            removed_terms = self._relevance_terms.difference(self.terms)
+            new_terms_automaton = AhoCorasick(new_terms) if new_terms else None
+            recount = bool(new_terms or removed_terms) or window_size != self._relevance_window_size
+
+            relevance_segments = {}
+            for segment_id, segment in novel_segments.items():
+                segment_hash = segment_hashes[segment_id]
+                kept = self._relevance_segments.get(segment_id)
+                if kept is None or kept[0] != segment_hash:
+                    token_offsets = tokenize_offsets(segment, original_language)
+                    occurrences = self._find_term_occurrences(segment)
+                elif not recount:
+                    relevance_segments[segment_id] = kept
+                    continue
+                else:
+                    _, token_offsets, occurrences, _ = kept
+                    if removed_terms:
+                        occurrences = [occurrence for occurrence in occurrences if occurrence[2] not in removed_terms]
+                    if new_terms_automaton is not None:
+                        occurrences = occurrences + new_terms_automaton.find_occurrences(segment)
+                relevance_segments[segment_id] = (segment_hash, token_offsets, occurrences, count_cooccurrences(occurrences, token_offsets, window_size))
+
+            # Forget the text that's no longer part of the novel
+            self._relevance_segments = relevance_segments
+            self._relevance_terms = set(self.terms)
+            self._relevance_window_size = window_size
+
+            # Add up the counts of every segment
+            relevances = Counter()
+            for _, _, _, counts in relevance_segments.values():
+                relevances.update(counts)
+
+            for original_term, term in list(self.terms.items()):
+                if term.context_relevance != relevances[original_term]:
+                    self.get_writable_term(original_term).context_relevance = relevances[original_term]
         except Exception as e:
             raise Exception(f"Error calculating term context relevance: {e}")
 
     def _calc_term_ner(self, original_language: str) -> None:
-        """Find terms which are named entities in the novel.
+        """Find terms which are named entities.
+
+        Only the terms never classified before are run through the
+        recognizer, in batches.
 
         Parameters
         ----------
-        novel_str : str
-            The novel to find named entities in.
+        original_language : str
+            The original language of the novel.
         """
 
+        # Get the terms never classified
+        new_terms = [term.original_term for term in self.terms.values() if not term.ner_processed]
+        if not new_terms:
+            return
+
         cf = Config()
         pipeline = cf.get_spacy_pipeline_for_language_code(original_language)
+        ner_config = cf.data.config.spacy.ner or {}
+        batch_size = ner_config.get("batch_size") or 256
+        n_process = ner_config.get("n_process") or 1
 
         try:
-            # Load the spacy model
-            nlp = spacy.load(pipeline)
-            
-            for term in self.terms.values():
-                doc = nlp(term.original_term)
-
-                for ent in doc.ents:
-                    if ent.text == term.original_term:
-                        term.ner = 1
-                        break
+            # Get the cached recognizer
+            nlp = SpacyPipelines().get_ner(pipeline)
+
+            for original_term, doc in zip(new_terms, nlp.pipe(new_terms, batch_size=batch_size, n_process=n_process)):
+                term = self.get_writable_term(original_term)
+                term.ner = 1 if any(ent.text == original_term for ent in doc.ents) else 0
+                term.ner_processed = True
         except Exception as e:
             raise Exception(f"Error calculating term NER: {e}")
 
-    def _get_top_terms(self, chunk: str|NoneType=None, num_terms: int=15) -> list[Term]:
+    def _get_automaton(self) -> tuple[AhoCorasick, bool]:
+        """Get the automaton matching the original terms of the sheet.
+
+        The automaton is built on first use and extended as new terms are
+        processed. A borrowed automaton may also match terms added to the
+        sheet it was borrowed from, so its matches are filtered by the
+        helpers below.
+
+        Returns
+        -------
+        tuple[AhoCorasick, bool]
+            The automaton, and whether it's owned by the sheet rather than borrowed.
+        """
+
+        with self._automaton_lock:
+            if self._automaton is None:
+                self._automaton = AhoCorasick(self.terms.keys())
+                self._automaton_owned = True
+            return self._automaton, self._automaton_owned
+
+    def _add_to_automaton(self, original_term: str) -> None:
+        """Add a new term to the automaton, if it's built.
+
+        Parameters
+        ----------
+        original_term : str
+            The original term of the new term.
+        """
+
+        with self._automaton_lock:
+            if self._automaton is None:
+                return
+            if self._automaton_owned:
+                self._automaton.add(original_term)
+            else:
+                # The borrowed automaton can't take the term, so the sheet builds its own on next use
+                self._automaton = None
+
+    def _find_terms(self, text: str) -> list[str]:
+        """Find the terms of the sheet present in a text.
+
+        Parameters
+        ----------
+        text : str
+            The text to search.
+
+        Returns
+        -------
+        list[str]
+            The original terms found, each once.
+        """
+
+        automaton, owned = self._get_automaton()
+        found = automaton.find(text)
+        if owned:
+            return found
+        return [original_term for original_term in found if original_term in self.terms]
+
+    def _find_term_occurrences(self, text: str) -> list[tuple[int, int, str]]:
+        """Find the occurrences of the terms of the sheet in a text.
+
+        Parameters
+        ----------
+        text : str
+            The text to search.
+
+        Returns
+        -------
+        list[tuple[int, int, str]]
+            The start, end and original term of every occurrence.
+        """
+
+        automaton, owned = self._get_automaton()
+        occurrences = automaton.find_occurrences(text)
+        if owned:
+            return occurrences
+        return [occurrence for occurrence in occurrences if occurrence[2] in self.terms]
+
+    def _count_terms(self, text: str) -> dict[str, int]:
+        """Count the occurrences of the terms of the sheet in a text.
+
+        Parameters
+        ----------
+        text : str
+            The text to search.
+
+        Returns
+        -------
+        dict[str, int]
+            The number of occurrences of each original term found.
+        """
+
+        return dict(Counter(original_term for _, _, original_term in self._find_term_occurrences(text)))
+
+    def _index_new_term(self, original_term: str) -> None:
+        """Add a new term to the weight index.
+
+        Parameters
+        ----------
+        original_term : str
+            The original term of the new term.
+        """
+
+        with self._weight_lock:
+            if self._weight_index is None:
+                return
+            key = (-self.terms[original_term]._get_weight(), self._weight_sequence)
+            self._weight_sequence += 1
+            self._weight_keys[original_term] = key
+            insort(self._weight_index, (*key, original_term))
+
+    def _get_weight_index(self) -> list[tuple[int, int, str]]:
+        """Get the index of the terms by descending weight.
+
+        The index is built on first use. Afterwards only the terms changed
+        since the last query are moved, unless most of them changed, in
+        which case it's sorted again. Terms of equal weight keep the order
+        they were added to the sheet in.
+
+        Returns
+        -------
+        list[tuple[int, int, str]]
+            The negated weight, the order of addition and the original term of every term, in ascending order.
+        """
+
+        with self._weight_lock:
+            if self._weight_index is None:
+                self._weight_keys = {original_term: (-term._get_weight(), sequence) for sequence, (original_term, term) in enumerate(self.terms.items())}
+                self._weight_sequence = len(self._weight_keys)
+                self._weight_index = sorted((*key, original_term) for original_term, key in self._weight_keys.items())
+                self._weight_dirty = set()
+                return self._weight_index
+
+            if not self._weight_dirty:
+                return self._weight_index
+
+            # Get the terms whose weight changed
+            moves = []
+            for original_term in self._weight_dirty:
+                weight = self.terms[original_term]._get_weight()
+                key = self._weight_keys.get(original_term)
+                if key is None:
+                    moves.append((original_term, None, (-weight, self._weight_sequence)))
+                    self._weight_sequence += 1
+                elif key[0] != -weight:
+                    moves.append((original_term, key, (-weight, key[1])))
+            self._weight_dirty = set()
+
+            if len(moves) * 8 > len(self._weight_index):
+                for original_term, _, new_key in moves:
+                    self._weight_keys[original_term] = new_key
+                self._weight_index = sorted((*key, original_term) for original_term, key in self._weight_keys.items())
+            else:
+                for original_term, old_key, new_key in moves:
+                    if old_key is not None:
+                        del self._weight_index[bisect_left(self._weight_index, (*old_key, original_term))]
+                    insort(self._weight_index, (*new_key, original_term))
+                    self._weight_keys[original_term] = new_key
+
+            return self._weight_index
+
+    def _get_top_terms(self, chunk: str|NoneType=None, num_terms: int=15, target_language: str|NoneType=None) -> list[Term]:
         """Get the top terms from the terms sheet.
 
         Parameters
@@ -214,11 +605,13 @@ class TermSheet:
             The chunk to get the top terms for. If None, get the top terms for the entire novel. By default None
         num_terms : int, optional
             The number of terms to get, by default 15
-        
+        target_language : str|NoneType, optional
+            If set, only get the terms with a translation to this language, by default None
+
         Returns
         -------
         list[Term]
-            The top terms.
+            The top terms, by descending weight.
         """
 
         # Validate parameters
@@ -226,32 +619,29 @@ class TermSheet:
             raise TypeError("Chunk must be a string")
         if not isinstance(num_terms, int):
             raise TypeError("Number of terms must be an integer")
-        
-        # Get the top terms
-        if self.terms:
-            # If there are terms
-            if len(self.terms) > num_terms:
-                # If there are more terms than the number of terms to get
-                if chunk is None:
-                    # If the chunk is None, get the top terms from the entire novel, capped at the number of terms
-                    terms = sorted(self.terms.values(), reverse=True)[:num_terms]
-                else:
-                    # If the chunk is not None, get the top terms from the chunk, capped at the number of terms
-                    terms = sorted([term for term in self.terms.values() if term.original_term in chunk], reverse=True)[:num_terms]
-            else:
-                # If there are less terms than the number of terms to get
-                if chunk is None:
-                    # If the chunk is None, get the top terms from the entire novel
-                    terms = sorted(self.terms.values(), reverse=True)
-                else:
-                    # If the chunk is not None, get the top terms from the chunk
-                    terms = sorted([term for term in self.terms.values() if term.original_term in chunk], reverse=True)
-        else:
-            # If there are no terms, return an empty list
-            terms = []
+        if target_language is not None and not isinstance(target_language, str):
+            raise TypeError("Target language must be a string")
+
+        with self._weight_lock:
+            weight_index = self._get_weight_index()
+
+            # Without a chunk the heaviest terms are the first of the index
+            if chunk is None:
+                top_terms = []
+                for _, _, original_term in weight_index:
+                    if len(top_terms) >= num_terms:
+                        break
+                    term = self.terms[original_term]
+                    if target_language is None or term.has_translation(target_language):
+                        top_terms.append(term)
+                return top_terms
+
+            # Get the candidate terms in a single pass over the chunk, and keep the heaviest ones
+            candidates = [original_term for original_term in self._find_terms(chunk) if original_term in self._weight_keys]
+            if target_language is not None:
+                candidates = [original_term for original_term in candidates if self.terms[original_term].has_translation(target_language)]
+            return [self.terms[original_term] for original_term in heapq.nsmallest(num_terms, candidates, key=self._weight_keys.__getitem__)]
 
-        return terms
-    
     def __str__(self):
         """Get the string representation of the terms sheet."""
 
@@ -291,12 +681,12 @@ class TermSheet:
         if not isinstance(num_terms, int):
             raise TypeError("Number of terms must be an integer")
         
-        # Get the top terms
+        # Get the top terms present in the chunk
         terms = ""
-        top_terms = self._get_top_terms()
-        
+        top_terms = self._get_top_terms(chunk, num_terms, target_language)
+
         # Get the string representation of the top terms
-        for term in [term for term in top_terms if term.has_translation(target_language)]:
+        for term in top_terms:
             terms += f"{term.for_api(target_language)}\n"
 
         return terms
@@ -22,5 +22,5 @@ class BaseOrigin(ABC):
         pass
 
     @abstractmethod
-    def process_targets(self, chapter_targets: str) -> None:
+    def process_targets(self, novel, targets: dict[str, list[str]], incremental: bool=False) -> list:
         pass
\ No newline at end of file
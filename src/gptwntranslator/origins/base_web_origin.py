@@ -1,17 +1,176 @@
 from abc import abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+import codecs
 import gzip
-from typing import Callable
-from urllib.parse import urlparse
-from urllib.request import urlopen
+import http.client
+import re
+import sys
+import threading
+import zlib
+from typing import Any, Callable
+from urllib.parse import urljoin, urlparse
 from bs4.element import Tag as SoupTag
 
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
+from gptwntranslator.helpers.config_helper import Config
+from gptwntranslator.helpers.design_patterns_helper import singleton
+from gptwntranslator.helpers.host_throttle_helper import HostThrottle, HostThrottles
+from gptwntranslator.helpers.logger_helper import CustomLogger
 from gptwntranslator.models.novel import Novel
 from gptwntranslator.models.chapter import Chapter
+from gptwntranslator.models.sub_chapter import SubChapter
 from gptwntranslator.origins.base_origin import BaseOrigin
+from gptwntranslator.storage.scrape_cache import ScrapeCache
 
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import lxml
+    FAST_PARSER = "lxml"
+except ImportError:
+    FAST_PARSER = "html.parser"
+
+
+logger = CustomLogger(__name__)
+
+# Brotli is only asked for when a decoder for it is installed
+ACCEPT_ENCODING = "gzip, deflate, br" if brotli is not None else "gzip, deflate"
+USER_AGENT = f"Python-urllib/{sys.version_info.major}.{sys.version_info.minor}"
+MAX_REDIRECTS = 5
+MAX_IDLE_CONNECTIONS_PER_HOST = 8
+_charset_header_pattern = re.compile(r'charset\s*=\s*["\']?([\w.:-]+)', re.IGNORECASE)
+# Legacy labels are decoded with their supersets, as browsers do, since pages labelled with them often use characters outside them
+CHARSET_SUPERSETS = {
+    "gb2312": "gb18030",
+    "gbk": "gb18030",
+    "shift_jis": "cp932",
+    "euc_kr": "cp949",
+    "ascii": "cp1252",
+    "iso8859-1": "cp1252",
+}
+_charset_meta_pattern = re.compile(rb'<meta[^>]+charset\s*=\s*["\']?([\w.:-]+)', re.IGNORECASE)
+
+def has_class(class_name: str) -> Callable[[str|list[str]|None], bool]:
+    # While parsing, a strainer sees the raw class attribute, not the list of classes find works on
+    def match(value):
+        if value is None:
+            return False
+        return class_name in (value if isinstance(value, list) else value.split())
+    return match
+
+class HttpResponse:
+    def __init__(self, url: str, status: int, headers: http.client.HTTPMessage, body: bytes) -> None:
+        self.url = url
+        self.status = status
+        self.headers = headers
+        self.body = body
+
+@singleton
+class HttpSession:
+    """Shared HTTP client of the origins.
+
+    Connections are kept alive and pooled per host, so consecutive pages of
+    a site reuse the same connection and TLS session. Compressed responses
+    are negotiated and decompressed as told by their headers.
+    """
+
+    def __init__(self) -> None:
+        self._idle_connections = {}
+        self._lock = threading.Lock()
+
+    def get(self, url: str, headers: dict[str, str]|None=None) -> HttpResponse:
+        request_headers = {"User-Agent": USER_AGENT, "Accept-Encoding": ACCEPT_ENCODING}
+        request_headers.update(headers or {})
+
+        for _ in range(MAX_REDIRECTS + 1):
+            status, response_headers, body = self._request(url, request_headers)
+            location = response_headers.get("Location")
+            if status in (301, 302, 303, 307, 308) and location:
+                url = urljoin(url, location)
+                continue
+            if status >= 400:
+                raise Exception(f"HTTP Error {status}: {url}")
+            return HttpResponse(url, status, response_headers, self._decompress(body, response_headers.get("Content-Encoding", "")))
+
+        raise Exception(f"Too many redirects: {url}")
+
+    def _request(self, url: str, headers: dict[str, str]) -> tuple[int, http.client.HTTPMessage, bytes]:
+        parsed_url = urlparse(url)
+        key = (parsed_url.scheme, parsed_url.netloc)
+        path = parsed_url.path or "/"
+        if parsed_url.query:
+            path += "?" + parsed_url.query
+
+        while True:
+            connection, reused = self._acquire(key)
+            try:
+                connection.request("GET", path, headers=headers)
+                response = connection.getresponse()
+                body = response.read()
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                connection.close()
+                # A pooled connection may have been closed by the server while idle, so the request is sent again on a new one
+                if reused:
+                    continue
+                raise
+            except Exception:
+                connection.close()
+                raise
+
+            if response.will_close:
+                connection.close()
+            else:
+                self._release(key, connection)
+            return response.status, response.headers, body
+
+    def _acquire(self, key: tuple[str, str]) -> tuple[http.client.HTTPConnection, bool]:
+        with self._lock:
+            idle_connections = self._idle_connections.get(key)
+            if idle_connections:
+                return idle_connections.pop(), True
+
+        scheme, netloc = key
+        if scheme == "https":
+            return http.client.HTTPSConnection(netloc, timeout=60), False
+        if scheme == "http":
+            return http.client.HTTPConnection(netloc, timeout=60), False
+        raise ValueError(f"Unsupported URL scheme {scheme}")
+
+    def _release(self, key: tuple[str, str], connection: http.client.HTTPConnection) -> None:
+        with self._lock:
+            idle_connections = self._idle_connections.setdefault(key, [])
+            if len(idle_connections) < MAX_IDLE_CONNECTIONS_PER_HOST:
+                idle_connections.append(connection)
+                return
+        connection.close()
+
+    def _decompress(self, body: bytes, content_encoding: str) -> bytes:
+        # Encodings are listed in the order they were applied
+        for encoding in reversed([encoding.strip().lower() for encoding in content_encoding.split(",") if encoding.strip()]):
+            if encoding in ("gzip", "x-gzip"):
+                body = gzip.decompress(body)
+            elif encoding == "deflate":
+                try:
+                    body = zlib.decompress(body)
+                except zlib.error:
+                    body = zlib.decompress(body, -zlib.MAX_WBITS)
+            elif encoding == "br" and brotli is not None:
+                body = brotli.decompress(body)
+            elif encoding != "identity":
+                raise ValueError(f"Unsupported content encoding {encoding}")
+        return body
 
 class BaseWebOrigin(BaseOrigin):
+    # Whether the pages are fetched through the HTTP session, and so can be revalidated against the scrape cache
+    http_cache = True
+    # The subtree of a sub chapter page holding its contents, parsed alone when fast parsing is enabled
+    sub_chapter_strainer: SoupStrainer|None = None
+    # Bumped whenever the extractors of the origin change, so the values parsed by the previous ones are parsed again
+    extractor_version = 1
+
     @classmethod
     @property
     @abstractmethod
@@ -31,47 +190,113 @@ class BaseWebOrigin(BaseOrigin):
         self.language = language
         super().__init__(location)
 
-    def _conditional_decompression(self, html_bytes: bytes) -> str:
+    def _conditional_decompression(self, html_bytes: bytes) -> bytes:
         if html_bytes.startswith(b"\x1f\x8b\x08"):
             return gzip.decompress(html_bytes)
         else:
             return html_bytes
 
-    def _decode_html(self, html_bytes: bytes) -> str:
-        methods: list[Callable[[bytes], str]] = [
-            lambda x: x.decode(self.encoding),
-            lambda x: gzip.decompress(x).decode(self.encoding),
-            lambda x: self._conditional_decompression(x).decode(self.encoding, errors="ignore"),
-        ]
+    def _detect_charset(self, html_bytes: bytes, content_type: str|None=None) -> str:
+        # The header wins over the meta tags, and the encoding of the origin is the fallback
+        candidates = []
+        if content_type:
+            match = _charset_header_pattern.search(content_type)
+            if match:
+                candidates.append(match.group(1))
+        match = _charset_meta_pattern.search(html_bytes[:4096])
+        if match:
+            candidates.append(match.group(1).decode("ascii"))
 
-        for method in methods:
+        for charset in candidates:
             try:
-                html = method(html_bytes)
-                break
-            except (UnicodeDecodeError, gzip.BadGzipFile):
+                name = codecs.lookup(charset).name
+            except LookupError:
                 continue
-        else:
-            raise UnicodeDecodeError("Cannot decode the html")
+            return CHARSET_SUPERSETS.get(name, name)
+        return self.encoding
 
-        return html
+    def _decode_html(self, html_bytes: bytes, content_type: str|None=None) -> str:
+        # Some servers compress pages without saying so
+        html_bytes = self._conditional_decompression(html_bytes)
+        charset = self._detect_charset(html_bytes, content_type)
 
-    def _get_soup(self, url: str) -> BeautifulSoup:
+        try:
+            return html_bytes.decode(charset)
+        except UnicodeDecodeError as e:
+            # The undecodable bytes are kept visible as replacement characters rather than dropped
+            logger.warning(f"Page labelled {charset} has undecodable bytes at {e.start}-{e.end}, replacing them: {e.reason}")
+            return html_bytes.decode(charset, errors="replace")
+
+    def _validate_url(self, url: str) -> None:
         if not isinstance(url, str):
             raise ValueError(f"URL {url} should be a string")
         if not urlparse(url).scheme:
             raise ValueError(f"URL {url} should have a scheme")
         if not urlparse(url).netloc:
             raise ValueError(f"URL {url} should have a netloc")
+
+    def _get_soup(self, url: str) -> BeautifulSoup:
+        self._validate_url(url)
         
         try:
-            response = urlopen(url)
+            response = HttpSession().get(url)
         except Exception as e:
             raise Exception(f"Cannot open URL {url}") from e
-        html_bytes = response.read()
-        html = self._decode_html(html_bytes)
+        html = self._decode_html(response.body, response.headers.get("Content-Type"))
         
         soup = BeautifulSoup(html, "html.parser")
         return soup
+
+    def _is_fast_parse(self, parse_only: SoupStrainer|None=None) -> bool:
+        return parse_only is not None and bool((Config().data.config.scraper or {}).get("fast_parse"))
+
+    def _make_soup(self, html: str, parse_only: SoupStrainer|None=None) -> BeautifulSoup:
+        if self._is_fast_parse(parse_only):
+            return BeautifulSoup(html, FAST_PARSER, parse_only=parse_only)
+        return BeautifulSoup(html, "html.parser")
+
+    def _get_page(self, url: str, name: str, parse: Callable[[BeautifulSoup], Any], throttle: HostThrottle, parse_only: SoupStrainer|None=None) -> Any:
+        # Origins fetching pages by other means than the HTTP session can't revalidate them
+        if not self.http_cache:
+            with throttle.slot():
+                soup = self._get_soup(url)
+            return parse(soup)
+
+        self._validate_url(url)
+
+        cache = ScrapeCache()
+        entry = cache.get(url)
+        headers = {}
+        if entry is not None:
+            if entry["etag"]:
+                headers["If-None-Match"] = entry["etag"]
+            if entry["last_modified"]:
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+        try:
+            with throttle.slot():
+                response = HttpSession().get(url, headers)
+        except Exception as e:
+            raise Exception(f"Cannot open URL {url}") from e
+
+        # A value is only reused when parsed by the same extractors and parser
+        parser = f"{FAST_PARSER}-fast" if self._is_fast_parse(parse_only) else "html.parser"
+        parsed_key = f"{name}:{self.extractor_version}:{parser}"
+        if response.status == 304 and entry is not None:
+            cache.record(True)
+            if parsed_key in entry["parsed"]:
+                return entry["parsed"][parsed_key]
+            html, etag, last_modified, parsed = entry["html"], entry["etag"], entry["last_modified"], entry["parsed"]
+        else:
+            if entry is not None:
+                cache.record(False)
+            html = self._decode_html(response.body, response.headers.get("Content-Type"))
+            etag, last_modified, parsed = response.headers.get("ETag"), response.headers.get("Last-Modified"), {}
+
+        value = parse(self._make_soup(html, parse_only))
+        parsed[parsed_key] = value
+        cache.set(url, etag, last_modified, html, parsed)
+        return value
     
     @abstractmethod
     def _get_title(self, soup: BeautifulSoup) -> str:
@@ -97,7 +322,7 @@ class BaseWebOrigin(BaseOrigin):
     def _get_sub_chapter_contents(self, soup: BeautifulSoup) -> str:
         pass
     
-    def process_targets(self, novel: Novel, targets: dict[str, list[str]]) -> None:
+    def process_targets(self, novel: Novel, targets: dict[str, list[str]], incremental: bool=False) -> list[SubChapter]:
         if not isinstance(novel, Novel):
             raise ValueError(f"Novel {novel} should be a Novel object")
         if not isinstance(targets, dict):
@@ -108,7 +333,18 @@ class BaseWebOrigin(BaseOrigin):
             raise ValueError(f"Targets values {targets.values()} should be lists")
         if not all(isinstance(item, str) for value in targets.values() for item in value):
             raise ValueError(f"Targets items {targets.items()} should be strings")
-        
+        if not isinstance(incremental, bool):
+            raise ValueError(f"Incremental {incremental} should be a boolean")
+
+        # The index tells which episodes were updated since they were stored, and which are new
+        release_dates = {}
+        if incremental:
+            index_novel = self.process_novel(novel.novel_code)
+            release_dates = {sub_chapter.link: sub_chapter.release_date for chapter in index_novel.chapters for sub_chapter in chapter.sub_chapters}
+            self._merge_index_sub_chapters(novel, index_novel, targets)
+
+        jobs = []
+        skipped = []
         for chapter in novel.chapters:
             chapter.sub_chapters.sort()
 
@@ -121,20 +357,67 @@ class BaseWebOrigin(BaseOrigin):
                     if len(sub_chapter_targets) > 0 and str(sub_chapter.sub_chapter_index) not in sub_chapter_targets:
                         continue
 
-                    try:
-                        if self.sub_chapter_path.startswith(".."):
-                            sub_chapter_link = self.location + self.novel_path + novel.novel_code + self.sub_chapter_path[2:] + sub_chapter.link
-                        elif self.sub_chapter_path.startswith("/"):
-                            sub_chapter_link = self.location + self.sub_chapter_path + sub_chapter.link
-                        else:
-                            raise ValueError(f"Sub chapter link {sub_chapter.link} is not valid or can't be processed")
+                    if incremental and sub_chapter.contents and release_dates.get(sub_chapter.link, sub_chapter.release_date) == sub_chapter.release_date:
+                        skipped.append(sub_chapter)
+                        continue
+
+                    jobs.append(sub_chapter)
 
-                        soup = self._get_soup(sub_chapter_link)
-                        sub_chapter_contents = self._get_sub_chapter_contents(soup)
-                        sub_chapter.contents = sub_chapter_contents
+        if not jobs:
+            return skipped
 
-                    except Exception as e:
-                        raise Exception("Failed to scrape " + sub_chapter.link + ": " + str(e))
+        # The sub chapters are fetched concurrently within the limits of the host, and stored in order
+        throttle = HostThrottles().get(urlparse(self.location).netloc)
+        with ThreadPoolExecutor(max_workers=min(throttle.max_concurrency, len(jobs))) as executor:
+            futures = [executor.submit(self._scrape_sub_chapter, novel, sub_chapter, throttle) for sub_chapter in jobs]
+            try:
+                for sub_chapter, future in zip(jobs, futures):
+                    sub_chapter.contents = future.result()
+                    sub_chapter.release_date = release_dates.get(sub_chapter.link, sub_chapter.release_date)
+            except Exception:
+                for future in futures:
+                    future.cancel()
+                raise
+
+        return skipped
+
+    def _merge_index_sub_chapters(self, novel: Novel, index_novel: Novel, targets: dict[str, list[str]]) -> None:
+        merged = 0
+        for index_chapter in index_novel.chapters:
+            if str(index_chapter.chapter_index) not in targets:
+                continue
+
+            sub_chapter_targets = targets[str(index_chapter.chapter_index)]
+            index_sub_chapters = [sub_chapter for sub_chapter in index_chapter.sub_chapters if len(sub_chapter_targets) == 0 or str(sub_chapter.sub_chapter_index) in sub_chapter_targets]
+            chapter = next((chapter for chapter in novel.chapters if chapter.chapter_index == index_chapter.chapter_index), None)
+            if chapter is None:
+                index_chapter.sub_chapters = index_sub_chapters
+                novel.chapters.append(index_chapter)
+                merged += len(index_sub_chapters)
+                continue
+
+            for sub_chapter in index_sub_chapters:
+                if sub_chapter not in chapter.sub_chapters:
+                    chapter.sub_chapters.append(sub_chapter)
+                    merged += 1
+
+        if merged:
+            novel.chapters.sort()
+            logger.info(f"Merged {merged} sub chapters of the index of {novel.novel_code} missing from storage")
+
+    def _scrape_sub_chapter(self, novel: Novel, sub_chapter: SubChapter, throttle: HostThrottle) -> str:
+        try:
+            if self.sub_chapter_path.startswith(".."):
+                sub_chapter_link = self.location + self.novel_path + novel.novel_code + self.sub_chapter_path[2:] + sub_chapter.link
+            elif self.sub_chapter_path.startswith("/"):
+                sub_chapter_link = self.location + self.sub_chapter_path + sub_chapter.link
+            else:
+                raise ValueError(f"Sub chapter link {sub_chapter.link} is not valid or can't be processed")
+
+            return self._get_page(sub_chapter_link, "sub_chapter_contents", self._get_sub_chapter_contents, throttle, self.sub_chapter_strainer)
+
+        except Exception as e:
+            raise Exception("Failed to scrape " + sub_chapter.link + ": " + str(e))
 
     def process_novel(self, novel_identifier: str) -> None:
         if not isinstance(novel_identifier, str):
@@ -142,13 +425,21 @@ class BaseWebOrigin(BaseOrigin):
         
         url = self.location + self.novel_path + novel_identifier
         
-        try:
-            soup = self._get_soup(url)
-            title = self._get_title(soup)
+        def parse_novel(soup: BeautifulSoup) -> dict:
             author, link = self._get_author(soup)
-            description = self._get_description(soup)
-            index = self._get_index(soup)
-            chapters = self._process_index(index, novel_identifier)
+            return {
+                "title": self._get_title(soup),
+                "author": author,
+                "link": link,
+                "description": self._get_description(soup),
+                "chapters": self._process_index(self._get_index(soup), novel_identifier)}
+
+        try:
+            parsed_novel = self._get_page(url, "novel", parse_novel, HostThrottles().get(urlparse(self.location).netloc))
+            title = parsed_novel["title"]
+            author, link = parsed_novel["author"], parsed_novel["link"]
+            description = parsed_novel["description"]
+            chapters = parsed_novel["chapters"]
         except Exception as e:
             raise Exception("Failed to scrape " + url + ": " + str(e))
         
@@ -1,16 +1,18 @@
 import gzip
 from urllib.parse import urlparse
 from urllib.request import urlopen
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 from bs4.element import Tag as SoupTag
 from gptwntranslator.models.chapter import Chapter
 from gptwntranslator.models.novel import Novel
 from gptwntranslator.models.sub_chapter import SubChapter
 from gptwntranslator.origins.base_origin import BaseOrigin
-from gptwntranslator.origins.base_web_origin import BaseWebOrigin
+from gptwntranslator.origins.base_web_origin import BaseWebOrigin, has_class
 
 
 class JJWXCOrigin(BaseWebOrigin):
+    sub_chapter_strainer = SoupStrainer("div", {"class": has_class("noveltext")})
+
     @classmethod
     @property
     def code(cls):
@@ -197,7 +199,7 @@ class JJWXCOrigin(BaseWebOrigin):
         if not isinstance(soup, BeautifulSoup):
             raise ValueError(f"Soup {soup} should be a BeautifulSoup object")
         
-        sub_chapter_contents = soup.find("table", {"id": "oneboolt"}).find("td", {"class": "novelbody"}).find("div", {"class": "noveltext"}).contents
+        sub_chapter_contents = soup.find("div", {"class": "noveltext"}).contents
 
         sub_chapter_text_contents = ""
 
@@ -1,16 +1,18 @@
 import gzip
 from urllib.parse import urlparse
 from urllib.request import urlopen
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 from bs4.element import Tag as SoupTag
 from gptwntranslator.models.chapter import Chapter
 from gptwntranslator.models.novel import Novel
 from gptwntranslator.models.sub_chapter import SubChapter
 from gptwntranslator.origins.base_origin import BaseOrigin
-from gptwntranslator.origins.base_web_origin import BaseWebOrigin
+from gptwntranslator.origins.base_web_origin import BaseWebOrigin, has_class
 
 
 class KakuyomuOrigin(BaseWebOrigin):
+    sub_chapter_strainer = SoupStrainer("div", {"class": has_class("widget-episodeBody")})
+
     @classmethod
     @property
     def code(cls):
@@ -154,7 +156,7 @@ class KakuyomuOrigin(BaseWebOrigin):
         if not isinstance(soup, BeautifulSoup):
             raise ValueError(f"Soup {soup} should be a BeautifulSoup object")
         
-        sub_chapter_contents = soup.find("div", {"id": "contentMain-inner"}).find("div", {"class": "widget-episodeBody"}).find_all("p")
+        sub_chapter_contents = soup.find("div", {"class": "widget-episodeBody"}).find_all("p")
         sub_chapter_text_contents = ""
 
         for sub_chapter_content in sub_chapter_contents:
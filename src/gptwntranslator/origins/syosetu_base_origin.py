@@ -1,5 +1,5 @@
 from abc import abstractmethod
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 from bs4.element import Tag as SoupTag
 
 from gptwntranslator.models.chapter import Chapter
@@ -10,6 +10,8 @@ from gptwntranslator.origins.base_web_origin import BaseWebOrigin
 
 
 class SyosetuBaseOrigin(BaseWebOrigin):
+    sub_chapter_strainer = SoupStrainer('div', id='novel_honbun')
+
     @classmethod
     @property
     @abstractmethod
@@ -204,7 +206,7 @@ class SyosetuBaseOrigin(BaseWebOrigin):
         if not isinstance(soup, BeautifulSoup):
             raise ValueError(f"Soup {soup} should be a BeautifulSoup object")
         
-        sub_chapter_contents = soup.find('div', id='novel_contents').find('div', id='novel_color').find('div', id='novel_honbun').find_all('p')
+        sub_chapter_contents = soup.find('div', id='novel_honbun').find_all('p')
 
         # Initialize sub chapter contents
         sub_chapter_text_contents = ""
@@ -16,6 +16,8 @@ from gptwntranslator.origins.syosetu_base_origin import SyosetuBaseOrigin
 logger = CustomLogger(__name__)
 
 class SyosetuNovel18Origin(SyosetuBaseOrigin):
+    http_cache = False
+
     @classmethod
     @property
     def code(cls):
@@ -0,0 +1,136 @@
+"""This module contains the checkpoints of the translated chunks of the sub chapters."""
+
+import json
+import os
+import threading
+
+from gptwntranslator.encoders.json_encoder import JsonEncoder
+from gptwntranslator.helpers.design_patterns_helper import singleton
+from gptwntranslator.helpers.file_helper import read_file, write_file
+from gptwntranslator.helpers.logger_helper import CustomLogger
+from gptwntranslator.hooks.object_hook import generic_object_hook
+from gptwntranslator.models.chunk import Chunk
+
+
+logger = CustomLogger(__name__)
+
+@singleton
+class ChunkCheckpoints:
+    """Checkpoints of the chunks translated so far, one file per sub chapter and language.
+
+    Every chunk is written as soon as it's translated, so a sub chapter that
+    fails halfway only needs its missing chunks on the next attempt.
+    """
+
+    def __init__(self) -> None:
+        self._checkpoint_directory = ""
+        self._lock = threading.Lock()
+
+    def initialize(self, checkpoint_directory: str) -> None:
+        """Set the directory backing the checkpoints.
+
+        Parameters
+        ----------
+        checkpoint_directory : str
+            The path of the checkpoint directory, or an empty string to disable the checkpoints.
+        """
+
+        # Validate parameters
+        if not isinstance(checkpoint_directory, str):
+            raise TypeError("Checkpoint directory must be a string")
+
+        self._checkpoint_directory = os.path.abspath(checkpoint_directory) if checkpoint_directory else ""
+
+    def load(self, chunks: list[Chunk], language: str) -> list[Chunk]:
+        """Fill the translation of the chunks that were already translated.
+
+        A checkpointed chunk is only reused if its contents match the chunk
+        being translated, so a sub chapter chunked differently starts over.
+
+        Parameters
+        ----------
+        chunks : list[Chunk]
+            The chunks of a sub chapter.
+        language : str
+            The target language of the translation.
+
+        Returns
+        -------
+        list[Chunk]
+            The chunks still missing a translation.
+        """
+
+        if not self._checkpoint_directory or not chunks:
+            return chunks
+
+        checkpointed = self._read(self._path(chunks[0], language))
+        missing = []
+        for chunk in chunks:
+            previous = checkpointed.get(chunk.chunk_index)
+            if previous is not None and previous.contents == chunk.contents and previous.translation:
+                chunk.translation = previous.translation
+            else:
+                missing.append(chunk)
+
+        if len(missing) < len(chunks):
+            logger.info(f"Resuming chapter {chunks[0].chapter_index} sub chapter {chunks[0].sub_chapter_index} with {len(chunks) - len(missing)} of {len(chunks)} chunks already translated")
+
+        return missing
+
+    def save_chunk(self, chunk: Chunk, language: str) -> None:
+        """Add a translated chunk to the checkpoint of its sub chapter.
+
+        Parameters
+        ----------
+        chunk : Chunk
+            The translated chunk.
+        language : str
+            The target language of the translation.
+        """
+
+        if not self._checkpoint_directory:
+            return
+
+        path = self._path(chunk, language)
+        with self._lock:
+            checkpointed = self._read(path)
+            checkpointed[chunk.chunk_index] = chunk
+            try:
+                write_file(path, json.dumps(list(checkpointed.values()), ensure_ascii=False, cls=JsonEncoder))
+            except Exception as e:
+                logger.warning(f"Failed to write checkpoint {path}: {e}")
+
+    def clear(self, chunk: Chunk, language: str) -> None:
+        """Remove the checkpoint of the sub chapter of a chunk.
+
+        Parameters
+        ----------
+        chunk : Chunk
+            Any chunk of the sub chapter.
+        language : str
+            The target language of the translation.
+        """
+
+        if not self._checkpoint_directory:
+            return
+
+        with self._lock:
+            try:
+                os.remove(self._path(chunk, language))
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.warning(f"Failed to remove checkpoint of chapter {chunk.chapter_index} sub chapter {chunk.sub_chapter_index}: {e}")
+
+    def _path(self, chunk: Chunk, language: str) -> str:
+        return os.path.join(self._checkpoint_directory, chunk.novel_origin, chunk.novel_code, f"{chunk.chapter_index}_{chunk.sub_chapter_index}_{language}.json")
+
+    def _read(self, path: str) -> dict[int, Chunk]:
+        if not os.path.exists(path):
+            return {}
+        try:
+            chunks = json.loads(read_file(path), object_hook=generic_object_hook)
+            return {chunk.chunk_index: chunk for chunk in chunks}
+        except Exception as e:
+            logger.warning(f"Failed to read checkpoint {path}, ignoring it: {e}")
+            return {}
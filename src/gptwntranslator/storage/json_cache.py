@@ -0,0 +1,129 @@
+"""This module contains a small key-value cache persisted as a JSON file."""
+
+import json
+import os
+import threading
+
+from gptwntranslator.helpers.file_helper import read_file, write_file
+from gptwntranslator.helpers.logger_helper import CustomLogger
+
+
+logger = CustomLogger(__name__)
+
+class JsonCache:
+    """This class represents a key-value cache persisted as a JSON file.
+
+    The cache is tagged with a fingerprint. When the fingerprint of the cached
+    entries doesn't match the expected one, every entry is dropped.
+    """
+
+    def __init__(self) -> None:
+        self._cache_file = ""
+        self._fingerprint = ""
+        self._entries = None
+        self._dirty = False
+        self._lock = threading.RLock()
+
+    def initialize(self, cache_file: str) -> None:
+        """Set the file backing the cache.
+
+        Parameters
+        ----------
+        cache_file : str
+            The path of the cache file.
+        """
+
+        # Validate parameters
+        if not isinstance(cache_file, str):
+            raise TypeError("Cache file must be a string")
+
+        with self._lock:
+            self._cache_file = os.path.abspath(cache_file) if cache_file else ""
+            self._fingerprint = ""
+            self._entries = None
+            self._dirty = False
+
+    def set_fingerprint(self, fingerprint: str) -> None:
+        """Set the expected fingerprint, dropping the entries if it changed.
+
+        Parameters
+        ----------
+        fingerprint : str
+            The fingerprint of the data the entries depend on.
+        """
+
+        # Validate parameters
+        if not isinstance(fingerprint, str):
+            raise TypeError("Fingerprint must be a string")
+
+        with self._lock:
+            self._load()
+            if self._fingerprint != fingerprint:
+                if self._entries:
+                    logger.info(f"Fingerprint changed, invalidating {len(self._entries)} cache entries")
+                self._entries = {}
+                self._fingerprint = fingerprint
+                self._dirty = True
+
+    def get(self, key: str) -> object:
+        """Get an entry from the cache.
+
+        Parameters
+        ----------
+        key : str
+            The key of the entry.
+
+        Returns
+        -------
+        object
+            The entry, or None if it isn't cached.
+        """
+
+        with self._lock:
+            self._load()
+            return self._entries.get(key)
+
+    def set(self, key: str, value: object) -> None:
+        """Store an entry in the cache.
+
+        Parameters
+        ----------
+        key : str
+            The key of the entry.
+        value : object
+            The JSON serializable entry.
+        """
+
+        with self._lock:
+            self._load()
+            self._entries[key] = value
+            self._dirty = True
+
+    def save(self) -> None:
+        """Write the cache to its file if it has changed."""
+
+        with self._lock:
+            if not self._dirty or not self._cache_file:
+                return
+            try:
+                write_file(self._cache_file, json.dumps({"fingerprint": self._fingerprint, "entries": self._entries}, ensure_ascii=False))
+                self._dirty = False
+            except Exception as e:
+                logger.warning(f"Failed to write cache file {self._cache_file}: {e}")
+
+    def _load(self) -> None:
+        if self._entries is not None:
+            return
+
+        self._entries = {}
+        if not self._cache_file or not os.path.exists(self._cache_file):
+            return
+
+        try:
+            data = json.loads(read_file(self._cache_file))
+            self._fingerprint = data["fingerprint"]
+            self._entries = data["entries"]
+        except Exception as e:
+            logger.warning(f"Failed to read cache file {self._cache_file}, starting with an empty cache: {e}")
+            self._fingerprint = ""
+            self._entries = {}
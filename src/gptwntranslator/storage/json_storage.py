@@ -1,10 +1,22 @@
+import hashlib
 import json
-from gptwntranslator.encoders.json_encoder import JsonEncoder
+import os
+import re
+import shutil
+import threading
+from gptwntranslator.encoders.json_encoder import NovelRecordEncoder
 from gptwntranslator.helpers.design_patterns_helper import singleton
-from gptwntranslator.helpers.file_helper import read_file, write_file
+from gptwntranslator.helpers.file_helper import read_file
+from gptwntranslator.helpers.logger_helper import CustomLogger
 from gptwntranslator.helpers.text_helper import make_printable
 from gptwntranslator.hooks.object_hook import generic_object_hook
 
+
+logger = CustomLogger(__name__)
+
+# Version of the record layout written to the storage file
+STORAGE_FORMAT = 2
+
 class JsonStorageException(Exception):
     pass
 
@@ -16,40 +28,369 @@ class JsonStorageFileException(JsonStorageException):
 
 @singleton
 class JsonStorage:
+    """Storage of the novels, split into one JSON record per novel and per sub chapter.
+
+    The storage file only holds an index of the novels. Each novel is kept in
+    its own record without the bodies of its sub chapters, and the contents,
+    translation and summary of every sub chapter are kept in a record of
+    their own. Novels are read when first requested, and the body of a sub
+    chapter when first used. Saving only rewrites the records whose JSON
+    changed since they were last read or written.
+
+    A storage file in the legacy layout, holding every novel in one JSON
+    list, is migrated on the first read.
+    """
 
     def __init__(self):
         self._storage_file = ""
-        self._data = None
+        self._records_directory = ""
+        self._index = None
+        self._novels = {}
+        self._record_paths = {}
+        self._hashes = {}
+        self._lock = threading.RLock()
 
     def initialize(self, storage_file):
         self._storage_file = storage_file
-        self._data = None
+        self._records_directory = os.path.splitext(os.path.abspath(storage_file))[0] if storage_file else ""
+        self._index = None
+        self._novels = {}
+        self._record_paths = {}
+        self._hashes = {}
+
+    def get_index(self):
+        """Get the index of the stored novels without reading the novels.
+
+        Returns
+        -------
+        list[dict]
+            One entry per novel, with the novel_origin, novel_code, title,
+            title_translation, chapters and sub_chapters keys.
+        """
+
+        with self._lock:
+            if self._index is None:
+                self._read_index()
+            return [dict(entry) for entry in self._index]
+
+    def get_novel(self, novel_origin, novel_code):
+        """Get a stored novel, reading it if needed.
+
+        Parameters
+        ----------
+        novel_origin : str
+            The origin of the novel.
+        novel_code : str
+            The code of the novel.
+
+        Returns
+        -------
+        Novel
+            The novel, with the bodies of its sub chapters read on first use.
+
+        Raises
+        ------
+        JsonStorageException
+            If the novel isn't stored.
+        """
+
+        with self._lock:
+            if self._index is None:
+                self._read_index()
+            if not any(entry["novel_origin"] == novel_origin and entry["novel_code"] == novel_code for entry in self._index):
+                raise JsonStorageException(f"Novel {novel_code} from {novel_origin} not found in storage")
+            if (novel_origin, novel_code) not in self._novels:
+                self._novels[(novel_origin, novel_code)] = self._read_novel(novel_origin, novel_code)
+            return self._novels[(novel_origin, novel_code)]
 
     def get_data(self):
-        if self._data is None:
-            self._read()
-        return self._data
-    
+        with self._lock:
+            if self._index is None:
+                self._read_index()
+            return [self.get_novel(entry["novel_origin"], entry["novel_code"]) for entry in self._index]
+
     def set_data(self, data):
-        self._data = data
-        self._write()
+        with self._lock:
+            previous_keys = {(entry["novel_origin"], entry["novel_code"]) for entry in self._index or []}
+            index = [self._index_entry(novel) for novel in data]
+            records = {}
+            for novel in data:
+                records.update(self._novel_records(novel))
+            records[self._storage_file] = self._encode_index(index)
+            self._write_records(records)
+
+            keys = {(novel.novel_origin, novel.novel_code) for novel in data}
+            for novel_origin, novel_code in previous_keys - keys:
+                self._remove_novel_records(novel_origin, novel_code)
+            for novel in data:
+                self._remove_stale_sub_chapter_records(novel)
+            self._index = index
+            self._novels = {(novel.novel_origin, novel.novel_code): novel for novel in data}
+
+    def save_novel(self, novel):
+        """Add or replace a single novel, writing only its records that changed.
+
+        Parameters
+        ----------
+        novel : Novel
+            The novel to save.
+        """
+
+        with self._lock:
+            if self._index is None:
+                self._read_index()
+            index = [entry for entry in self._index if entry["novel_origin"] != novel.novel_origin or entry["novel_code"] != novel.novel_code]
+            position = next((i for i, entry in enumerate(self._index) if entry["novel_origin"] == novel.novel_origin and entry["novel_code"] == novel.novel_code), len(index))
+            index.insert(position, self._index_entry(novel))
+            records = self._novel_records(novel)
+            records[self._storage_file] = self._encode_index(index)
+            self._write_records(records)
 
-    def _read(self):
+            self._remove_stale_sub_chapter_records(novel)
+            self._index = index
+            self._novels[(novel.novel_origin, novel.novel_code)] = novel
+
+    def save_sub_chapter(self, novel, sub_chapter):
+        """Write the record of a single sub chapter if it changed.
+
+        The save is journaled into the stored copy of the novel as well, so a
+        caller that falls back to that copy after a failure keeps the sub
+        chapters that were saved on their own.
+
+        Parameters
+        ----------
+        novel : Novel
+            The novel of the sub chapter, which must have been saved before.
+        sub_chapter : SubChapter
+            The sub chapter to save.
+
+        Raises
+        ------
+        JsonStorageException
+            If the novel isn't stored.
+        """
+
+        # A body that was never read can't have changed
+        if not sub_chapter.body_loaded:
+            return
+
+        with self._lock:
+            if self._index is None:
+                self._read_index()
+            if not any(entry["novel_origin"] == novel.novel_origin and entry["novel_code"] == novel.novel_code for entry in self._index):
+                raise JsonStorageException(f"Novel {novel.novel_code} from {novel.novel_origin} not found in storage")
+            try:
+                records = {self._sub_chapter_path(novel.novel_origin, novel.novel_code, sub_chapter): self._encode_sub_chapter_body(sub_chapter)}
+            except Exception as e:
+                raise JsonStorageFormatException(f"Error converting sub chapter to JSON: {e}")
+            self._write_records(records)
+            self._journal_sub_chapter(novel, sub_chapter)
+
+    def delete_novel(self, novel_origin, novel_code):
+        """Remove a single novel and its records.
+
+        Parameters
+        ----------
+        novel_origin : str
+            The origin of the novel.
+        novel_code : str
+            The code of the novel.
+
+        Raises
+        ------
+        JsonStorageException
+            If the novel isn't stored.
+        """
+
+        with self._lock:
+            if self._index is None:
+                self._read_index()
+            index = [entry for entry in self._index if entry["novel_origin"] != novel_origin or entry["novel_code"] != novel_code]
+            if len(index) == len(self._index):
+                raise JsonStorageException(f"Novel {novel_code} from {novel_origin} not found in storage")
+            self._write_records({self._storage_file: self._encode_index(index)})
+
+            self._remove_novel_records(novel_origin, novel_code)
+            self._index = index
+
+    def _read_index(self):
         try:
             data_str = read_file(self._storage_file)
         except Exception as e:
             raise JsonStorageFileException(f"Error reading storage file: {e}")
         try:
-            self._data = json.loads(data_str, object_hook=generic_object_hook)
+            index = json.loads(data_str, object_hook=generic_object_hook)
         except Exception as e:
             raise JsonStorageFormatException(f"Error parsing storage file: {e}")
-        
-    def _write(self):
+
+        if isinstance(index, list):
+            self._migrate(index)
+            return
+
         try:
-            novel_printable = make_printable(json.dumps(self._data, ensure_ascii=False, cls=JsonEncoder))
+            if index.get("format") != STORAGE_FORMAT:
+                raise ValueError(f"Unsupported storage format {index.get('format')}")
+            novels = index["novels"]
+            if not all("novel_origin" in entry and "novel_code" in entry for entry in novels):
+                raise ValueError("Index entries must have a novel origin and code")
+        except Exception as e:
+            raise JsonStorageFormatException(f"Error parsing storage file: {e}")
+        self._hashes[self._storage_file] = self._hash(data_str)
+        self._index = novels
+
+    def _read_novel(self, novel_origin, novel_code):
+        try:
+            novel = json.loads(self._read_record(self._novel_path(novel_origin, novel_code)), object_hook=generic_object_hook)
+        except JsonStorageException:
+            raise
+        except Exception as e:
+            raise JsonStorageFormatException(f"Error parsing storage record of novel {novel_code}: {e}")
+
+        paths = set()
+        for chapter in novel.chapters:
+            for sub_chapter in chapter.sub_chapters:
+                path = self._sub_chapter_path(novel_origin, novel_code, sub_chapter)
+                sub_chapter.set_body_loader(self._body_loader(path))
+                paths.add(path)
+        self._record_paths[(novel_origin, novel_code)] = paths
+
+        return novel
+
+    def _journal_sub_chapter(self, novel, sub_chapter):
+        stored_novel = self._novels.get((novel.novel_origin, novel.novel_code))
+        if stored_novel is None or stored_novel is novel:
+            return
+        chapter = next((chapter for chapter in stored_novel.chapters if chapter.chapter_index == sub_chapter.chapter_index), None)
+        stored_sub_chapter = next((stored for stored in chapter.sub_chapters if stored == sub_chapter), None) if chapter else None
+        # A body that isn't loaded yet is read from the record just written
+        if stored_sub_chapter is None or stored_sub_chapter is sub_chapter or not stored_sub_chapter.body_loaded:
+            return
+        # The values are replaced, never changed in place, so sharing them is safe
+        stored_sub_chapter.contents = sub_chapter.contents
+        stored_sub_chapter.translation = sub_chapter.translation
+        stored_sub_chapter.summary = sub_chapter.summary
+
+    def _body_loader(self, path):
+        def load_body():
+            with self._lock:
+                record_str = self._read_record(path)
+            try:
+                return json.loads(record_str)
+            except Exception as e:
+                raise JsonStorageFormatException(f"Error parsing storage record {path}: {e}")
+        return load_body
+
+    def _read_record(self, path):
+        try:
+            record_str = read_file(path)
+        except Exception as e:
+            raise JsonStorageFileException(f"Error reading storage record: {e}")
+        self._hashes[path] = self._hash(record_str)
+        return record_str
+
+    def _migrate(self, novels):
+        logger.info(f"Migrating storage file {self._storage_file} to the record layout")
+        legacy_file = f"{os.path.splitext(self._storage_file)[0]}.legacy.json"
+        try:
+            shutil.copyfile(self._storage_file, legacy_file)
+        except Exception as e:
+            raise JsonStorageFileException(f"Error backing up legacy storage file: {e}")
+        self._index = []
+        self.set_data(novels)
+        logger.info(f"Migrated {len(novels)} novels, legacy storage file kept at {legacy_file}")
+
+    def _index_entry(self, novel):
+        return {
+            "novel_origin": novel.novel_origin,
+            "novel_code": novel.novel_code,
+            "title": novel.title,
+            "title_translation": novel.title_translation,
+            "chapters": len(novel.chapters),
+            "sub_chapters": sum(len(chapter.sub_chapters) for chapter in novel.chapters)}
+
+    def _encode_index(self, index):
+        try:
+            return json.dumps({"format": STORAGE_FORMAT, "novels": index}, ensure_ascii=False)
+        except Exception as e:
+            raise JsonStorageFormatException(f"Error converting data to JSON: {e}")
+
+    def _novel_records(self, novel):
+        try:
+            records = {self._novel_path(novel.novel_origin, novel.novel_code): json.dumps(novel, ensure_ascii=False, cls=NovelRecordEncoder)}
+            for chapter in novel.chapters:
+                for sub_chapter in chapter.sub_chapters:
+                    # A body that was never read can't have changed
+                    if sub_chapter.body_loaded:
+                        records[self._sub_chapter_path(novel.novel_origin, novel.novel_code, sub_chapter)] = self._encode_sub_chapter_body(sub_chapter)
         except Exception as e:
             raise JsonStorageFormatException(f"Error converting data to JSON: {e}")
+        return records
+
+    def _write_records(self, records):
+        # The hashes are taken from the written strings, like the ones of the records read back
         try:
-            write_file(self._storage_file, novel_printable)
+            printable_records = {path: make_printable(record) for path, record in records.items()}
         except Exception as e:
-            raise JsonStorageFileException(f"Error writing storage file: {e}")
\ No newline at end of file
+            raise JsonStorageFormatException(f"Error converting data to JSON: {e}")
+        changed = {path: record for path, record in printable_records.items() if self._hashes.get(path) != self._hash(record)}
+        if not changed:
+            return
+
+        for path, record in changed.items():
+            try:
+                self._write_atomically(path, record)
+            except Exception as e:
+                raise JsonStorageFileException(f"Error writing storage file: {e}")
+            self._hashes[path] = self._hash(record)
+
+        logger.debug(f"Wrote {len(changed)} of {len(records)} storage records")
+
+    def _remove_stale_sub_chapter_records(self, novel):
+        key = (novel.novel_origin, novel.novel_code)
+        paths = {self._sub_chapter_path(novel.novel_origin, novel.novel_code, sub_chapter) for chapter in novel.chapters for sub_chapter in chapter.sub_chapters}
+        for path in self._record_paths.get(key, set()) - paths:
+            self._remove_record(path)
+        self._record_paths[key] = paths
+
+    def _remove_novel_records(self, novel_origin, novel_code):
+        directory = self._novel_directory(novel_origin, novel_code)
+        shutil.rmtree(directory, ignore_errors=True)
+        self._hashes = {path: record_hash for path, record_hash in self._hashes.items() if not path.startswith(directory + os.sep)}
+        self._record_paths.pop((novel_origin, novel_code), None)
+        self._novels.pop((novel_origin, novel_code), None)
+
+    def _remove_record(self, path):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Failed to remove stale storage record {path}: {e}")
+            return
+        self._hashes.pop(path, None)
+
+    def _write_atomically(self, path, contents):
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        temporary_path = f"{path}.tmp"
+        with open(temporary_path, 'w', encoding='utf-8') as f:
+            f.write(contents)
+        os.replace(temporary_path, path)
+
+    def _encode_sub_chapter_body(self, sub_chapter):
+        return json.dumps({"contents": sub_chapter.contents, "translation": sub_chapter.translation, "summary": sub_chapter.summary}, ensure_ascii=False)
+
+    def _novel_directory(self, novel_origin, novel_code):
+        return os.path.join(self._records_directory, self._safe_name(novel_origin), self._safe_name(novel_code))
+
+    def _novel_path(self, novel_origin, novel_code):
+        return os.path.join(self._novel_directory(novel_origin, novel_code), "novel.json")
+
+    def _sub_chapter_path(self, novel_origin, novel_code, sub_chapter):
+        return os.path.join(self._novel_directory(novel_origin, novel_code), "sub_chapters", f"{sub_chapter.chapter_index}_{sub_chapter.sub_chapter_index}.json")
+
+    def _safe_name(self, name):
+        return re.sub(r'[^A-Za-z0-9._-]', '_', name)
+
+    def _hash(self, record):
+        return hashlib.sha256(record.encode('utf-8')).hexdigest()
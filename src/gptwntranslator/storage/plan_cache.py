@@ -0,0 +1,10 @@
+"""This module contains the cache of sub chapter chunk plans."""
+
+from gptwntranslator.helpers.design_patterns_helper import singleton
+from gptwntranslator.storage.json_cache import JsonCache
+
+
+@singleton
+class PlanCache(JsonCache):
+    """Cache of the line token counts, configuration and chunk boundaries of each sub chapter, keyed by a hash of its contents."""
+    pass
@@ -0,0 +1,231 @@
+"""This module contains the on disk cache of the API responses."""
+
+import hashlib
+import json
+import os
+import threading
+
+from gptwntranslator.helpers.design_patterns_helper import singleton
+from gptwntranslator.helpers.logger_helper import CustomLogger
+
+
+logger = CustomLogger(__name__)
+
+@singleton
+class ResponseCache:
+    """Content addressed cache of chat completions, one file per response.
+
+    Entries are keyed by a hash of the model and the messages. Only
+    responses whose choices all finished with "stop" are stored, so a
+    truncated answer is asked for again. When the cache grows over its size
+    cap, the least recently used entries are evicted, using the modification
+    time of the files as the access time.
+    """
+
+    def __init__(self) -> None:
+        self._cache_directory = ""
+        self._max_size = 0
+        self._size = None
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def initialize(self, cache_directory: str, max_size: int=256 * 1024 * 1024) -> None:
+        """Set the directory backing the cache.
+
+        Parameters
+        ----------
+        cache_directory : str
+            The path of the cache directory, or an empty string to disable the cache.
+        max_size : int, optional
+            The maximum size of the cache in bytes, by default 256 MiB
+        """
+
+        # Validate parameters
+        if not isinstance(cache_directory, str):
+            raise TypeError("Cache directory must be a string")
+        if not isinstance(max_size, int):
+            raise TypeError("Max size must be an integer")
+        if max_size <= 0:
+            raise ValueError("Max size must be greater than 0")
+
+        with self._lock:
+            self._cache_directory = os.path.abspath(cache_directory) if cache_directory else ""
+            self._max_size = max_size
+            self._size = None
+
+    @staticmethod
+    def key(model: str, messages: list[dict]) -> str:
+        """Get the key of a request.
+
+        Parameters
+        ----------
+        model : str
+            The name of the model.
+        messages : list[dict]
+            The messages of the request.
+
+        Returns
+        -------
+        str
+            The key of the request.
+        """
+
+        request = json.dumps({"model": model, "messages": messages}, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(request.encode("utf-8")).hexdigest()
+
+    def get(self, model: str, messages: list[dict]) -> dict:
+        """Get the cached response of a request.
+
+        Parameters
+        ----------
+        model : str
+            The name of the model.
+        messages : list[dict]
+            The messages of the request.
+
+        Returns
+        -------
+        dict
+            The response, or None if it isn't cached.
+        """
+
+        if not self._cache_directory:
+            return None
+
+        path = self._path(self.key(model, messages))
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                response = json.load(f)
+            # Mark the entry as recently used
+            os.utime(path)
+        except (OSError, ValueError):
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+        return response
+
+    def set(self, model: str, messages: list[dict], response: dict) -> None:
+        """Store the response of a request.
+
+        Responses with a choice that didn't finish with "stop", like a
+        truncated answer, aren't stored.
+
+        Parameters
+        ----------
+        model : str
+            The name of the model.
+        messages : list[dict]
+            The messages of the request.
+        response : dict
+            The JSON serializable response.
+        """
+
+        if not self._cache_directory:
+            return
+        if not self._is_complete(response):
+            logger.debug(f"Not caching an incomplete response")
+            return
+
+        path = self._path(self.key(model, messages))
+        temporary_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(self._cache_directory, exist_ok=True)
+            with open(temporary_path, "w", encoding="utf-8") as f:
+                json.dump(response, f, ensure_ascii=False)
+        except Exception as e:
+            logger.warning(f"Failed to write response cache entry {path}: {e}")
+            return
+
+        with self._lock:
+            try:
+                # An overwritten entry no longer counts towards the size
+                previous_size = os.path.getsize(path) if os.path.exists(path) else 0
+                os.replace(temporary_path, path)
+                entry_size = os.path.getsize(path)
+            except Exception as e:
+                logger.warning(f"Failed to write response cache entry {path}: {e}")
+                return
+
+            if self._size is None:
+                self._size = self._scan_size()
+            else:
+                self._size += entry_size - previous_size
+            if self._size > self._max_size:
+                self._evict()
+
+    def invalidate(self, model: str, messages: list[dict]) -> None:
+        """Drop the cached response of a request.
+
+        Parameters
+        ----------
+        model : str
+            The name of the model.
+        messages : list[dict]
+            The messages of the request.
+        """
+
+        if not self._cache_directory:
+            return
+
+        path = self._path(self.key(model, messages))
+        with self._lock:
+            try:
+                entry_size = os.path.getsize(path)
+                os.remove(path)
+                if self._size is not None:
+                    self._size -= entry_size
+            except OSError:
+                pass
+
+    def get_stats(self) -> dict:
+        """Get the hit and miss counters of the cache.
+
+        Returns
+        -------
+        dict
+            The hits and misses since the start of the process.
+        """
+
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses}
+
+    @staticmethod
+    def _is_complete(response: dict) -> bool:
+        try:
+            choices = response["choices"]
+            return bool(choices) and all(choice["finish_reason"] == "stop" for choice in choices)
+        except (KeyError, TypeError):
+            return False
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self._cache_directory, f"{key}.json")
+
+    def _entries(self) -> list[os.DirEntry]:
+        try:
+            return [entry for entry in os.scandir(self._cache_directory) if entry.is_file() and entry.name.endswith(".json")]
+        except OSError:
+            return []
+
+    def _scan_size(self) -> int:
+        return sum(entry.stat().st_size for entry in self._entries())
+
+    def _evict(self) -> None:
+        # Drop the least recently used entries until the cache is back to 90% of its cap
+        entries = sorted(self._entries(), key=lambda entry: entry.stat().st_mtime)
+        target_size = self._max_size * 0.9
+        evicted = 0
+        for entry in entries:
+            if self._size <= target_size:
+                break
+            try:
+                entry_size = entry.stat().st_size
+                os.remove(entry.path)
+                self._size -= entry_size
+                evicted += 1
+            except OSError:
+                continue
+        logger.info(f"Evicted {evicted} response cache entries")
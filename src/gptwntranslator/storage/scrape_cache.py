@@ -0,0 +1,192 @@
+"""This module contains the on disk cache of the scraped pages."""
+
+import hashlib
+import json
+import os
+import threading
+
+from gptwntranslator.encoders.json_encoder import JsonEncoder
+from gptwntranslator.helpers.design_patterns_helper import singleton
+from gptwntranslator.helpers.logger_helper import CustomLogger
+from gptwntranslator.hooks.object_hook import generic_object_hook
+
+
+logger = CustomLogger(__name__)
+
+@singleton
+class ScrapeCache:
+    """Cache of the scraped pages, one file per URL.
+
+    Each entry keeps the validators of the page, its decoded HTML and the
+    values parsed from it, so a page the site reports as not modified is
+    neither downloaded nor parsed again. Only pages sent with an ETag or a
+    Last-Modified header are cached, since the others can't be revalidated.
+    When the cache grows over its size cap, the least recently used entries
+    are evicted, using the modification time of the files as the access time.
+    """
+
+    def __init__(self) -> None:
+        self._cache_directory = ""
+        self._max_size = 0
+        self._size = None
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def initialize(self, cache_directory: str, max_size: int=128 * 1024 * 1024) -> None:
+        """Set the directory backing the cache.
+
+        Parameters
+        ----------
+        cache_directory : str
+            The path of the cache directory, or an empty string to disable the cache.
+        max_size : int, optional
+            The maximum size of the cache in bytes, by default 128 MiB
+        """
+
+        # Validate parameters
+        if not isinstance(cache_directory, str):
+            raise TypeError("Cache directory must be a string")
+        if not isinstance(max_size, int):
+            raise TypeError("Max size must be an integer")
+        if max_size <= 0:
+            raise ValueError("Max size must be greater than 0")
+
+        with self._lock:
+            self._cache_directory = os.path.abspath(cache_directory) if cache_directory else ""
+            self._max_size = max_size
+            self._size = None
+
+    def get(self, url: str) -> dict:
+        """Get the cached entry of a page.
+
+        Parameters
+        ----------
+        url : str
+            The URL of the page.
+
+        Returns
+        -------
+        dict
+            The entry, with the etag, last_modified, html and parsed keys, or None if the page isn't cached.
+        """
+
+        if not self._cache_directory:
+            return None
+
+        path = self._path(url)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f, object_hook=generic_object_hook)
+            if entry.get("url") != url:
+                return None
+            # Mark the entry as recently used
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+
+        return entry
+
+    def set(self, url: str, etag: str, last_modified: str, html: str, parsed: dict) -> None:
+        """Store the entry of a page.
+
+        Parameters
+        ----------
+        url : str
+            The URL of the page.
+        etag : str
+            The ETag header of the page, or None.
+        last_modified : str
+            The Last-Modified header of the page, or None.
+        html : str
+            The decoded HTML of the page.
+        parsed : dict
+            The values parsed from the page, by name.
+        """
+
+        if not self._cache_directory or (not etag and not last_modified):
+            return
+
+        entry = {"url": url, "etag": etag, "last_modified": last_modified, "html": html, "parsed": parsed}
+        path = self._path(url)
+        temporary_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(self._cache_directory, exist_ok=True)
+            with open(temporary_path, "w", encoding="utf-8") as f:
+                json.dump(entry, f, ensure_ascii=False, cls=JsonEncoder)
+        except Exception as e:
+            logger.warning(f"Failed to write scrape cache entry {path}: {e}")
+            return
+
+        with self._lock:
+            try:
+                # An overwritten entry no longer counts towards the size
+                previous_size = os.path.getsize(path) if os.path.exists(path) else 0
+                os.replace(temporary_path, path)
+                entry_size = os.path.getsize(path)
+            except Exception as e:
+                logger.warning(f"Failed to write scrape cache entry {path}: {e}")
+                return
+
+            if self._size is None:
+                self._size = self._scan_size()
+            else:
+                self._size += entry_size - previous_size
+            if self._size > self._max_size:
+                self._evict()
+
+    def record(self, not_modified: bool) -> None:
+        """Count a revalidation of a cached page.
+
+        Parameters
+        ----------
+        not_modified : bool
+            Whether the site reported the page as not modified.
+        """
+
+        with self._lock:
+            if not_modified:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def get_stats(self) -> dict:
+        """Get the hit and miss counters of the cache.
+
+        Returns
+        -------
+        dict
+            The pages found not modified and modified since the start of the process.
+        """
+
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses}
+
+    def _path(self, url: str) -> str:
+        return os.path.join(self._cache_directory, f"{hashlib.sha256(url.encode('utf-8')).hexdigest()}.json")
+
+    def _entries(self) -> list[os.DirEntry]:
+        try:
+            return [entry for entry in os.scandir(self._cache_directory) if entry.is_file() and entry.name.endswith(".json")]
+        except OSError:
+            return []
+
+    def _scan_size(self) -> int:
+        return sum(entry.stat().st_size for entry in self._entries())
+
+    def _evict(self) -> None:
+        # Drop the least recently used entries until the cache is back to 90% of its cap
+        entries = sorted(self._entries(), key=lambda entry: entry.stat().st_mtime)
+        target_size = self._max_size * 0.9
+        evicted = 0
+        for entry in entries:
+            if self._size <= target_size:
+                break
+            try:
+                entry_size = entry.stat().st_size
+                os.remove(entry.path)
+                self._size -= entry_size
+                evicted += 1
+            except OSError:
+                continue
+        logger.info(f"Evicted {evicted} scrape cache entries")
@@ -0,0 +1,159 @@
+"""This module contains the chunk planner used to pick chunk sizes and models"""
+
+from bisect import bisect_right
+from itertools import accumulate
+
+
+class ChunkPlanner:
+    """This class plans how the lines of a text are grouped into chunks.
+
+    The planner precomputes the prefix sums of the line token counts once, so
+    the chunks for any division size can be found with one binary search per
+    chunk instead of walking every line of the text.
+    """
+
+    def __init__(self, line_token_counts: list[int]) -> None:
+        """Initialize a ChunkPlanner object.
+
+        Parameters
+        ----------
+        line_token_counts : list[int]
+            The token count of each line of the text.
+        """
+
+        # Validate parameters
+        if not isinstance(line_token_counts, list):
+            raise TypeError("Line token counts must be a list")
+        if not all(isinstance(token_count, int) for token_count in line_token_counts):
+            raise TypeError("Line token counts must be a list of integers")
+        if not all(token_count >= 0 for token_count in line_token_counts):
+            raise ValueError("Line token counts must be a list of positive integers")
+
+        # Set attributes
+        self.line_token_counts = line_token_counts
+        self._prefix_sums = [0] + list(accumulate(line_token_counts))
+        self._boundaries = {}
+
+    def chunk_boundaries(self, division_size: int) -> list[tuple[int, int]]:
+        """Get the line boundaries of the chunks for a division size.
+
+        A chunk keeps adding lines while its token count stays within the
+        division size. A line that doesn't fit on its own gets a chunk for
+        itself.
+
+        Parameters
+        ----------
+        division_size : int
+            The maximum amount of tokens per chunk.
+
+        Returns
+        -------
+        list[tuple[int, int]]
+            The start (inclusive) and end (exclusive) line index of each chunk.
+        """
+
+        # Validate parameters
+        if not isinstance(division_size, int):
+            raise TypeError("Division size must be an integer")
+        if division_size <= 0:
+            raise ValueError("Division size must be greater than 0")
+
+        # Reuse the boundaries if they were already calculated
+        if division_size in self._boundaries:
+            return self._boundaries[division_size]
+
+        prefix_sums = self._prefix_sums
+        total_lines = len(self.line_token_counts)
+        boundaries = []
+        start = 0
+
+        while start < total_lines:
+            # Find the last line that keeps the chunk within the division size
+            end = bisect_right(prefix_sums, prefix_sums[start] + division_size, lo=start + 1) - 1
+            end = max(end, start + 1)
+            boundaries.append((start, end))
+            start = end
+
+        self._boundaries[division_size] = boundaries
+
+        return boundaries
+
+    def count_chunks(self, division_size: int) -> int:
+        """Get the amount of chunks for a division size.
+
+        Parameters
+        ----------
+        division_size : int
+            The maximum amount of tokens per chunk.
+
+        Returns
+        -------
+        int
+            The amount of chunks.
+        """
+
+        return len(self.chunk_boundaries(division_size))
+
+    def split_lines(self, lines: list[str], division_size: int) -> list[str]:
+        """Group the lines of the text into chunks.
+
+        Parameters
+        ----------
+        lines : list[str]
+            The lines of the text, matching the line token counts.
+        division_size : int
+            The maximum amount of tokens per chunk.
+
+        Returns
+        -------
+        list[str]
+            The chunks of text.
+        """
+
+        # Validate parameters
+        if not isinstance(lines, list):
+            raise TypeError("Lines must be a list")
+        if len(lines) != len(self.line_token_counts):
+            raise ValueError("Lines must have the same length as the line token counts")
+
+        return ['\n'.join(lines[start:end]) for start, end in self.chunk_boundaries(division_size)]
+
+    def find_optimal_stage_configuration(self, candidates: list[tuple[str, int, float]], wrapper_percentage: float, step: int=100) -> tuple[int, str]:
+        """Find the cheapest division size and model for a single stage.
+
+        The cost of a stage only depends on its own model and division size,
+        so every stage can be optimized on its own.
+
+        Parameters
+        ----------
+        candidates : list[tuple[str, int, float]]
+            The model name, token limit and cost per 1k tokens of each model available for the stage.
+        wrapper_percentage : float
+            The percentage of tokens added by the prompt around each chunk.
+        step : int, optional
+            The step between the division sizes to try, by default 100
+
+        Returns
+        -------
+        tuple[int, str]
+            The division size and the model name.
+        """
+
+        # Validate parameters
+        if not isinstance(candidates, list) or len(candidates) == 0:
+            raise ValueError("Candidates must be a non empty list")
+        if not isinstance(step, int) or step <= 0:
+            raise ValueError("Step must be a positive integer")
+
+        min_cost = float('inf')
+        best_configuration = None
+
+        for model_name, model_limit, cost_per_1k_tokens in candidates:
+            for division in range(model_limit // 2, model_limit + 1, step):
+                cost = self.count_chunks(division) * (division * (1 + wrapper_percentage)) * cost_per_1k_tokens
+
+                if cost < min_cost:
+                    min_cost = cost
+                    best_configuration = (division, model_name)
+
+        return best_configuration
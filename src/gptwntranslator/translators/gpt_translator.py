@@ -1,20 +1,30 @@
 """This module contains the Japanese to English translator functions"""
 
+import asyncio
+import hashlib
+import json
 import openai
 import html
+import threading
 from yattag import Doc
 import xml.etree.ElementTree as ET
 
-from gptwntranslator.api.openai_api import call_api, get_line_token_count, validate_model
+from gptwntranslator.api.openai_api import acall_api, call_api, count_tokens_many, get_retry_after, run_async, validate_model
+from gptwntranslator.helpers.circuit_breaker_helper import CircuitOpenException
 from gptwntranslator.helpers.config_helper import Config
 from gptwntranslator.helpers.data_helper import get_targeted_sub_chapters
 from gptwntranslator.helpers.design_patterns_helper import singleton
 from gptwntranslator.helpers.logger_helper import CustomLogger
-from gptwntranslator.helpers.task_helper import Task
+from gptwntranslator.helpers.task_helper import Scheduler, Task
 from gptwntranslator.models.novel import Novel
 from gptwntranslator.models.chunk import Chunk
 from gptwntranslator.models.sub_chapter import SubChapter
 from gptwntranslator.models.term_sheet import TermSheet
+from gptwntranslator.storage.chunk_checkpoint import ChunkCheckpoints
+from gptwntranslator.storage.json_storage import JsonStorage, JsonStorageException
+from gptwntranslator.storage.plan_cache import PlanCache
+from gptwntranslator.storage.response_cache import ResponseCache
+from gptwntranslator.translators.chunk_planner import ChunkPlanner
 
 
 logger = CustomLogger(__name__)
@@ -26,7 +36,9 @@ class GPTTranslatorAPIException(GPTTranslatorException):
     pass
 
 class GPTTranslatorAPIRetryableException(GPTTranslatorAPIException):
-    pass
+    def __init__(self, *args) -> None:
+        super().__init__(*args)
+        self.retry_after = get_retry_after(args[0]) if args else None
 
 class GPTTranslatorAPINoRetriesException(GPTTranslatorAPIException):
     pass
@@ -38,7 +50,7 @@ class GPTTranslator:
     def __init__(self) -> None:
         TypeError(f"'{self.__class__.__name__}' cannot be instantiated. Create a subclass instead.")
     
-    def _initialize(self, available_models: dict, terms_models: list[str], translation_models: list[str], summary_models: list[str], metadata_models: list[str], original_language: str="Japanese", target_language: str="English") -> None:
+    def _initialize(self, available_models: dict, terms_models: list[str], translation_models: list[str], summary_models: list[str], metadata_models: list[str], original_language: str="Japanese", target_language: str="English", async_enabled: bool=False, async_max_concurrency: int=32, retry_settings: dict=None, summary_mode: str="rolling", summary_merge_fan_in: int=4, max_workers: int=8) -> None:
         
         # Validate the parameters
         if not isinstance(available_models, dict):
@@ -73,6 +85,28 @@ class GPTTranslator:
             raise TypeError("Original language must be a string")
         if not isinstance(target_language, str):
             raise TypeError("Target language must be a string")
+        if not isinstance(async_enabled, bool):
+            raise TypeError("Async enabled must be a boolean")
+        if not isinstance(async_max_concurrency, int):
+            raise TypeError("Async max concurrency must be an integer")
+        if async_max_concurrency <= 0:
+            raise ValueError("Async max concurrency must be greater than 0")
+        if retry_settings is None:
+            retry_settings = {}
+        if not isinstance(retry_settings, dict):
+            raise TypeError("Retry settings must be a dictionary")
+        if not all(key in ("max_retries", "base_delay", "max_delay") for key in retry_settings):
+            raise ValueError("Retry settings can only contain max_retries, base_delay and max_delay")
+        if summary_mode not in ("rolling", "map_reduce"):
+            raise ValueError("Summary mode must be one of rolling or map_reduce")
+        if not isinstance(summary_merge_fan_in, int):
+            raise TypeError("Summary merge fan in must be an integer")
+        if summary_merge_fan_in < 2:
+            raise ValueError("Summary merge fan in must be at least 2")
+        if not isinstance(max_workers, int):
+            raise TypeError("Max workers must be an integer")
+        if max_workers <= 0:
+            raise ValueError("Max workers must be greater than 0")
         
         self._available_models = available_models
         self._terms_models = terms_models
@@ -81,11 +115,28 @@ class GPTTranslator:
         self._metadata_models = metadata_models
         self._original_language = original_language
         self._target_language = target_language
+        self._async_enabled = async_enabled
+        self._async_max_concurrency = async_max_concurrency
+        self._retry_settings = retry_settings
+        self._summary_mode = summary_mode
+        self._summary_merge_fan_in = summary_merge_fan_in
+        self._terms_sheet_lock = threading.Lock()
+        self._refresh_responses = False
+        # Every task of every stage shares a single scheduler, its workers or in async mode its request slots
+        self._scheduler = Scheduler(async_max_concurrency if async_enabled else max_workers)
         
         cf = Config()
         self._original_language_str = cf.get_language_name_for_code(original_language) if original_language in cf.get_languages() else ""
         self._target_language_str = cf.get_language_name_for_code(target_language) if target_language in cf.get_languages() else ""
 
+        # Cached plans are only valid for the model table they were made with
+        plan_fingerprint = json.dumps({
+            "available_models": available_models,
+            "terms_models": terms_models,
+            "translation_models": translation_models,
+            "summary_models": summary_models}, sort_keys=True)
+        PlanCache().set_fingerprint(hashlib.sha256(plan_fingerprint.encode("utf-8")).hexdigest())
+
     def set_original_language(self, original_language: str) -> None:
         logger.debug(f"Setting original language to '{original_language}'")
         # Validate the parameters
@@ -103,6 +154,16 @@ class GPTTranslator:
         self._original_language = original_language
         self._original_language_str = cf.get_language_name_for_code(original_language) if original_language in cf.get_languages() else ""
 
+    def set_refresh_responses(self, refresh_responses: bool) -> None:
+        logger.debug(f"Setting refresh responses to '{refresh_responses}'")
+        # Validate the parameters
+        if not isinstance(refresh_responses, bool):
+            logger.error(f"Refresh responses ({refresh_responses}) must be a boolean")
+            raise TypeError(f"Refresh responses ({refresh_responses}) must be a boolean")
+
+        # When set, every request skips the response cache and stores the new answer over the old one
+        self._refresh_responses = refresh_responses
+
     def _get_api_model(self, model: str) -> dict:
         # Validate the parameters
         if not isinstance(model, str):
@@ -136,24 +197,12 @@ class GPTTranslator:
             logger.error(f"Line token counts ({line_token_counts}) must be a list of positive integers")
             raise ValueError("Line token counts must be a list of positive integers")
         
-        # Initialize some variables
-        chunks = []
-        current_chunk = []
-        current_tokens = 0
-
         # Split the text into chunks
-        for line, token_count in zip(text.splitlines(), line_token_counts):
-            if current_tokens + token_count <= division_size:
-                current_chunk.append(line)
-                current_tokens += token_count
-            else:
-                chunks.append('\n'.join(current_chunk))
-                current_chunk = [line]
-                current_tokens = token_count
-
-        # Add the last chunk
-        if current_chunk:
-            chunks.append('\n'.join(current_chunk))
+        lines = text.splitlines()
+        if len(lines) != len(line_token_counts):
+            logger.error(f"Line token counts ({line_token_counts}) must have the same length as the text lines ({len(lines)})")
+            raise ValueError("Line token counts must have the same length as the text lines")
+        chunks = ChunkPlanner(line_token_counts).split_lines(lines, division_size)
 
         return chunks
     
@@ -185,9 +234,7 @@ class GPTTranslator:
             raise ValueError("line_token_counts must have the same length as total_lines.")
         
         # Estimate the number of chunks
-        chunks = self._split_text_into_chunks('\n'.join([''] * total_lines), division_size, line_token_counts)
-
-        return len(chunks)
+        return ChunkPlanner(line_token_counts).count_chunks(division_size)
     
     def _original_language_token_limit_worst_case(self, N: int, worst_case_ratio: float|int=1.125, safety_factor: float|int=0.8) -> int:
         # Validate the input
@@ -230,52 +277,27 @@ class GPTTranslator:
             logger.error(f"Line token counts ({line_token_counts}) must be a list of positive integers")
             raise ValueError("line_token_counts must be a list of positive integers.")
 
+        if len(line_token_counts) == 0:
+            logger.error(f"Line token counts ({line_token_counts}) must not be empty")
+            raise ValueError("line_token_counts must not be empty.")
+
         # Initialize some values
-        total_lines = len(line_token_counts)
-        min_cost = float('inf')
-        best_combination = None
+        planner = ChunkPlanner(line_token_counts)
         wrapper_percentage = 0.3
 
-        # Get the models to use
-        terms_models = [self._get_api_model(model) for model in self._terms_models]
-        translation_models = [self._get_api_model(model) for model in self._translation_models]
-        summary_models = [self._get_api_model(model) for model in self._summary_models]
+        # The cost of each stage only depends on its own model and division, so each stage is optimized on its own
+        stage_configurations = []
+        for stage_models in [self._terms_models, self._translation_models, self._summary_models]:
+            candidates = []
+            for model in stage_models:
+                api_model = self._get_api_model(model)
+                model_limit = self._original_language_token_limit_worst_case(api_model["max_tokens"])
+                model_limit = model_limit - (model_limit % 4)
+                candidates.append((api_model["name"], model_limit, api_model["cost_per_1k_tokens"]))
+            stage_configurations.append(planner.find_optimal_stage_configuration(candidates, wrapper_percentage))
 
-        # Iterate through all possible combinations of models and token limits
-        for term_model in terms_models:
-            term_model_limit = self._original_language_token_limit_worst_case(term_model["max_tokens"])
-            term_model_limit = term_model_limit - (term_model_limit % 4)
-
-            for translation_model in translation_models:
-                translation_model_limit = self._original_language_token_limit_worst_case(translation_model["max_tokens"])
-                translation_model_limit = translation_model_limit - (translation_model_limit % 4)
-
-                for summary_model in summary_models:
-                    summary_model_limit = self._original_language_token_limit_worst_case(summary_model["max_tokens"])
-                    summary_model_limit = summary_model_limit - (summary_model_limit % 4)
-
-                    for term_division in range(term_model_limit // 2, term_model_limit + 1, 100):
-                        for translation_division in range(translation_model_limit // 2, translation_model_limit + 1, 100):
-                            for summary_division in range(summary_model_limit // 2, summary_model_limit + 1, 100):
-                                # Calculate the cost of the current configuration
-                                term_chunks = self._estimate_chunks(total_lines, term_division, line_token_counts)
-                                translation_chunks = self._estimate_chunks(total_lines, translation_division, line_token_counts)
-                                summary_chunks = self._estimate_chunks(total_lines, summary_division, line_token_counts)
-
-                                # term_cost = term_chunks * term_division * term_model["cost_per_1k_tokens"]
-                                # translation_cost = translation_chunks * translation_division * translation_model["cost_per_1k_tokens"]
-                                # summary_cost = summary_chunks * summary_division * summary_model["cost_per_1k_tokens"]
-
-                                term_cost = term_chunks * (term_division * (1 + wrapper_percentage)) * term_model["cost_per_1k_tokens"]
-                                translation_cost = translation_chunks * (translation_division * (1 + wrapper_percentage)) * translation_model["cost_per_1k_tokens"]
-                                summary_cost = summary_chunks * (summary_division * (1 + wrapper_percentage)) * summary_model["cost_per_1k_tokens"]
-
-                                total_cost = term_cost + translation_cost + summary_cost
-
-                                # Check if the current configuration is better than the best configuration so far, and update the best configuration if it is
-                                if total_cost < min_cost:
-                                    min_cost = total_cost
-                                    best_combination = (term_division, translation_division, summary_division, term_model['name'], translation_model['name'], summary_model['name'])
+        (term_division, term_model), (translation_division, translation_model), (summary_division, summary_model) = stage_configurations
+        best_combination = (term_division, translation_division, summary_division, term_model, translation_model, summary_model)
 
         logger.info(f"Found max optimal configuration: {best_combination}")
         return best_combination
@@ -288,12 +310,113 @@ class GPTTranslator:
         
         # Split the text into lines and calculate the token count for each line
         lines = text.splitlines()
-        line_token_counts = [get_line_token_count(line) for line in lines]
+        line_token_counts = count_tokens_many(lines)
 
         return line_token_counts
     
+    def _get_sub_chapter_plan(self, sub_chapter: SubChapter) -> dict:
+        # Validate input
+        if not isinstance(sub_chapter, SubChapter):
+            logger.error(f"Sub chapter must be a SubChapter object")
+            raise TypeError("Sub chapter must be a SubChapter object")
+        
+        # Plans only depend on the contents, so unchanged sub chapters are planned once across stages and runs
+        plan_cache = PlanCache()
+        plan_key = hashlib.sha256(sub_chapter.contents.encode("utf-8")).hexdigest()
+        plan = plan_cache.get(plan_key)
+        if plan is not None:
+            logger.debug(f"Using cached plan for chapter {sub_chapter.chapter_index} sub chapter {sub_chapter.sub_chapter_index}")
+            return plan
+
+        # Calculate the optimal configuration for the sub chapter
+        line_token_counts = self._calculate_line_token_counts(sub_chapter.contents)
+        configuration = self._greedy_find_max_optimal_configuration(line_token_counts)
+        terms_division, translation_division, summary_division, terms_model, translation_model, summary_model = configuration
+        planner = ChunkPlanner(line_token_counts)
+
+        plan = {
+            "line_token_counts": line_token_counts,
+            "configuration": list(configuration),
+            "terms": {"model": terms_model, "division": terms_division, "boundaries": planner.chunk_boundaries(terms_division)},
+            "translation": {"model": translation_model, "division": translation_division, "boundaries": planner.chunk_boundaries(translation_division)},
+            "summary": {"model": summary_model, "division": summary_division, "boundaries": planner.chunk_boundaries(summary_division)},
+        }
+        plan_cache.set(plan_key, plan)
+
+        return plan
+    
+    def _get_sub_chapter_chunks(self, novel: Novel, sub_chapter: SubChapter, stage: str) -> tuple[list[Chunk], str]:
+        # Validate input
+        if not isinstance(novel, Novel):
+            logger.error(f"Novel must be a Novel object")
+            raise TypeError("Novel must be a Novel object")
+        if not isinstance(sub_chapter, SubChapter):
+            logger.error(f"Sub chapter must be a SubChapter object")
+            raise TypeError("Sub chapter must be a SubChapter object")
+        if stage not in ["terms", "translation", "summary"]:
+            logger.error(f"Stage ({stage}) must be one of terms, translation or summary")
+            raise ValueError("Stage must be one of terms, translation or summary")
+        
+        prev_sub_chapter, next_sub_chapter = self._get_sub_chapter_context(novel, sub_chapter)
+
+        # Get the previous and next lines
+        prev_line = prev_sub_chapter.contents.splitlines()[-1] if prev_sub_chapter and prev_sub_chapter.contents else ""
+        next_line = next_sub_chapter.contents.splitlines()[0] if next_sub_chapter and next_sub_chapter.contents else ""
+
+        # Split the text into chunks following the plan of the stage
+        stage_plan = self._get_sub_chapter_plan(sub_chapter)[stage]
+        lines = sub_chapter.contents.splitlines()
+        chunks = ['\n'.join(lines[start:end]) for start, end in stage_plan["boundaries"]]
+        chunks_objects = list()
+        for i, chunk in enumerate(chunks):
+            chunk_prev_line = prev_line if i == 0 else chunks[i - 1].splitlines()[-1]
+            chunk_next_line = next_line if i == len(chunks) - 1 else chunks[i + 1].splitlines()[0]
+
+            chunks_objects.append(Chunk(
+                novel.novel_code,
+                sub_chapter.chapter_index,
+                sub_chapter.sub_chapter_index,
+                i,
+                chunk,
+                chunk_prev_line,
+                chunk_next_line,
+                novel_origin=novel.novel_origin))
+
+        return chunks_objects, stage_plan["model"]
+    
+    def _create_task(self, max_workers: int, priority: tuple=()) -> Task:
+        return Task(max_workers=max_workers, retry_on_exceptions=(GPTTranslatorAPIRetryableException), scheduler=self._scheduler, priority=priority, **self._retry_settings)
+
+    def _create_stage_task(self) -> Task:
+        return self._create_task(self._scheduler.max_workers)
+
+    def _sub_chapter_priority(self, sub_chapter: SubChapter) -> tuple[int, int, int]:
+        # Stage and chunk work share one queue ordered by (chapter, sub chapter, chunk), a sub chapter goes before its own chunks
+        return (sub_chapter.chapter_index, sub_chapter.sub_chapter_index, -1)
+
+    def _chunk_priority(self, chunk: Chunk) -> tuple[int, int, int]:
+        return (chunk.chapter_index, chunk.sub_chapter_index, chunk.chunk_index)
+
+    def _run_stage_task(self, task: Task) -> tuple[dict, dict]:
+        if self._async_enabled:
+            results = run_async(task.arun_subtasks(), self._async_max_concurrency)
+        else:
+            results = task.run_subtasks()
+
+        logger.info(f"Response cache: {ResponseCache().get_stats()}")
+
+        retry_counts = task.get_retry_counts()
+        logger.debug(f"Retry counts: {retry_counts}")
+
+        return results, retry_counts
+
+    def _sub_chapter_retry_counts(self, tasks: dict, retry_counts: dict) -> dict[tuple[int, int], int]:
+        return {key: retry_counts.get(sub_task, 0) for key, sub_task in tasks.items()}
+
     def _handle_api_exceptions(self, e: Exception) -> None:
-        if isinstance(e, openai.error.APIError):
+        if isinstance(e, CircuitOpenException):
+            raise GPTTranslatorAPINoRetriesException(e)
+        elif isinstance(e, openai.error.APIError):
             raise GPTTranslatorAPIRetryableException(e)
         elif isinstance(e, openai.error.Timeout):
             raise GPTTranslatorAPIRetryableException(e)
@@ -310,8 +433,37 @@ class GPTTranslator:
         else:
             raise e
     
-    def _perform_relevant_terms_action(self, **kwargs) -> str:
-        logger.debug(f"Performing relevant terms action.")
+    def _request_completion(self, messages: list[dict], model: str, action: str) -> str:
+        # Call the API
+        try:
+            logger.debug(f"Calling API.")
+            response = call_api(messages, model=model, refresh=self._refresh_responses)
+            response = response['choices'][0]['message']['content']
+        except Exception as e:
+            logger.error(f"Error performing {action} action: {e}")
+            self._handle_api_exceptions(e)
+
+        logger.debug(f"Response: {response}")
+
+        return response
+
+    async def _arequest_completion(self, messages: list[dict], model: str, action: str) -> str:
+        # Call the API
+        try:
+            logger.debug(f"Calling API asynchronously.")
+            # The request waits for a slot of the scheduler, in the order of the subtask it's made for
+            async with self._scheduler.aslot():
+                response = await acall_api(messages, model=model, refresh=self._refresh_responses)
+            response = response['choices'][0]['message']['content']
+        except Exception as e:
+            logger.error(f"Error performing {action} action: {e}")
+            self._handle_api_exceptions(e)
+
+        logger.debug(f"Response: {response}")
+
+        return response
+    
+    def _build_relevant_terms_messages(self, **kwargs) -> tuple[list[dict], str]:
 
         available_models = [self._get_api_model(model)['name'] for model in self._terms_models]
 
@@ -379,21 +531,23 @@ class GPTTranslator:
             {"role": "user", "content": user_content}
         ]
 
-        # Call the API
-        try:
-            logger.debug(f"Calling API.")
-            response = call_api(messages, model)
-            response = response['choices'][0]['message']['content']
-        except Exception as e:
-            logger.error(f"Error performing relevant terms action: {e}")
-            self._handle_api_exceptions(e)
-        
-        logger.debug(f"Response: {response}")
+        return messages, model
 
-        return response
+    def _perform_relevant_terms_action(self, **kwargs) -> str:
+        logger.debug(f"Performing relevant terms action.")
+
+        messages, model = self._build_relevant_terms_messages(**kwargs)
+
+        return self._request_completion(messages, model, "relevant terms")
+
+    async def _aperform_relevant_terms_action(self, **kwargs) -> str:
+        logger.debug(f"Performing relevant terms action asynchronously.")
+
+        messages, model = self._build_relevant_terms_messages(**kwargs)
+
+        return await self._arequest_completion(messages, model, "relevant terms")
     
-    def _perform_translation_action(self, **kwargs) -> str:
-        logger.debug(f"Performing translation action.")
+    def _build_translation_messages(self, **kwargs) -> tuple[list[dict], str]:
 
         available_models = [self._get_api_model(model)['name'] for model in self._translation_models]
 
@@ -471,7 +625,7 @@ class GPTTranslator:
         [Following line]
         {chunk.next_line}
         [Relevant terms]
-        {term_lists.for_api(chunk.contents, self._original_language)}
+        {term_lists.for_api(chunk.contents, self._target_language)}
         [Summary]
         {summary}
         [Text]
@@ -515,21 +669,23 @@ class GPTTranslator:
         # messages.append({"role": "assistant", "content": f"Understood. Please provide the text. I'll translate it to {self._target_language_str}."})
         # messages.append({"role": "user", "content": chunk.contents})
 
-        # Call the API
-        try:
-            logger.debug(f"Calling API.")
-            response = call_api(messages, model=translation_model)
-            response = response['choices'][0]['message']['content']
-        except Exception as e:
-            logger.error(f"Error performing translation action: {e}")
-            self._handle_api_exceptions(e)
+        return messages, translation_model
 
-        logger.debug(f"Response: {response}")
-            
-        return response
+    def _perform_translation_action(self, **kwargs) -> str:
+        logger.debug(f"Performing translation action.")
+
+        messages, model = self._build_translation_messages(**kwargs)
+
+        return self._request_completion(messages, model, "translation")
+
+    async def _aperform_translation_action(self, **kwargs) -> str:
+        logger.debug(f"Performing translation action asynchronously.")
+
+        messages, model = self._build_translation_messages(**kwargs)
+
+        return await self._arequest_completion(messages, model, "translation")
     
-    def _perform_summary_action(self, **kwargs) -> str:
-        logger.debug(f"Performing summary action.")
+    def _build_summary_messages(self, **kwargs) -> tuple[list[dict], str]:
 
         available_models = [self._get_api_model(model)['name'] for model in self._summary_models]
 
@@ -602,18 +758,89 @@ class GPTTranslator:
         #     messages.append({"role": "assistant", "content": f"No summary provided. The text is the first line of the text. Please provide the text. I'll summarize it in {self._target_language_str}."})
         # messages.append({"role": "user", "content": chunk})
 
-        # Call the API
-        try:
-            logger.debug(f"Calling API.")
-            response = call_api(messages, model=summarization_model)
-            response = response['choices'][0]['message']['content']
-        except Exception as e:
-            logger.error(f"Error performing summary action: {e}")
-            self._handle_api_exceptions(e)
+        return messages, summarization_model
 
-        logger.debug(f"Summary action response: {response}")
-        
-        return response
+    def _perform_summary_action(self, **kwargs) -> str:
+        logger.debug(f"Performing summary action.")
+
+        messages, model = self._build_summary_messages(**kwargs)
+
+        return self._request_completion(messages, model, "summary")
+
+    async def _aperform_summary_action(self, **kwargs) -> str:
+        logger.debug(f"Performing summary action asynchronously.")
+
+        messages, model = self._build_summary_messages(**kwargs)
+
+        return await self._arequest_completion(messages, model, "summary")
+    
+    def _build_summary_merge_messages(self, **kwargs) -> tuple[list[dict], str]:
+
+        available_models = [self._get_api_model(model)['name'] for model in self._summary_models]
+
+        summaries = kwargs['summaries']
+        summarization_model = kwargs['summarization_model']
+
+        # Validate parameters
+        if not isinstance(summaries, list):
+            logger.error(f"Summaries must be a list")
+            raise TypeError("Summaries must be a list")
+        if not all(isinstance(summary, str) for summary in summaries):
+            logger.error(f"Summaries must be a list of strings")
+            raise TypeError("Summaries must be a list of strings")
+        if not isinstance(summarization_model, str):
+            logger.error(f"Summarization model must be a string")
+            raise TypeError("Summarization model must be a string")
+        if summarization_model not in available_models:
+            logger.error(f"Summarization model ({summarization_model}) must be a valid model. Available models: {', '.join(available_models)}")
+            raise ValueError(f"Summarization model must be a valid model. Available models: {', '.join(available_models)}")
+
+        system_message = f'''
+        You are an assistant that merges the summaries of consecutive sections of a text.
+
+        You will be provided with:
+        1) The summaries of consecutive sections of the text, in order.
+
+        You will be asked to:
+        1) Provide a single summary of all the sections.
+        2) Keep the order of the events.
+        3) Stay within a few lines of text.
+        4) Keep the summary concise.
+
+        Example:
+        [Section summary]
+        A Description of Darth Vader's appearance.
+        [Section summary]
+        The rebels back away from Darth Vader.
+        [End]
+
+        Expected output:
+        Darth Vader is introduced and the rebels are scared of him.
+        '''
+
+        user_message = "\n".join(f"[Section summary]\n{summary}" for summary in summaries) + "\n[End]"
+
+        # Build the messages to send to the API
+        messages = [
+            {"role": "system", "content": system_message},
+            {"role": "user", "content": user_message}
+        ]
+
+        return messages, summarization_model
+
+    def _perform_summary_merge_action(self, **kwargs) -> str:
+        logger.debug(f"Performing summary merge action.")
+
+        messages, model = self._build_summary_merge_messages(**kwargs)
+
+        return self._request_completion(messages, model, "summary merge")
+
+    async def _aperform_summary_merge_action(self, **kwargs) -> str:
+        logger.debug(f"Performing summary merge action asynchronously.")
+
+        messages, model = self._build_summary_merge_messages(**kwargs)
+
+        return await self._arequest_completion(messages, model, "summary merge")
     
     def _perform_novel_metadata_action(self, **kwargs) -> None:
         logger.debug(f"Performing novel metadata action.")
@@ -708,7 +935,7 @@ class GPTTranslator:
         # Call the API
         try:
             logger.debug(f"Calling API.")
-            response = call_api(messages, model=metadata_model)
+            response = call_api(messages, model=metadata_model, refresh=self._refresh_responses)
             response = response['choices'][0]['message']['content']
         except Exception as e:
             logger.error(f"Error performing novel metadata action: {e}")
@@ -734,6 +961,8 @@ class GPTTranslator:
             logger.debug(f"New description: {novel.description_translation[self._target_language]}")
         except Exception as e:
             logger.error(f"Error parsing response: {e}")
+            # Don't let the malformed response be served again from the cache
+            ResponseCache().invalidate(metadata_model, messages)
             raise GPTTranslatorGPTFormatException("Invalid metadata format {}".format(e))
     
     def _perform_chapters_metadata_action(self, **kwargs) -> str:
@@ -877,7 +1106,7 @@ class GPTTranslator:
         # Call the API
         try:
             logger.debug(f"Calling API.")
-            response = call_api(messages, model=metadata_model)
+            response = call_api(messages, model=metadata_model, refresh=self._refresh_responses)
             response = html.unescape(response['choices'][0]['message']['content'])
         except Exception as e:
             logger.error(f"Error performing novel metadata action: {e}")
@@ -906,17 +1135,14 @@ class GPTTranslator:
                 logger.debug(f"New translated name: {chapter.translated_name[self._target_language]}")
         except Exception as e:
             logger.error(f"Error parsing response: {e}")
+            # Don't let the malformed response be served again from the cache
+            ResponseCache().invalidate(metadata_model, messages)
             raise GPTTranslatorGPTFormatException("Invalid metadata format")
         
         return None
 
-    def _summarize_sub_chapter(self,  **kwargs) -> str:
-        logger.debug(f"Summarizing sub chapter.")
-
-        available_models = [self._get_api_model(model)['name'] for model in self._summary_models]
-
-        chunks = kwargs['chunks']
-        model = kwargs['model']
+    def _validate_sub_chapter_arguments(self, chunks: list[Chunk], model: str, stage_models: list[str]) -> None:
+        available_models = [self._get_api_model(model)['name'] for model in stage_models]
 
         # Validate the provided arguments
         if not isinstance(chunks, list):
@@ -932,46 +1158,114 @@ class GPTTranslator:
             logger.error(f"Metadata model ({model}) must be a valid model. Available models: {', '.join(available_models)}")
             raise ValueError(f"Metadata model must be a valid model. Available models: {', '.join(available_models)}")
 
-        task = Task(max_workers=4, retry_on_exceptions=(GPTTranslatorAPIRetryableException))
+    def _summarize_sub_chapter(self,  **kwargs) -> str:
+        logger.debug(f"Summarizing sub chapter.")
+
+        chunks = kwargs['chunks']
+        model = kwargs['model']
+
+        self._validate_sub_chapter_arguments(chunks, model, self._summary_models)
+
+        if self._summary_mode == "map_reduce":
+            summary = self._map_reduce_summary(chunks, model)
+        else:
+            summary = self._rolling_summary(chunks, model)
+        
+        logger.debug(f"Summary: {summary}")
+
+        return chunks[0].chapter_index, chunks[0].sub_chapter_index, summary
 
+    def _rolling_summary(self, chunks: list[Chunk], model: str) -> str:
         previous_summary = ""
         for chunk in chunks:
             result = self._perform_summary_action(chunk=chunk.contents, summarization_model=model, previous_summary=previous_summary)
             if isinstance(result, Exception):
                 raise result
             previous_summary = result
+
+        return previous_summary
+
+    def _group_summaries(self, summaries: list[str]) -> list[list[str]]:
+        fan_in = self._summary_merge_fan_in
+        return [summaries[i:i + fan_in] for i in range(0, len(summaries), fan_in)]
+
+    def _collect_ordered_results(self, results: dict, sub_tasks: list) -> list[str]:
+        for sub_task in sub_tasks:
+            if isinstance(results[sub_task], Exception):
+                raise results[sub_task]
+
+        return [results[sub_task] for sub_task in sub_tasks]
+
+    def _map_reduce_summary(self, chunks: list[Chunk], model: str) -> str:
+        # Map: every chunk is summarized on its own, in parallel
+        task = self._create_task(4, priority=(chunks[0].chapter_index, chunks[0].sub_chapter_index))
+        sub_tasks = [task.add_subtask(self._perform_summary_action, chunk=chunk.contents, summarization_model=model, previous_summary="") for chunk in chunks]
+        summaries = self._collect_ordered_results(task.run_subtasks(), sub_tasks)
+
+        # Reduce: neighbouring summaries are merged level by level until one is left
+        while len(summaries) > 1:
+            groups = self._group_summaries(summaries)
+            task = self._create_task(4, priority=(chunks[0].chapter_index, chunks[0].sub_chapter_index))
+            sub_tasks = [task.add_subtask(self._perform_summary_merge_action, summaries=group, summarization_model=model) if len(group) > 1 else None for group in groups]
+            results = task.run_subtasks()
+            summaries = [group[0] if sub_task is None else self._collect_ordered_results(results, [sub_task])[0] for group, sub_task in zip(groups, sub_tasks)]
+
+        return summaries[0]
+
+    async def _asummarize_sub_chapter(self,  **kwargs) -> str:
+        logger.debug(f"Summarizing sub chapter asynchronously.")
+
+        chunks = kwargs['chunks']
+        model = kwargs['model']
+
+        self._validate_sub_chapter_arguments(chunks, model, self._summary_models)
+
+        if self._summary_mode == "map_reduce":
+            summary = await self._amap_reduce_summary(chunks, model)
+        else:
+            summary = await self._arolling_summary(chunks, model)
         
-        logger.debug(f"Summary: {previous_summary}")
+        logger.debug(f"Summary: {summary}")
+
+        return chunks[0].chapter_index, chunks[0].sub_chapter_index, summary
 
-        return chunks[0].chapter_index, chunks[0].sub_chapter_index, previous_summary
+    async def _arolling_summary(self, chunks: list[Chunk], model: str) -> str:
+        # Each chunk is summarized on top of the previous summary, so the chunks stay sequential
+        previous_summary = ""
+        for chunk in chunks:
+            previous_summary = await self._aperform_summary_action(chunk=chunk.contents, summarization_model=model, previous_summary=previous_summary)
+
+        return previous_summary
+
+    async def _amap_reduce_summary(self, chunks: list[Chunk], model: str) -> str:
+        # Map: every chunk is summarized on its own, concurrently
+        task = self._create_task(self._async_max_concurrency, priority=(chunks[0].chapter_index, chunks[0].sub_chapter_index))
+        sub_tasks = [task.add_subtask(self._aperform_summary_action, chunk=chunk.contents, summarization_model=model, previous_summary="") for chunk in chunks]
+        summaries = self._collect_ordered_results(await task.arun_subtasks(), sub_tasks)
+
+        # Reduce: neighbouring summaries are merged level by level until one is left
+        while len(summaries) > 1:
+            groups = self._group_summaries(summaries)
+            task = self._create_task(self._async_max_concurrency, priority=(chunks[0].chapter_index, chunks[0].sub_chapter_index))
+            sub_tasks = [task.add_subtask(self._aperform_summary_merge_action, summaries=group, summarization_model=model) if len(group) > 1 else None for group in groups]
+            results = await task.arun_subtasks()
+            summaries = [group[0] if sub_task is None else self._collect_ordered_results(results, [sub_task])[0] for group, sub_task in zip(groups, sub_tasks)]
+
+        return summaries[0]
     
     def _gather_terms_for_sub_chapter(self,  **kwargs) -> str:
         logger.debug(f"Gathering terms for sub chapter.")
 
-        available_models = [self._get_api_model(model)['name'] for model in self._terms_models]
-
         chunks = kwargs['chunks']
         model = kwargs['model']
 
-        # Validate the provided arguments
-        if not isinstance(chunks, list):
-            logger.error(f"Chunks must be a list")
-            raise TypeError("Chunks must be a list")
-        if not all(isinstance(chunk, Chunk) for chunk in chunks):
-            logger.error(f"Chunks must be a list of Chunk objects")
-            raise TypeError("Chunks must be a list of Chunk objects")
-        if not isinstance(model, str):
-            logger.error(f"Metadata model must be a string")
-            raise TypeError("Metadata model must be a string")
-        if model not in available_models:
-            logger.error(f"Metadata model ({model}) must be a valid model. Available models: {', '.join(available_models)}")
-            raise ValueError(f"Metadata model must be a valid model. Available models: {', '.join(available_models)}")
+        self._validate_sub_chapter_arguments(chunks, model, self._terms_models)
 
-        task = Task(max_workers=4, retry_on_exceptions=(GPTTranslatorAPIRetryableException))
+        task = self._create_task(4)
 
         previous_terms = {}
         for chunk in chunks:
-            sub_task = task.add_subtask(self._perform_relevant_terms_action, chunk=chunk, model=model)
+            sub_task = task.add_prioritized_subtask(self._chunk_priority(chunk), self._perform_relevant_terms_action, chunk=chunk, model=model)
             previous_terms[(sub_task, chunk.chunk_index)] = ""
 
         sorted_keys = sorted(previous_terms.keys(), key=lambda x: x[1])
@@ -989,56 +1283,112 @@ class GPTTranslator:
             previous_terms[task_id] = result
             
         return "\n\n".join(previous_terms.values())
+
+    async def _agather_terms_for_sub_chapter(self,  **kwargs) -> str:
+        logger.debug(f"Gathering terms for sub chapter asynchronously.")
+
+        chunks = kwargs['chunks']
+        model = kwargs['model']
+
+        self._validate_sub_chapter_arguments(chunks, model, self._terms_models)
+
+        task = self._create_task(self._async_max_concurrency)
+
+        sorted_chunks = sorted(chunks, key=lambda chunk: chunk.chunk_index)
+        sub_tasks = [task.add_prioritized_subtask(self._chunk_priority(chunk), self._aperform_relevant_terms_action, chunk=chunk, model=model) for chunk in sorted_chunks]
+
+        results = await task.arun_subtasks()
+
+        logger.debug("Getting terms for sub chapter complete.")
+        logger.debug(f"Results: {results}")
+
+        for sub_task in sub_tasks:
+            if isinstance(results[sub_task], Exception):
+                raise results[sub_task]
+
+        return "\n\n".join(results[sub_task] for sub_task in sub_tasks)
     
     def _translate_sub_chapter(self,  **kwargs) -> str:
         logger.debug(f"Translating sub chapter.")
 
-        available_models = [self._get_api_model(model)['name'] for model in self._translation_models]
-
         chunks = kwargs['chunks']
         model = kwargs['model']
         summary = kwargs['summary']
         term_lists = kwargs['term_lists']
 
         # Validate the provided arguments
-        if not isinstance(chunks, list):
-            logger.error(f"Chunks must be a list")
-            raise TypeError("Chunks must be a list")
-        if not all(isinstance(chunk, Chunk) for chunk in chunks):
-            logger.error(f"Chunks must be a list of Chunk objects")
-            raise TypeError("Chunks must be a list of Chunk objects")
-        if not isinstance(model, str):
-            logger.error(f"Metadata model must be a string")
-            raise TypeError("Metadata model must be a string")
-        if model not in available_models:
-            logger.error(f"Metadata model ({model}) must be a valid model. Available models: {', '.join(available_models)}")
-            raise ValueError(f"Metadata model must be a valid model. Available models: {', '.join(available_models)}")
+        self._validate_sub_chapter_arguments(chunks, model, self._translation_models)
         if not isinstance(summary, str):
             logger.error(f"Summary must be a string")
             raise TypeError("Summary must be a string")
 
-        task = Task(max_workers=4, retry_on_exceptions=(GPTTranslatorAPIRetryableException))
+        # Only the chunks missing from the checkpoint are requested
+        missing_chunks = ChunkCheckpoints().load(chunks, self._target_language)
 
-        translation = {}
-        for chunk in chunks:
-            sub_task = task.add_subtask(self._perform_translation_action, chunk=chunk, translation_model=model, summary=summary, term_lists=term_lists)
-            translation[(sub_task, chunk.chunk_index)] = ""
+        task = self._create_task(4)
 
-        sorted_keys = sorted(translation.keys(), key=lambda x: x[1])
-        translation = {key[0]: translation[key] for key in sorted_keys}
+        for chunk in missing_chunks:
+            task.add_prioritized_subtask(self._chunk_priority(chunk), self._translate_chunk, chunk=chunk, translation_model=model, summary=summary, term_lists=term_lists)
 
         results = task.run_subtasks()
 
         logger.info("Translating sub chapter complete.") 
         logger.info(f"Results: {results}")
 
-        for task_id in translation:
-            result = results[task_id]
+        return self._join_chunk_translations(chunks, results)
+
+    def _translate_chunk(self, **kwargs) -> str:
+        chunk = kwargs['chunk']
+        chunk.translation = self._perform_translation_action(**kwargs)
+        ChunkCheckpoints().save_chunk(chunk, self._target_language)
+        return chunk.translation
+
+    async def _atranslate_chunk(self, **kwargs) -> str:
+        chunk = kwargs['chunk']
+        chunk.translation = await self._aperform_translation_action(**kwargs)
+        ChunkCheckpoints().save_chunk(chunk, self._target_language)
+        return chunk.translation
+
+    def _join_chunk_translations(self, chunks: list[Chunk], results: dict) -> str:
+        # The translated chunks stay checkpointed when a sibling fails
+        for result in results.values():
             if isinstance(result, Exception):
                 raise result
-            translation[task_id] = result
 
-        return "\n\n".join(translation.values())
+        sorted_chunks = sorted(chunks, key=lambda chunk: chunk.chunk_index)
+        translation = "\n\n".join(chunk.translation for chunk in sorted_chunks)
+        ChunkCheckpoints().clear(sorted_chunks[0], self._target_language)
+
+        return translation
+
+    async def _atranslate_sub_chapter(self,  **kwargs) -> str:
+        logger.debug(f"Translating sub chapter asynchronously.")
+
+        chunks = kwargs['chunks']
+        model = kwargs['model']
+        summary = kwargs['summary']
+        term_lists = kwargs['term_lists']
+
+        # Validate the provided arguments
+        self._validate_sub_chapter_arguments(chunks, model, self._translation_models)
+        if not isinstance(summary, str):
+            logger.error(f"Summary must be a string")
+            raise TypeError("Summary must be a string")
+
+        # Only the chunks missing from the checkpoint are requested
+        missing_chunks = ChunkCheckpoints().load(chunks, self._target_language)
+
+        task = self._create_task(self._async_max_concurrency)
+
+        for chunk in missing_chunks:
+            task.add_prioritized_subtask(self._chunk_priority(chunk), self._atranslate_chunk, chunk=chunk, translation_model=model, summary=summary, term_lists=term_lists)
+
+        results = await task.arun_subtasks()
+
+        logger.info("Translating sub chapter complete.") 
+        logger.info(f"Results: {results}")
+
+        return self._join_chunk_translations(chunks, results)
     
     def _get_sub_chapter_context(self, novel: Novel, sub_chapter: SubChapter) -> tuple[SubChapter, SubChapter]:
         logger.debug(f"Getting sub chapter context.")
@@ -1104,6 +1454,102 @@ class GPTTranslator:
         logger.debug(f"Previous sub chapter: {prev_sub_chapter}, Next sub chapter: {next_sub_chapter}")
         return prev_sub_chapter, next_sub_chapter
     
+    def _merge_new_terms(self, novel: Novel, terms: str) -> list[str]:
+        with self._terms_sheet_lock:
+            return novel.terms_sheet.process_new_terms(terms)
+
+    def _update_terms_dimensions(self, novel: Novel) -> None:
+        # Gathering the segments loads the bodies, so it's done before taking the lock
+        segments = novel.original_segments()
+        with self._terms_sheet_lock:
+            novel.terms_sheet.update_dimensions(segments, novel.original_language)
+
+    def _weigh_new_terms(self, novel: Novel, sub_chapter: SubChapter, new_terms: list[str]) -> None:
+        # The weights rank the glossary of each chunk, so the terms merged by the sub chapter are weighed on its text before translating
+        if not new_terms:
+            return
+        segments = {f"{sub_chapter.chapter_index}.{sub_chapter.sub_chapter_index}": sub_chapter.contents}
+        with self._terms_sheet_lock:
+            novel.terms_sheet.weigh_terms(new_terms, segments, novel.original_language)
+
+    def _snapshot_terms_sheet(self, novel: Novel) -> TermSheet:
+        with self._terms_sheet_lock:
+            return novel.terms_sheet.snapshot()
+
+    def _assign_summary(self, novel: Novel, sub_chapter: SubChapter, summary: str) -> None:
+        new_summary = sub_chapter.summary.copy()
+        new_summary[self._target_language] = summary
+        sub_chapter.summary = new_summary
+        logger.debug(f"Assigned summary to chapter {sub_chapter.chapter_index} sub chapter {sub_chapter.sub_chapter_index}")
+        self._save_sub_chapter(novel, sub_chapter)
+
+    def _assign_translation(self, novel: Novel, sub_chapter: SubChapter, translation: str) -> None:
+        new_translation = sub_chapter.translation.copy()
+        new_translation[self._target_language] = translation
+        sub_chapter.translation = new_translation
+        logger.debug(f"Assigned translation to chapter {sub_chapter.chapter_index} sub chapter {sub_chapter.sub_chapter_index}")
+        self._save_sub_chapter(novel, sub_chapter)
+
+    def _save_sub_chapter(self, novel: Novel, sub_chapter: SubChapter) -> None:
+        # A finished sub chapter is stored right away, and journaled into the stored novel, so it survives a failure of the rest of the stage
+        try:
+            JsonStorage().save_sub_chapter(novel, sub_chapter)
+        except JsonStorageException as e:
+            logger.warning(f"Failed to save chapter {sub_chapter.chapter_index} sub chapter {sub_chapter.sub_chapter_index}: {e}")
+
+    def _pipeline_sub_chapter(self, **kwargs) -> tuple[int, int]:
+        logger.debug(f"Running pipeline for sub chapter.")
+
+        novel = kwargs['novel']
+        sub_chapter = kwargs['sub_chapter']
+        plans = kwargs['plans']
+
+        if self._target_language not in sub_chapter.summary:
+            summary_chunks, summary_model = plans["summary"]
+            _, _, summary = self._summarize_sub_chapter(chunks=summary_chunks, model=summary_model)
+            self._assign_summary(novel, sub_chapter, summary)
+
+        terms_chunks, terms_model = plans["terms"]
+        terms = self._gather_terms_for_sub_chapter(chunks=terms_chunks, model=terms_model)
+        new_terms = self._merge_new_terms(novel, terms)
+
+        if self._target_language not in sub_chapter.translation:
+            self._weigh_new_terms(novel, sub_chapter, new_terms)
+            translation_chunks, translation_model = plans["translation"]
+            translation = self._translate_sub_chapter(chunks=translation_chunks, model=translation_model, summary=sub_chapter.summary[self._target_language], term_lists=self._snapshot_terms_sheet(novel))
+            self._assign_translation(novel, sub_chapter, translation)
+
+        return sub_chapter.chapter_index, sub_chapter.sub_chapter_index
+
+    async def _apipeline_sub_chapter(self, **kwargs) -> tuple[int, int]:
+        logger.debug(f"Running pipeline for sub chapter asynchronously.")
+
+        novel = kwargs['novel']
+        sub_chapter = kwargs['sub_chapter']
+        plans = kwargs['plans']
+
+        # The summary and the terms only depend on the original text, so they run side by side
+        async def summarize():
+            if self._target_language not in sub_chapter.summary:
+                summary_chunks, summary_model = plans["summary"]
+                _, _, summary = await self._asummarize_sub_chapter(chunks=summary_chunks, model=summary_model)
+                self._assign_summary(novel, sub_chapter, summary)
+
+        async def gather_terms():
+            terms_chunks, terms_model = plans["terms"]
+            terms = await self._agather_terms_for_sub_chapter(chunks=terms_chunks, model=terms_model)
+            return self._merge_new_terms(novel, terms)
+
+        _, new_terms = await asyncio.gather(summarize(), gather_terms())
+
+        if self._target_language not in sub_chapter.translation:
+            await asyncio.to_thread(self._weigh_new_terms, novel, sub_chapter, new_terms)
+            translation_chunks, translation_model = plans["translation"]
+            translation = await self._atranslate_sub_chapter(chunks=translation_chunks, model=translation_model, summary=sub_chapter.summary[self._target_language], term_lists=self._snapshot_terms_sheet(novel))
+            self._assign_translation(novel, sub_chapter, translation)
+
+        return sub_chapter.chapter_index, sub_chapter.sub_chapter_index
+    
     def translate_novel_metadata(self, novel: Novel) -> list[Exception]:
         logger.debug(f"Translating novel metadata.")
 
@@ -1169,7 +1615,7 @@ class GPTTranslator:
 
         return []
 
-    def summarize_sub_chapters(self, novel: Novel, targets: dict[str, list[str]]) -> list[Exception]:
+    def summarize_sub_chapters(self, novel: Novel, targets: dict[str, list[str]]) -> tuple[list[Exception], dict[tuple[int, int], int]]:
         logger.debug(f"Summarizing sub chapters.")
 
         # Validate parameters
@@ -1201,45 +1647,25 @@ class GPTTranslator:
 
         if all(self._target_language in sub_chapter.summary for sub_chapter in sub_chapters):
             logger.debug(f"All sub chapters are already summarized.")
-            return []
+            return [], {}
 
-        task = Task(max_workers=4, retry_on_exceptions=(GPTTranslatorAPIRetryableException))
+        task = self._create_stage_task()
+        summarize = self._asummarize_sub_chapter if self._async_enabled else self._summarize_sub_chapter
 
         # Summarize the sub chapters
         for sub_chapter in sub_chapters:
             if self._target_language in sub_chapter.summary:
                 continue
 
-            prev_sub_chapter, next_sub_chapter = self._get_sub_chapter_context(novel, sub_chapter)
-
-            # Get the previous and next lines and summary
-            prev_line = prev_sub_chapter.contents.splitlines()[-1] if prev_sub_chapter and prev_sub_chapter.contents else ""
-            next_line = next_sub_chapter.contents.splitlines()[0] if next_sub_chapter and next_sub_chapter.contents else ""
-
-            # Calculate the optimal configuration for the sub chapter
-            line_token_counts = self._calculate_line_token_counts(sub_chapter.contents)
-            _, _, summary_division, _, _, summary_model = self._greedy_find_max_optimal_configuration(line_token_counts)
-
-            # Split the text into chunks for the terms sheet API
-            terms_chunks = self._split_text_into_chunks(sub_chapter.contents, summary_division, line_token_counts)
-            terms_chunks_objects = list()
-            for i, chunk in enumerate(terms_chunks):
-                chunk_prev_line = prev_line if i == 0 else terms_chunks[i - 1].splitlines()[-1]
-                chunk_next_line = next_line if i == len(terms_chunks) - 1 else terms_chunks[i + 1].splitlines()[0]
-
-                terms_chunks_objects.append(Chunk(
-                    novel.novel_code,
-                    sub_chapter.chapter_index,
-                    sub_chapter.sub_chapter_index,
-                    i,
-                    chunk,
-                    chunk_prev_line,
-                    chunk_next_line))
+            # Split the text into chunks for the summary API
+            summary_chunks_objects, summary_model = self._get_sub_chapter_chunks(novel, sub_chapter, "summary")
             
-            sub_task = task.add_subtask(self._summarize_sub_chapter, chunks=terms_chunks_objects, model=summary_model)
+            sub_task = task.add_prioritized_subtask(self._sub_chapter_priority(sub_chapter), summarize, chunks=summary_chunks_objects, model=summary_model)
             tasks[(sub_chapter.chapter_index, sub_chapter.sub_chapter_index)] = sub_task
 
-        results = task.run_subtasks()
+        PlanCache().save()
+
+        results, retry_counts = self._run_stage_task(task)
 
         logger.debug(f"Summarizing sub chapters complete.")
         logger.debug(f"Results: {results}")
@@ -1255,15 +1681,12 @@ class GPTTranslator:
                 returned_chapter_index, returned_sub_chapter_index, summary = result
                 active_chapter = novel.get_chapter(returned_chapter_index)
                 active_sub_chapter = active_chapter.get_sub_chapter(returned_sub_chapter_index)
-                new_summary = active_sub_chapter.summary.copy()
-                new_summary[self._target_language] = summary
-                active_sub_chapter.summary = new_summary
-                logger.debug(f"Assigned summary to chapter {chapter_index} sub chapter {sub_chapter_index}")
+                self._assign_summary(novel, active_sub_chapter, summary)
                 logger.debug(f"Current summary: {active_sub_chapter.summary[self._target_language]}")
 
-        return exceptions
+        return exceptions, self._sub_chapter_retry_counts(tasks, retry_counts)
     
-    def gather_terms_for_sub_chapters(self, novel: Novel, targets: dict[str, list[str]]) -> list[Exception]:
+    def gather_terms_for_sub_chapters(self, novel: Novel, targets: dict[str, list[str]]) -> tuple[list[Exception], dict[tuple[int, int], int]]:
         logger.debug(f"Gathering terms for sub chapters.")
 
         # Validate parameters
@@ -1293,40 +1716,20 @@ class GPTTranslator:
 
         tasks = {}
 
-        task = Task(max_workers=4, retry_on_exceptions=(GPTTranslatorAPIRetryableException))
+        task = self._create_stage_task()
+        gather_terms = self._agather_terms_for_sub_chapter if self._async_enabled else self._gather_terms_for_sub_chapter
 
         # Summarize the sub chapters
         for sub_chapter in sub_chapters:
-            prev_sub_chapter, next_sub_chapter = self._get_sub_chapter_context(novel, sub_chapter)
-
-            # Get the previous and next lines and summary
-            prev_line = prev_sub_chapter.contents.splitlines()[-1] if prev_sub_chapter and prev_sub_chapter.contents else ""
-            next_line = next_sub_chapter.contents.splitlines()[0] if next_sub_chapter and next_sub_chapter.contents else ""
-
-            # Calculate the optimal configuration for the sub chapter
-            line_token_counts = self._calculate_line_token_counts(sub_chapter.contents)
-            terms_division, _, _, terms_model, _, _ = self._greedy_find_max_optimal_configuration(line_token_counts)
-
             # Split the text into chunks for the terms sheet API
-            terms_chunks = self._split_text_into_chunks(sub_chapter.contents, terms_division, line_token_counts)
-            terms_chunks_objects = list()
-            for i, chunk in enumerate(terms_chunks):
-                chunk_prev_line = prev_line if i == 0 else terms_chunks[i - 1].splitlines()[-1]
-                chunk_next_line = next_line if i == len(terms_chunks) - 1 else terms_chunks[i + 1].splitlines()[0]
-
-                terms_chunks_objects.append(Chunk(
-                    novel.novel_code,
-                    sub_chapter.chapter_index,
-                    sub_chapter.sub_chapter_index,
-                    i,
-                    chunk,
-                    chunk_prev_line,
-                    chunk_next_line))
+            terms_chunks_objects, terms_model = self._get_sub_chapter_chunks(novel, sub_chapter, "terms")
             
-            sub_task = task.add_subtask(self._gather_terms_for_sub_chapter, chunks=terms_chunks_objects, model=terms_model)
+            sub_task = task.add_prioritized_subtask(self._sub_chapter_priority(sub_chapter), gather_terms, chunks=terms_chunks_objects, model=terms_model)
             tasks[(sub_chapter.chapter_index, sub_chapter.sub_chapter_index)] = sub_task
 
-        results = task.run_subtasks()
+        PlanCache().save()
+
+        results, retry_counts = self._run_stage_task(task)
 
         logger.debug(f"Gathering terms for sub chapters complete.")
         logger.debug(f"{results}")
@@ -1344,9 +1747,9 @@ class GPTTranslator:
             novel.terms_sheet = TermSheet(novel.novel_origin, novel.novel_code)
         novel.terms_sheet.process_new_terms(terms)
 
-        return exceptions
+        return exceptions, self._sub_chapter_retry_counts(tasks, retry_counts)
     
-    def translate_sub_chapters(self, novel: Novel, targets: dict[str, list[str]]) -> list[Exception]:
+    def translate_sub_chapters(self, novel: Novel, targets: dict[str, list[str]]) -> tuple[list[Exception], dict[tuple[int, int], int]]:
         logger.debug(f"Translating sub chapters.")
 
         # Validate parameters
@@ -1376,43 +1779,23 @@ class GPTTranslator:
 
         tasks = {}
 
-        task = Task(max_workers=4, retry_on_exceptions=(GPTTranslatorAPIRetryableException))
+        task = self._create_stage_task()
+        translate = self._atranslate_sub_chapter if self._async_enabled else self._translate_sub_chapter
 
         # Summarize the sub chapters
         for sub_chapter in sub_chapters:
             if self._target_language in sub_chapter.translation:
                 continue
 
-            prev_sub_chapter, next_sub_chapter = self._get_sub_chapter_context(novel, sub_chapter)
-
-            # Get the previous and next lines and summary
-            prev_line = prev_sub_chapter.contents.splitlines()[-1] if prev_sub_chapter and prev_sub_chapter.contents else ""
-            next_line = next_sub_chapter.contents.splitlines()[0] if next_sub_chapter and next_sub_chapter.contents else ""
-
-            # Calculate the optimal configuration for the sub chapter
-            line_token_counts = self._calculate_line_token_counts(sub_chapter.contents)
-            _, translate_division, _, _, translate_model, _ = self._greedy_find_max_optimal_configuration(line_token_counts)
-
-            # Split the text into chunks for the terms sheet API
-            terms_chunks = self._split_text_into_chunks(sub_chapter.contents, translate_division, line_token_counts)
-            terms_chunks_objects = list()
-            for i, chunk in enumerate(terms_chunks):
-                chunk_prev_line = prev_line if i == 0 else terms_chunks[i - 1].splitlines()[-1]
-                chunk_next_line = next_line if i == len(terms_chunks) - 1 else terms_chunks[i + 1].splitlines()[0]
-
-                terms_chunks_objects.append(Chunk(
-                    novel.novel_code,
-                    sub_chapter.chapter_index,
-                    sub_chapter.sub_chapter_index,
-                    i,
-                    chunk,
-                    chunk_prev_line,
-                    chunk_next_line))
+            # Split the text into chunks for the translation API
+            translation_chunks_objects, translate_model = self._get_sub_chapter_chunks(novel, sub_chapter, "translation")
                 
-            sub_task = task.add_subtask(self._translate_sub_chapter, chunks=terms_chunks_objects, model=translate_model, summary=sub_chapter.summary[self._target_language], term_lists=novel.terms_sheet)
+            sub_task = task.add_prioritized_subtask(self._sub_chapter_priority(sub_chapter), translate, chunks=translation_chunks_objects, model=translate_model, summary=sub_chapter.summary[self._target_language], term_lists=novel.terms_sheet)
             tasks[(sub_chapter.chapter_index, sub_chapter.sub_chapter_index)] = sub_task
 
-        results = task.run_subtasks()
+        PlanCache().save()
+
+        results, retry_counts = self._run_stage_task(task)
 
         logger.debug(f"Translating sub chapters complete.")
         logger.debug(f"{results}")
@@ -1426,13 +1809,71 @@ class GPTTranslator:
             else:
                 active_chapter = novel.get_chapter(chapter_index)
                 active_sub_chapter = active_chapter.get_sub_chapter(sub_chapter_index)
-                new_translation = active_sub_chapter.translation.copy()
-                new_translation[self._target_language] = result
-                active_sub_chapter.translation = new_translation
-                logger.debug(f"Assigned translation to chapter {chapter_index} sub chapter {sub_chapter_index}")
+                self._assign_translation(novel, active_sub_chapter, result)
                 logger.debug(f"Translation: {result}")
 
-        return exceptions
+        return exceptions, self._sub_chapter_retry_counts(tasks, retry_counts)
+
+    def translate_sub_chapters_pipelined(self, novel: Novel, targets: dict[str, list[str]]) -> tuple[list[Exception], dict[tuple[int, int], int]]:
+        logger.debug(f"Translating sub chapters with the pipeline.")
+
+        # Validate parameters
+        if not isinstance(novel, Novel):
+            logger.error(f"Novel must be a Novel object")
+            raise TypeError("Novel must be a Novel object")
+        if not isinstance(targets, dict):
+            logger.error(f"Targets must be a dictionary")
+            raise TypeError("Targets must be a dictionary")
+        if not all(isinstance(key, str) for key in targets.keys()):
+            logger.error(f"Chapter numbers must be strings")
+            raise TypeError("Chapter numbers must be strings")
+        if not all(key.isdigit() for key in targets.keys()):
+            logger.error(f"Chapter numbers must be digits as strings")
+            raise TypeError("Chapter numbers must be digits as strings")
+        if not all(isinstance(value, list) for value in targets.values()):
+            logger.error(f"Sub chapter numbers must be lists")
+            raise TypeError("Sub chapter numbers must be lists")
+        if not all(isinstance(item, str) for value in targets.values() for item in value):
+            logger.error(f"Sub chapter numbers must be strings")
+            raise TypeError("Sub chapter numbers must be strings")
+        if not all(item.isdigit() for value in targets.values() for item in value):
+            logger.error(f"Sub chapter numbers must be digits as strings")
+            raise TypeError("Sub chapter numbers must be digits as strings")
+        
+        sub_chapters = get_targeted_sub_chapters(novel, targets)
+
+        if not novel.terms_sheet:
+            novel.terms_sheet = TermSheet(novel.novel_origin, novel.novel_code)
+
+        # The whole novel is weighed once here, the terms found by each sub chapter are weighed on its own text
+        self._update_terms_dimensions(novel)
+
+        tasks = {}
+
+        task = self._create_stage_task()
+        pipeline = self._apipeline_sub_chapter if self._async_enabled else self._pipeline_sub_chapter
+
+        # Each sub chapter moves to the next stage as soon as its own previous stages are done
+        for sub_chapter in sub_chapters:
+            plans = {stage: self._get_sub_chapter_chunks(novel, sub_chapter, stage) for stage in ["summary", "terms", "translation"]}
+
+            sub_task = task.add_prioritized_subtask(self._sub_chapter_priority(sub_chapter), pipeline, novel=novel, sub_chapter=sub_chapter, plans=plans)
+            tasks[(sub_chapter.chapter_index, sub_chapter.sub_chapter_index)] = sub_task
+
+        PlanCache().save()
+
+        results, retry_counts = self._run_stage_task(task)
+
+        logger.debug(f"Translating sub chapters with the pipeline complete.")
+        logger.debug(f"{results}")
+
+        exceptions = []
+        for _, sub_task in tasks.items():
+            result = results[sub_task]
+            if isinstance(result, Exception):
+                exceptions.append(result)
+
+        return exceptions, self._sub_chapter_retry_counts(tasks, retry_counts)
 
 @singleton
 class GPTTranslatorSingleton(GPTTranslator):
@@ -1446,4 +1887,12 @@ class GPTTranslatorSingleton(GPTTranslator):
         metadata_models = cf.data.config.translator.api.metadata.models
         original_language = ""
         target_language = cf.data.config.translator.target_language
-        self._initialize(available_models, terms_models, translation_models, summary_models, metadata_models, original_language, target_language)
+        async_client = cf.data.config.openai.async_client
+        async_enabled = bool(async_client.enabled) if async_client else False
+        async_max_concurrency = async_client.max_concurrency if async_client and async_client.max_concurrency else 32
+        retry = cf.data.config.translator.api.retry
+        retry_settings = {key: value for key, value in retry.items() if value is not None} if retry else {}
+        summary_mode = cf.data.config.translator.api.summary.mode or "rolling"
+        summary_merge_fan_in = cf.data.config.translator.api.summary.merge_fan_in or 4
+        max_workers = cf.data.config.translator.api.max_workers or 8
+        self._initialize(available_models, terms_models, translation_models, summary_models, metadata_models, original_language, target_language, async_enabled, async_max_concurrency, retry_settings, summary_mode, summary_merge_fan_in, max_workers)
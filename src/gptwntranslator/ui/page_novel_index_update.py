@@ -30,7 +30,7 @@ class PageNovelIndexUpdate(PageBase):
                 message = "(1/3) Loading local storage... "
                 screen.print_at(message, 2, last_y)
                 screen.refresh()
-                novels = storage.get_data()
+                novel_old = storage.get_novel(novel_origin, novel_code)
                 screen.print_at("success.", 2 + len(message), last_y)
                 screen.refresh()
                 last_y += 1
@@ -66,7 +66,6 @@ class PageNovelIndexUpdate(PageBase):
                 message = "(3/3) Updating local data... "
                 screen.print_at(message, 2, last_y)
                 screen.refresh()
-                novel_old = [novel for novel in novels if novel.novel_code == novel_code and novel.novel_origin == novel_origin][0]
                 novel_old.title = novel.title
                 novel_old.author = novel.author
                 novel_old.description = novel.description
@@ -74,7 +73,7 @@ class PageNovelIndexUpdate(PageBase):
                 for chapter in novel.chapters:
                     if chapter not in novel_old.chapters:
                         novel_old.chapters.append(chapter)
-                storage.set_data(novels)
+                storage.save_novel(novel_old)
                 screen.print_at("success.", 2 + len(message), last_y)
                 screen.refresh()
                 last_y += 1
@@ -31,7 +31,7 @@ class PageNovelList(Page):
 
         novel_title_length = 60
         novels_per_page_count = 6
-        novels = storage.get_data()
+        novels = storage.get_index()
         novels_count = len(novels)
 
         novels_page_count = novels_count // novels_per_page_count
@@ -45,13 +45,13 @@ class PageNovelList(Page):
         novels_end_index = novels_end_index if novels_end_index < novels_count else novels_count
         current_novels = novels[novels_start_index:novels_end_index]
         for index, novel in enumerate(current_novels):
-            if target_language not in novel.title_translation:
-                title = novel.title
+            if target_language not in novel["title_translation"]:
+                title = novel["title"]
             else:
-                title = novel.title_translation[target_language]
+                title = novel["title_translation"][target_language]
             if len(title) > novel_title_length:
                 title = title[:int(novel_title_length-3)] + "..."
-            menu_item = UIMenuItem(UIMenuItemType.PAGE_NAVIGATION, int(index + 2), 0, None, f"- {title}", None, None, PageNovelMenu, {"novel_origin": novel.novel_origin, "novel_url_code": novel.novel_code}, None)
+            menu_item = UIMenuItem(UIMenuItemType.PAGE_NAVIGATION, int(index + 2), 0, None, f"- {title}", None, None, PageNovelMenu, {"novel_origin": novel["novel_origin"], "novel_url_code": novel["novel_code"]}, None)
             self.menu_items.append(menu_item)
         for index in range(len(self.menu_items), novels_per_page_count + 2):
             menu_item = UIMenuItem(UIMenuItemType.PAGE_NAVIGATION, int(index), 0, None, "(Empty)", None, None, PageNovelList, {"page_index": current_page_index}, None)
@@ -31,7 +31,7 @@ class PageNovelLookup(PageBase):
                 message = "(1/2) Checking local storage... "
                 screen.print_at(message, 2, last_y)
                 screen.refresh()
-                novels = storage.get_data()
+                index = storage.get_index()
                 screen.print_at("success.", 2 + len(message), last_y)
                 screen.refresh()
                 last_y += 1
@@ -49,7 +49,8 @@ class PageNovelLookup(PageBase):
                 message = "(2/2) Checking if novel is already in local storage... "
                 screen.print_at(message, 2, last_y)
                 screen.refresh()
-                novel = [novel for novel in novels if novel.novel_code == novel_code and novel.novel_origin == novel_origin][0]
+                if not any(entry["novel_code"] == novel_code and entry["novel_origin"] == novel_origin for entry in index):
+                    raise IndexError("Novel not found in local storage.")
                 screen.print_at("success.", 2 + len(message), last_y)
                 screen.refresh()
                 last_y += 1
@@ -80,8 +81,7 @@ class PageNovelLookup(PageBase):
                 message = "(4/4) Saving novel to local storage... "
                 screen.print_at(message, 2, last_y)
                 screen.refresh()
-                novels.append(novel)
-                storage.set_data(novels)
+                storage.save_novel(novel)
                 screen.print_at("success.", 2 + len(message), last_y)
                 screen.refresh()
                 last_y += 1
@@ -48,8 +48,7 @@ class PageNovelManagement(PageTypeA):
     def pre_render(self, screen, **kwargs) -> None:
         super().pre_render(screen, **kwargs)
         storage = JsonStorage()
-        novels = storage.get_data()
-        novel = [novel for novel in novels if novel.novel_code == kwargs["novel_url_code"]][0]
+        novel = storage.get_novel(kwargs["novel_origin"], kwargs["novel_url_code"])
         cf = Config()
         self.pre_messages = []
         if cf.data.config.translator.target_language in novel.title_translation:
@@ -1,9 +1,8 @@
-import json
 import os
 from gptwntranslator.encoders.json_encoder import JsonEncoder
 from gptwntranslator.helpers.config_helper import Config
-from gptwntranslator.helpers.file_helper import write_file
-from gptwntranslator.helpers.text_helper import make_printable
+from gptwntranslator.helpers.file_helper import write_file_chunks
+from gptwntranslator.helpers.text_helper import make_printable_chunks
 from gptwntranslator.helpers.ui_helper import print_messages, print_title, wait_for_user_input
 from gptwntranslator.storage.json_storage import JsonStorage
 from gptwntranslator.ui.page_base import PageBase
@@ -36,8 +35,7 @@ class PageNovelMgmExportSheet(PageBase):
                 message = "(1/2) Loading local storage... "
                 screen.print_at(message, 2, last_y)
                 screen.refresh()
-                novels = storage.get_data()
-                novel = [novel for novel in novels if novel.novel_code == novel_code and novel.novel_origin == novel_origin][0]
+                novel = storage.get_novel(novel_origin, novel_code)
                 screen.print_at("success.", 2 + len(message), last_y)
                 screen.refresh()
                 last_y += 1
@@ -56,8 +54,7 @@ class PageNovelMgmExportSheet(PageBase):
                 screen.print_at(message, 2, last_y)
                 screen.refresh()
                 sheet = novel.terms_sheet
-                json_string = make_printable(json.dumps(sheet, ensure_ascii=False, cls=JsonEncoder))
-                write_file(output, json_string)
+                write_file_chunks(output, make_printable_chunks(JsonEncoder(ensure_ascii=False).iterencode(sheet)))
                 screen.print_at("success.", 2 + len(message), last_y)
                 screen.refresh()
                 last_y += 1
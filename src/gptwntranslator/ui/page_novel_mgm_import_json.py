@@ -38,8 +38,7 @@ class PageNovelMgmImportJson(PageBase):
                 message = "(1/3) Loading local storage... "
                 screen.print_at(message, 2, last_y)
                 screen.refresh()
-                novels = storage.get_data()
-                old_novel = [novel for novel in novels if novel.novel_code == novel_code and novel.novel_origin == novel_origin][0]
+                old_novel = storage.get_novel(novel_origin, novel_code)
                 screen.print_at("success.", 2 + len(message), last_y)
                 screen.refresh()
                 last_y += 1
@@ -63,8 +62,6 @@ class PageNovelMgmImportJson(PageBase):
                     raise Exception("Novel is not of type Novel.")
                 if novel_new.novel_code != novel_code or novel_new.novel_origin != novel_origin:
                     raise Exception("Novel code and origin do not match.")
-                novels.remove(old_novel)
-                novels.append(novel_new)
                 screen.print_at("success.", 2 + len(message), last_y)
                 screen.refresh()
                 last_y += 1
@@ -82,7 +79,7 @@ class PageNovelMgmImportJson(PageBase):
                 message = "(3/3) Saving novel to local storage... "
                 screen.print_at(message, 2, last_y)
                 screen.refresh()
-                storage.set_data(novels)
+                storage.save_novel(novel_new)
                 screen.print_at("success.", 2 + len(message), last_y)
                 screen.refresh()
                 last_y += 1
@@ -38,8 +38,7 @@ class PageNovelMgmImportSheet(PageBase):
                 message = "(1/3) Loading local storage... "
                 screen.print_at(message, 2, last_y)
                 screen.refresh()
-                novels = storage.get_data()
-                novel = [novel for novel in novels if novel.novel_code == novel_code and novel.novel_origin == novel_origin][0]
+                novel = storage.get_novel(novel_origin, novel_code)
                 screen.print_at("success.", 2 + len(message), last_y)
                 screen.refresh()
                 last_y += 1
@@ -81,7 +80,7 @@ class PageNovelMgmImportSheet(PageBase):
                 message = "(3/3) Saving novel to local storage... "
                 screen.print_at(message, 2, last_y)
                 screen.refresh()
-                storage.set_data(novels)
+                storage.save_novel(novel)
                 screen.print_at("success.", 2 + len(message), last_y)
                 screen.refresh()
                 last_y += 1
@@ -1,3 +1,4 @@
+from gptwntranslator.helpers.config_helper import Config
 from gptwntranslator.helpers.ui_helper import print_messages, print_title, wait_for_user_input
 from gptwntranslator.storage.json_storage import JsonStorage
 from gptwntranslator.ui.page_base import PageBase
@@ -18,6 +19,7 @@ class PageNovelMgmPurgeNovel(PageBase):
         novel_code = kwargs["novel_url_code"]
         novel_origin = kwargs["novel_origin"]
         storage = JsonStorage()
+        config = Config()
 
         # Print title
         last_y = print_title(screen, resources["title"], 0)
@@ -28,11 +30,12 @@ class PageNovelMgmPurgeNovel(PageBase):
         while True:
             last_y += 1
             try:
-                message = "(1/3) Loading local storage... "
+                message = "(1/2) Loading local storage... "
                 screen.print_at(message, 2, last_y)
                 screen.refresh()
-                novels = storage.get_data()
-                novel_old = [novel for novel in novels if novel.novel_code == novel_code and novel.novel_origin == novel_origin][0]
+                index = storage.get_index()
+                if not any(entry["novel_code"] == novel_code and entry["novel_origin"] == novel_origin for entry in index):
+                    raise Exception("Novel not found in local storage.")
                 screen.print_at("success.", 2 + len(message), last_y)
                 screen.refresh()
                 last_y += 1
@@ -47,28 +50,12 @@ class PageNovelMgmPurgeNovel(PageBase):
                 break
 
             try:
-                message = "(2/3) Purging sheet... "
+                message = "(2/2) Purging novel from local storage... "
                 screen.print_at(message, 2, last_y)
                 screen.refresh()
-                novels.remove(novel_old)
-                screen.print_at("success.", 2 + len(message), last_y)
-                screen.refresh()
-                last_y += 1
-            except Exception as e:
-                screen.print_at("failed.", 2 + len(message), last_y)
-                last_y += 1
-                messages = [
-                    f"Error: Error purging sheet.",
-                    f"Error: {e}"]
-                target = PageMessage
-                params = {"messages": messages, "return_page": self.args["return_page"], "return_kwargs": self.args["return_kwargs"]}
-                break
-
-            try:
-                message = "(3/3) Saving novel to local storage... "
-                screen.print_at(message, 2, last_y)
-                screen.refresh()
-                storage.set_data(novels)
+                storage.delete_novel(novel_origin, novel_code)
+                # The cached responses of the purged novel are asked for again for the rest of the session
+                config.vars.setdefault("refresh_novels", set()).add((novel_origin, novel_code))
                 screen.print_at("success.", 2 + len(message), last_y)
                 screen.refresh()
                 last_y += 1
@@ -35,9 +35,8 @@ class PageNovelPurgeSheet(PageBase):
                 message = "(1/3) Loading local storage... "
                 screen.print_at(message, 2, last_y)
                 screen.refresh()
-                novels = storage.get_data()
-                novel_old = [novel for novel in novels if novel.novel_code == novel_code and novel.novel_origin == novel_origin][0]
-                novel_new = copy.deepcopy(novel_old)
+                novel_old = storage.get_novel(novel_origin, novel_code)
+                novel_new = novel_old.snapshot()
                 screen.print_at("success.", 2 + len(message), last_y)
                 screen.refresh()
                 last_y += 1
@@ -55,12 +54,12 @@ class PageNovelPurgeSheet(PageBase):
                 message = "(2/3) Purging sheet... "
                 screen.print_at(message, 2, last_y)
                 screen.refresh()
-                for _, term_item in novel_new.terms_sheet.terms.items():
+                for original_term, term_item in list(novel_new.terms_sheet.terms.items()):
                     if term_item.has_translation(target_language):
                         translations = copy.deepcopy(term_item.translations)
                         if target_language in translations:
                             _ = translations.pop(target_language)
-                            term_item.translations = translations
+                            novel_new.terms_sheet.get_writable_term(original_term).translations = translations
                 screen.print_at("success.", 2 + len(message), last_y)
                 screen.refresh()
                 last_y += 1
@@ -78,9 +77,9 @@ class PageNovelPurgeSheet(PageBase):
                 message = "(3/3) Saving novel to local storage... "
                 screen.print_at(message, 2, last_y)
                 screen.refresh()
-                novels.remove(novel_old)
-                novels.append(novel_new)
-                storage.set_data(novels)
+                storage.save_novel(novel_new)
+                # The cached responses of the purged novel are asked for again for the rest of the session
+                config.vars.setdefault("refresh_novels", set()).add((novel_origin, novel_code))
                 screen.print_at("success.", 2 + len(message), last_y)
                 screen.refresh()
                 last_y += 1
@@ -33,9 +33,8 @@ class PageNovelMgmPurgeSummaries(PageBase):
                 message = "(1/3) Loading local storage... "
                 screen.print_at(message, 2, last_y)
                 screen.refresh()
-                novels = storage.get_data()
-                novel_old = [novel for novel in novels if novel.novel_code == novel_code and novel.novel_origin == novel_origin][0]
-                novel_new = copy.deepcopy(novel_old)
+                novel_old = storage.get_novel(novel_origin, novel_code)
+                novel_new = novel_old.snapshot()
                 screen.print_at("success.", 2 + len(message), last_y)
                 screen.refresh()
                 last_y += 1
@@ -76,9 +75,9 @@ class PageNovelMgmPurgeSummaries(PageBase):
                 message = "(3/3) Saving novel to local storage... "
                 screen.print_at(message, 2, last_y)
                 screen.refresh()
-                novels.remove(novel_old)
-                novels.append(novel_new)
-                storage.set_data(novels)
+                storage.save_novel(novel_new)
+                # The cached responses of the purged novel are asked for again for the rest of the session
+                config.vars.setdefault("refresh_novels", set()).add((novel_origin, novel_code))
                 screen.print_at("success.", 2 + len(message), last_y)
                 screen.refresh()
                 last_y += 1
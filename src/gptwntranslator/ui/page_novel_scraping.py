@@ -17,6 +17,7 @@ class PageNovelScraping(PageBase):
         novel_code = kwargs["novel_url_code"]
         targets = kwargs["target"]
         novel_origin = kwargs["novel_origin"]
+        incremental = kwargs.get("mode") == "incremental"
         storage = JsonStorage()
         origin = OriginFactory.get_origin(novel_origin)
 
@@ -50,7 +51,7 @@ class PageNovelScraping(PageBase):
                 message = "(2/4) Loading local storage... "
                 screen.print_at(message, 2, last_y)
                 screen.refresh()
-                novels = storage.get_data()
+                novel = storage.get_novel(novel_origin, novel_code)
                 screen.print_at("success.", 2 + len(message), last_y)
                 screen.refresh()
                 last_y += 1
@@ -65,14 +66,16 @@ class PageNovelScraping(PageBase):
                 break
             
             try:
-                message = "(3/4) Downloading chapters targets... "
+                message = "(3/4) Downloading new or updated chapters targets... " if incremental else "(3/4) Downloading chapters targets... "
                 screen.print_at(message, 2, last_y)
                 screen.refresh()
-                novel = [novel for novel in novels if novel.novel_code == novel_code and novel.novel_origin == novel_origin][0]
-                origin.process_targets(novel, targets)
+                skipped = origin.process_targets(novel, targets, incremental)
                 screen.print_at("success.", 2 + len(message), last_y)
                 screen.refresh()
                 last_y += 1
+                if skipped:
+                    screen.print_at(f"Skipped {len(skipped)} sub chapters already up to date.", 2, last_y)
+                    last_y += 1
             except Exception as e:
                 screen.print_at("failed.", 2 + len(message), last_y)
                 last_y += 1
@@ -87,7 +90,7 @@ class PageNovelScraping(PageBase):
                 message = "(4/4) Saving novel to local storage... "
                 screen.print_at(message, 2, last_y)
                 screen.refresh()
-                storage.set_data(novels)
+                storage.save_novel(novel)
                 screen.print_at("success.", 2 + len(message), last_y)
                 screen.refresh()
                 last_y += 1
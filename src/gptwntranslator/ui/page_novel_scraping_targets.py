@@ -10,24 +10,30 @@ class PageNovelScrapingTargets(PageTypeB):
     def __init__(self) -> None:
         resources = get_resources()
 
-        menu_item_2 = UIMenuItem(UIMenuItemType.PAGE_NAVIGATION, 2, 0, 1, "Start scraping", None, None, PageNovelScraping, {"target": ""}, None)
+        menu_item_2_items = {"full": "All targets", "incremental": "New or updated only"}
+
+        menu_item_2 = UIMenuItem(UIMenuItemType.PAGE_NAVIGATION, 3, 0, 1, "Start scraping", None, None, PageNovelScraping, {"target": "", "mode": ""}, None)
         menu_item_1 = UIMenuItem(UIMenuItemType.TEXT_INPUT, 0, 0, None, "Chapter selection pattern:", menu_item_2, "target", None, None, None)
-        menu_item_3 = UIMenuItem(UIMenuItemType.PAGE_NAVIGATION, 3, 0, 2, "Pattern explanation", None, None, PageMessage, {"messages": resources["chapter_regex_explanation"]}, None)
-        menu_item_4 = UIMenuItem(UIMenuItemType.PAGE_NAVIGATION, 5, 0, 0, "Go back", None, None, PageReturn, {}, None)
+        menu_item_5 = UIMenuItem(UIMenuItemType.COMBO_BOX, 1, 0, None, "Scrape mode:", menu_item_2, "mode", None, None, menu_item_2_items)
+        menu_item_3 = UIMenuItem(UIMenuItemType.PAGE_NAVIGATION, 4, 0, 2, "Pattern explanation", None, None, PageMessage, {"messages": resources["chapter_regex_explanation"]}, None)
+        menu_item_4 = UIMenuItem(UIMenuItemType.PAGE_NAVIGATION, 6, 0, 0, "Go back", None, None, PageReturn, {}, None)
 
         menu = {
             "message_lines": [
                 "Please select the target chapters and sub chapters",
                 "you wish to scrape. Leave blank to scrape all chapters.",
+                "The new or updated mode skips the chapters already",
+                "scraped and unchanged on the novel index.",
             ],
             "menu_items": [
                 (0, 0, None, "Chapter selection pattern:", 1, "", True),
-                (2, 0, 1, "1) Start scraping", PageNovelScraping, "", False),
-                (3, 0, 2, "2) Pattern explanation", PageMessage, resources["chapter_regex_explanation"], False),
-                (5, 0, 0, "0) Go back", PageReturn, "", False)
+                (3, 0, 1, "1) Start scraping", PageNovelScraping, "", False),
+                (4, 0, 2, "2) Pattern explanation", PageMessage, resources["chapter_regex_explanation"], False),
+                (6, 0, 0, "0) Go back", PageReturn, "", False)
             ],
             "menu_items2": [
                 menu_item_1,
+                menu_item_5,
                 menu_item_2,
                 menu_item_3,
                 menu_item_4
@@ -1,3 +1,4 @@
+from gptwntranslator.helpers.config_helper import Config
 from gptwntranslator.helpers.ui_helper import print_title, wait_for_user_input
 from gptwntranslator.storage.json_storage import JsonStorage
 from gptwntranslator.translators.gpt_translator import GPTTranslatorSingleton
@@ -29,8 +30,7 @@ class PageNovelTranslateMetadata(PageBase):
                 message = "(1/4) Loading novel from local storage... "
                 screen.print_at(message, 2, last_y)
                 screen.refresh()
-                novels = storage.get_data()
-                novel = [novel for novel in novels if novel.novel_code == novel_code and novel.novel_origin == novel_origin][0]
+                novel = storage.get_novel(novel_origin, novel_code)
                 screen.print_at("success.", 2 + len(message), last_y)
                 screen.refresh()
                 last_y += 1
@@ -50,6 +50,7 @@ class PageNovelTranslateMetadata(PageBase):
                 screen.refresh()
                 translator = GPTTranslatorSingleton()
                 translator.set_original_language(novel.original_language)
+                translator.set_refresh_responses((novel_origin, novel_code) in Config().vars.get("refresh_novels", set()))
                 screen.print_at("success.", 2 + len(message), last_y)
                 screen.refresh()
                 last_y += 1
@@ -89,7 +90,7 @@ class PageNovelTranslateMetadata(PageBase):
                 message = "(4/4) Saving novel to local storage... "
                 screen.print_at(message, 2, last_y)
                 screen.refresh()
-                storage.set_data(novels)
+                storage.save_novel(novel)
                 screen.print_at("success.", 2 + len(message), last_y)
                 screen.refresh()
                 last_y += 1
@@ -1,3 +1,4 @@
+from gptwntranslator.helpers.config_helper import Config
 from gptwntranslator.helpers.text_helper import parse_chapters
 from gptwntranslator.helpers.ui_helper import print_title, wait_for_user_input
 from gptwntranslator.storage.json_storage import JsonStorage
@@ -55,11 +56,7 @@ class PageNovelTranslating(PageBase):
                 message = "(2/12) Loading local storage... "
                 screen.print_at(message, 2, last_y)
                 screen.refresh()
-                novels = storage.get_data()
-                novel_index = next((i for i, n in enumerate(novels) if n.novel_code == novel_code and n.novel_origin == novel_origin), None)
-                if novel_index is None:
-                    raise ValueError(f"Novel with code {novel_code} not found in local storage.")
-                novel = novels[novel_index]
+                novel = storage.get_novel(novel_origin, novel_code)
                 screen.print_at("success.", 2 + len(message), last_y)
                 screen.refresh()
                 last_y += 1
@@ -79,6 +76,7 @@ class PageNovelTranslating(PageBase):
                 screen.refresh()
                 translator = GPTTranslatorSingleton()
                 translator.set_original_language(novel.original_language)
+                translator.set_refresh_responses((novel_origin, novel_code) in Config().vars.get("refresh_novels", set()))
                 screen.print_at("success.", 2 + len(message), last_y)
                 screen.refresh()
                 last_y += 1
@@ -93,23 +91,28 @@ class PageNovelTranslating(PageBase):
                 break
 
             try:
-                message = "(4/12) Generating summary for targets... "
+                pipeline = bool(Config().data.config.translator.pipeline)
+                message = "(4/12) Generating summary, terms and translation for targets (pipelined)... " if pipeline else "(4/12) Generating summary for targets... "
                 screen.print_at(message, 2, last_y)
                 screen.refresh()
                 # exceptions = []
-                exceptions = translator.summarize_sub_chapters(novel, targets)
+                if pipeline:
+                    exceptions, _ = translator.translate_sub_chapters_pipelined(novel, targets)
+                else:
+                    exceptions, _ = translator.summarize_sub_chapters(novel, targets)
                 if exceptions:
+                    if pipeline:
+                        raise Exception("Translation pipeline failed for some sub chapters. {}".format(exceptions[0]))
                     raise Exception("Summary generation failed for some sub chapters. {}".format(exceptions[0]))
                 else:
                     screen.print_at("success.", 2 + len(message), last_y)
                     screen.refresh()
                     last_y += 1
-                novels[novel_index] = novel
             except Exception as e:
                 screen.print_at("failed.", 2 + len(message), last_y)
                 last_y += 1
                 messages = [
-                    f"Error: Error generating summary.",
+                    f"Error: Error running the translation pipeline." if pipeline else f"Error: Error generating summary.",
                     f"Error: {e}"]
                 target = PageMessage
                 params = {"messages": messages, "return_page": self.args["return_page"], "return_kwargs": self.args["return_kwargs"]}
@@ -119,7 +122,7 @@ class PageNovelTranslating(PageBase):
                 message = "(5/12) Saving novel to local storage... "
                 screen.print_at(message, 2, last_y)
                 screen.refresh()
-                storage.set_data(novels)
+                storage.save_novel(novel)
                 screen.print_at("success.", 2 + len(message), last_y)
                 screen.refresh()
                 last_y += 1
@@ -137,7 +140,8 @@ class PageNovelTranslating(PageBase):
                 message = "(6/12) Updating novel terms sheet with targets... "
                 screen.print_at(message, 2, last_y)
                 screen.refresh()
-                exceptions = translator.gather_terms_for_sub_chapters(novel, targets)
+                if not pipeline:
+                    exceptions, _ = translator.gather_terms_for_sub_chapters(novel, targets)
                 exceptions = []
                 if exceptions:
                     raise Exception("Terms sheet update failed for some chapters. {}".format(exceptions[0]))
@@ -145,7 +149,6 @@ class PageNovelTranslating(PageBase):
                     screen.print_at("success.", 2 + len(message), last_y)
                     screen.refresh()
                     last_y += 1
-                novels[novel_index] = novel
             except Exception as e:
                 screen.print_at("failed.", 2 + len(message), last_y)
                 last_y += 1
@@ -160,7 +163,7 @@ class PageNovelTranslating(PageBase):
                 message = "(7/12) Saving novel to local storage... "
                 screen.print_at(message, 2, last_y)
                 screen.refresh()
-                storage.set_data(novels)
+                storage.save_novel(novel)
                 screen.print_at("success.", 2 + len(message), last_y)
                 screen.refresh()
                 last_y += 1
@@ -178,7 +181,7 @@ class PageNovelTranslating(PageBase):
                 message = "(8/12) Updating terms sheet weights... "
                 screen.print_at(message, 2, last_y)
                 screen.refresh()
-                novel.terms_sheet.update_dimensions(novel.original_body(), novel.original_language)
+                novel.terms_sheet.update_dimensions(novel.original_segments(), novel.original_language)
                 screen.print_at("success.", 2 + len(message), last_y)
                 screen.refresh()
                 last_y += 1
@@ -197,14 +200,14 @@ class PageNovelTranslating(PageBase):
                 screen.print_at(message, 2, last_y)
                 screen.refresh()
                 exceptions = []
-                exceptions = translator.translate_sub_chapters(novel, targets)
+                if not pipeline:
+                    exceptions, _ = translator.translate_sub_chapters(novel, targets)
                 if exceptions:
                     raise Exception("Translation failed for some sub chapters. {}".format(exceptions[0]))
                 else:
                     screen.print_at("success.", 2 + len(message), last_y)
                     screen.refresh()
                     last_y += 1
-                novels[novel_index] = novel
             except Exception as e:
                 screen.print_at("failed.", 2 + len(message), last_y)
                 last_y += 1
@@ -219,7 +222,7 @@ class PageNovelTranslating(PageBase):
                 message = "(10/12) Saving novel to local storage... "
                 screen.print_at(message, 2, last_y)
                 screen.refresh()
-                storage.set_data(novels)
+                storage.save_novel(novel)
                 screen.print_at("success.", 2 + len(message), last_y)
                 screen.refresh()
                 last_y += 1
@@ -245,7 +248,6 @@ class PageNovelTranslating(PageBase):
                     screen.print_at("success.", 2 + len(message), last_y)
                     screen.refresh()
                     last_y += 1
-                novels[novel_index] = novel
             except Exception as e:
                 screen.print_at("failed.", 2 + len(message), last_y)
                 last_y += 1
@@ -260,7 +262,7 @@ class PageNovelTranslating(PageBase):
                 message = "(12/12) Saving novel to local storage... "
                 screen.print_at(message, 2, last_y)
                 screen.refresh()
-                storage.set_data(novels)
+                storage.save_novel(novel)
                 screen.print_at("success.", 2 + len(message), last_y)
                 screen.refresh()
                 last_y += 1
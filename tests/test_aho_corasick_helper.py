@@ -0,0 +1,41 @@
+import random
+
+import pytest
+
+from gptwntranslator.helpers.aho_corasick_helper import AhoCorasick
+
+
+def random_text(rng, alphabet, length):
+    return "".join(rng.choice(alphabet) for _ in range(length))
+
+@pytest.mark.parametrize("seed", range(30))
+def test_find_and_count_match_str_count(seed):
+    rng = random.Random(seed)
+    # A small alphabet makes patterns overlap each other and themselves
+    alphabet = "ab" if seed % 2 == 0 else "abc"
+    patterns = {random_text(rng, alphabet, rng.randint(1, 4)) for _ in range(rng.randint(1, 8))}
+    text = random_text(rng, alphabet, rng.randint(0, 200))
+    automaton = AhoCorasick(patterns)
+
+    expected = {pattern: text.count(pattern) for pattern in patterns if pattern in text}
+    assert automaton.count(text) == expected
+    assert set(automaton.find(text)) == set(expected)
+    assert len(automaton.find(text)) == len(expected)
+
+def test_patterns_added_after_a_search_are_found():
+    automaton = AhoCorasick(["aa"])
+    assert automaton.count("aaaa") == {"aa": 2}
+
+    automaton.add("a")
+    automaton.add("aaa")
+    assert automaton.count("aaaa") == {"a": 4, "aa": 2, "aaa": 1}
+
+def test_overlapping_occurrences_of_different_patterns():
+    automaton = AhoCorasick(["abab", "bab", "ab"])
+    assert automaton.find_occurrences("ababab") == [(0, 2, "ab"), (0, 4, "abab"), (1, 4, "bab"), (2, 4, "ab"), (4, 6, "ab")]
+    assert automaton.find("ababab") == ["ab", "abab", "bab"]
+
+def test_japanese_terms():
+    automaton = AhoCorasick(["魔王", "魔王城", "王城"])
+    text = "魔王城の魔王は王城にいない。魔王城"
+    assert automaton.count(text) == {pattern: text.count(pattern) for pattern in ["魔王", "魔王城", "王城"]}
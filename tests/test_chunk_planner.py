@@ -0,0 +1,64 @@
+import random
+
+import pytest
+
+from gptwntranslator.translators.chunk_planner import ChunkPlanner
+
+
+WRAPPER_PERCENTAGE = 0.3
+
+def count_chunks_by_walking(line_token_counts, division_size):
+    chunks = 0
+    current_tokens = None
+    for token_count in line_token_counts:
+        if current_tokens is not None and current_tokens + token_count <= division_size:
+            current_tokens += token_count
+        else:
+            chunks += 1
+            current_tokens = token_count
+    return chunks
+
+def brute_force_cost(line_token_counts, stages, step=100):
+    # Every model and division of every stage at once, as the planner replaced
+    min_cost = float('inf')
+    for term_model, term_limit, term_cost in stages[0]:
+        for translation_model, translation_limit, translation_cost in stages[1]:
+            for summary_model, summary_limit, summary_cost in stages[2]:
+                for term_division in range(term_limit // 2, term_limit + 1, step):
+                    for translation_division in range(translation_limit // 2, translation_limit + 1, step):
+                        for summary_division in range(summary_limit // 2, summary_limit + 1, step):
+                            cost = count_chunks_by_walking(line_token_counts, term_division) * (term_division * (1 + WRAPPER_PERCENTAGE)) * term_cost
+                            cost += count_chunks_by_walking(line_token_counts, translation_division) * (translation_division * (1 + WRAPPER_PERCENTAGE)) * translation_cost
+                            cost += count_chunks_by_walking(line_token_counts, summary_division) * (summary_division * (1 + WRAPPER_PERCENTAGE)) * summary_cost
+                            min_cost = min(min_cost, cost)
+    return min_cost
+
+def random_candidates(rng):
+    return [(f"model-{i}", rng.randrange(400, 1600, 4), rng.choice([0.5, 1, 2, 3])) for i in range(rng.randint(1, 2))]
+
+@pytest.mark.parametrize("seed", range(20))
+def test_optimal_stage_configuration_matches_brute_force(seed):
+    rng = random.Random(seed)
+    line_token_counts = [rng.randint(0, 300) for _ in range(rng.randint(1, 60))]
+    stages = [random_candidates(rng) for _ in range(3)]
+    planner = ChunkPlanner(line_token_counts)
+
+    cost = 0
+    for candidates in stages:
+        division, model_name = planner.find_optimal_stage_configuration(candidates, WRAPPER_PERCENTAGE)
+        cost_per_1k_tokens = next(model_cost for name, _, model_cost in candidates if name == model_name)
+        cost += count_chunks_by_walking(line_token_counts, division) * (division * (1 + WRAPPER_PERCENTAGE)) * cost_per_1k_tokens
+
+    assert cost == pytest.approx(brute_force_cost(line_token_counts, stages))
+
+@pytest.mark.parametrize("seed", range(20))
+def test_chunk_boundaries_match_walking_the_lines(seed):
+    rng = random.Random(seed)
+    line_token_counts = [rng.randint(0, 300) for _ in range(rng.randint(0, 60))]
+    planner = ChunkPlanner(line_token_counts)
+
+    for division_size in [1, 50, 150, 299, 300, 1000]:
+        boundaries = planner.chunk_boundaries(division_size)
+        assert len(boundaries) == count_chunks_by_walking(line_token_counts, division_size)
+        assert [start for start, _ in boundaries] == [0] + [end for _, end in boundaries[:-1]]
+        assert boundaries == [] or boundaries[-1][1] == len(line_token_counts)
@@ -0,0 +1,79 @@
+import pytest
+
+from gptwntranslator.helpers import circuit_breaker_helper
+from gptwntranslator.helpers.circuit_breaker_helper import CircuitBreaker, CircuitOpenException
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = {"now": 1000.0}
+    monkeypatch.setattr(circuit_breaker_helper.time, "monotonic", lambda: clock["now"])
+    return clock
+
+def fail(breaker, times):
+    for _ in range(times):
+        breaker.before_call()
+        breaker.record_failure()
+
+def test_opens_after_consecutive_failures(clock):
+    breaker = CircuitBreaker("model", failure_threshold=3, reset_timeout=30)
+    fail(breaker, 2)
+    breaker.before_call()
+
+    breaker.record_failure()
+    with pytest.raises(CircuitOpenException):
+        breaker.before_call()
+
+def test_success_resets_the_failure_count(clock):
+    breaker = CircuitBreaker("model", failure_threshold=3, reset_timeout=30)
+    fail(breaker, 2)
+    breaker.before_call()
+    breaker.record_success()
+
+    fail(breaker, 2)
+    breaker.before_call()
+
+def test_half_open_lets_a_single_trial_through(clock):
+    breaker = CircuitBreaker("model", failure_threshold=1, reset_timeout=30)
+    fail(breaker, 1)
+
+    clock["now"] += 29
+    with pytest.raises(CircuitOpenException):
+        breaker.before_call()
+
+    clock["now"] += 1
+    breaker.before_call()
+    # Other calls fail fast while the trial is in flight
+    with pytest.raises(CircuitOpenException):
+        breaker.before_call()
+
+def test_successful_trial_closes_the_breaker(clock):
+    breaker = CircuitBreaker("model", failure_threshold=1, reset_timeout=30)
+    fail(breaker, 1)
+    clock["now"] += 30
+    breaker.before_call()
+
+    breaker.record_success()
+    breaker.before_call()
+    breaker.before_call()
+
+def test_failed_trial_opens_the_breaker_again(clock):
+    breaker = CircuitBreaker("model", failure_threshold=3, reset_timeout=30)
+    fail(breaker, 3)
+    clock["now"] += 30
+    breaker.before_call()
+
+    breaker.record_failure()
+    with pytest.raises(CircuitOpenException):
+        breaker.before_call()
+    clock["now"] += 30
+    breaker.before_call()
+
+def test_released_trial_lets_the_next_one_through(clock):
+    breaker = CircuitBreaker("model", failure_threshold=1, reset_timeout=30)
+    fail(breaker, 1)
+    clock["now"] += 30
+    breaker.before_call()
+
+    breaker.release()
+    breaker.before_call()
@@ -0,0 +1,74 @@
+import pytest
+
+bs4 = pytest.importorskip("bs4")
+
+from gptwntranslator.origins.base_web_origin import FAST_PARSER
+from gptwntranslator.origins.jjwxc_origin import JJWXCOrigin
+from gptwntranslator.origins.kakuyomu_origin import KakuyomuOrigin
+from gptwntranslator.origins.syosetu_ncode_origin import SyosetuNCodeOrigin
+
+
+JJWXC_PAGE = """<!DOCTYPE html>
+<html>
+<head><meta http-equiv="Content-Type" content="text/html; charset=gb18030"><title>第一章</title></head>
+<body>
+<div class="noveltext">
+<div style="clear:both;"></div>
+<div align="center"><h2>第一章 出发</h2></div>
+　　天色渐暗，他推开了门。<br>
+<br>
+　　“走吧。”<br>
+　　她点了点头，<font color="#E2E2E2">防盗</font>跟了上去。<br>
+<div id="favoriteshow_3" style="display:none"></div>
+</div>
+<div class="noveltext">作者有话要说</div>
+</body>
+</html>
+"""
+
+KAKUYOMU_PAGE = """<!DOCTYPE html>
+<html lang="ja">
+<head><meta charset="utf-8"><title>第一話</title></head>
+<body>
+<header><p>カクヨム</p></header>
+<div class="widget-episodeBody js-episode-body">
+<p id="p1">　朝が来た。</p>
+<p id="p2" class="blank"><br /></p>
+<p id="p3">　「おはよう」と<ruby><rb>魔王</rb><rp>（</rp><rt>まおう</rt><rp>）</rp></ruby>は言った。</p>
+<p id="p4">　窓の外は晴れていた。</p>
+</div>
+<footer><p>次のエピソード</p></footer>
+</body>
+</html>
+"""
+
+SYOSETU_PAGE = """<!DOCTYPE html>
+<html lang="ja">
+<head><meta charset="UTF-8"><title>第一部分</title></head>
+<body>
+<div id="novel_p" class="novel_view"><p id="Lp1">前書き</p></div>
+<div id="novel_honbun" class="novel_view">
+<p id="L1">　目を覚ますと、知らない天井だった。</p>
+<p id="L2"><br /></p>
+<p id="L3">　「ここは……どこだ？」</p>
+<p id="L4"></p>
+<p id="L5">　返事はなかった。</p>
+</div>
+<div id="novel_a" class="novel_view"><p id="La1">後書き</p></div>
+</body>
+</html>
+"""
+
+@pytest.mark.parametrize("origin_class, page", [
+    (JJWXCOrigin, JJWXC_PAGE),
+    (KakuyomuOrigin, KAKUYOMU_PAGE),
+    (SyosetuNCodeOrigin, SYOSETU_PAGE),
+])
+@pytest.mark.parametrize("parser", sorted({"html.parser", FAST_PARSER}))
+def test_strained_parse_extracts_the_same_contents(origin_class, page, parser):
+    origin = origin_class()
+    full_contents = origin._get_sub_chapter_contents(bs4.BeautifulSoup(page, "html.parser"))
+    strained_contents = origin._get_sub_chapter_contents(bs4.BeautifulSoup(page, parser, parse_only=origin_class.sub_chapter_strainer))
+
+    assert full_contents
+    assert strained_contents == full_contents
@@ -0,0 +1,87 @@
+import os
+
+import pytest
+
+from gptwntranslator.storage.response_cache import ResponseCache
+
+
+def make_response(content, finish_reason="stop"):
+    return {"choices": [{"message": {"role": "assistant", "content": content}, "finish_reason": finish_reason}]}
+
+def make_messages(content):
+    return [{"role": "user", "content": content}]
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = ResponseCache()
+    cache.initialize(str(tmp_path), max_size=10 * 1024 * 1024)
+    cache.hits = 0
+    cache.misses = 0
+    yield cache
+    cache.initialize("")
+
+def test_set_and_get_round_trip(cache):
+    messages = make_messages("こんにちは")
+    assert cache.get("gpt-3.5-turbo", messages) is None
+
+    cache.set("gpt-3.5-turbo", messages, make_response("Hello"))
+    assert cache.get("gpt-3.5-turbo", messages) == make_response("Hello")
+    # The key covers the model as well as the messages
+    assert cache.get("gpt-4", messages) is None
+
+def test_incomplete_responses_are_not_stored(cache):
+    messages = make_messages("こんにちは")
+    cache.set("gpt-3.5-turbo", messages, make_response("Hel", finish_reason="length"))
+    assert cache.get("gpt-3.5-turbo", messages) is None
+
+    response = make_response("Hello")
+    response["choices"].append({"message": {"role": "assistant", "content": "Hi"}, "finish_reason": "content_filter"})
+    cache.set("gpt-3.5-turbo", messages, response)
+    assert cache.get("gpt-3.5-turbo", messages) is None
+
+def test_overwriting_an_entry_keeps_the_size_in_step(cache):
+    messages = make_messages("こんにちは")
+    cache.set("gpt-3.5-turbo", messages, make_response("Hello"))
+    cache.set("gpt-3.5-turbo", messages, make_response("Hello there, a longer answer"))
+    cache.set("gpt-3.5-turbo", make_messages("さようなら"), make_response("Goodbye"))
+    assert cache._size == cache._scan_size()
+
+    cache.invalidate("gpt-3.5-turbo", messages)
+    assert cache.get("gpt-3.5-turbo", messages) is None
+    assert cache._size == cache._scan_size()
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = ResponseCache()
+    entry_size = len(f'{make_response("answer 0")}'.encode("utf-8"))
+    cache.initialize(str(tmp_path), max_size=entry_size * 4)
+    try:
+        for i in range(4):
+            cache.set("gpt-3.5-turbo", make_messages(f"question {i}"), make_response(f"answer {i}"))
+            path = cache._path(cache.key("gpt-3.5-turbo", make_messages(f"question {i}")))
+            os.utime(path, (1000 + i, 1000 + i))
+        # Reading the oldest entry makes it the most recently used one
+        cache.get("gpt-3.5-turbo", make_messages("question 0"))
+
+        cache.set("gpt-3.5-turbo", make_messages("question 4"), make_response("answer 4"))
+        assert cache._size <= cache._max_size * 0.9
+        assert cache._size == cache._scan_size()
+        assert cache.get("gpt-3.5-turbo", make_messages("question 1")) is None
+        assert cache.get("gpt-3.5-turbo", make_messages("question 0")) is not None
+        assert cache.get("gpt-3.5-turbo", make_messages("question 4")) is not None
+    finally:
+        cache.initialize("")
+
+def test_stats_count_hits_and_misses(cache):
+    messages = make_messages("こんにちは")
+    cache.get("gpt-3.5-turbo", messages)
+    cache.set("gpt-3.5-turbo", messages, make_response("Hello"))
+    cache.get("gpt-3.5-turbo", messages)
+    cache.get("gpt-3.5-turbo", messages)
+    assert cache.get_stats() == {"hits": 2, "misses": 1}
+
+def test_disabled_cache_stores_nothing(tmp_path):
+    cache = ResponseCache()
+    cache.initialize("")
+    cache.set("gpt-3.5-turbo", make_messages("こんにちは"), make_response("Hello"))
+    assert cache.get("gpt-3.5-turbo", make_messages("こんにちは")) is None
+    assert os.listdir(tmp_path) == []
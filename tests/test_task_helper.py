@@ -0,0 +1,81 @@
+import asyncio
+import random
+
+import pytest
+
+from gptwntranslator.helpers.task_helper import Scheduler, Task
+
+
+class RetryableError(Exception):
+    def __init__(self, retry_after=None):
+        super().__init__("retryable")
+        self.retry_after = retry_after
+
+@pytest.mark.parametrize("seed", range(20))
+def test_next_delay_stays_within_the_jitter_bounds(seed):
+    random.seed(seed)
+    task = Task(1, base_delay=1, max_delay=60)
+    delay = task.base_delay
+    for _ in range(10):
+        previous_delay = delay
+        delay = task._next_delay(previous_delay, RetryableError())
+        assert task.base_delay <= delay <= min(task.max_delay, previous_delay * 3)
+
+def test_next_delay_is_capped_by_the_max_delay():
+    task = Task(1, base_delay=1, max_delay=5)
+    assert all(task._next_delay(100, RetryableError()) <= 5 for _ in range(100))
+
+def test_next_delay_honours_retry_after():
+    task = Task(1, base_delay=1, max_delay=60)
+    assert all(task._next_delay(1, RetryableError(retry_after=20)) >= 20 for _ in range(100))
+    # The header can't push the delay over the cap
+    assert all(task._next_delay(1, RetryableError(retry_after=600)) == 60 for _ in range(100))
+
+def make_flaky(failures):
+    calls = {"count": 0}
+    def flaky(value):
+        calls["count"] += 1
+        if calls["count"] <= failures:
+            raise RetryableError()
+        return value
+    return flaky
+
+@pytest.mark.parametrize("scheduled", [False, True])
+def test_retry_counts_are_kept_per_subtask(scheduled):
+    scheduler = Scheduler(2) if scheduled else None
+    task = Task(2, retry_on_exceptions=(RetryableError,), max_retries=3, base_delay=0, max_delay=0, scheduler=scheduler)
+    steady = task.add_subtask(make_flaky(0), "steady")
+    flaky = task.add_subtask(make_flaky(2), "flaky")
+    failing = task.add_subtask(make_flaky(10), "failing")
+
+    results = task.run_subtasks()
+
+    assert results[steady] == "steady"
+    assert results[flaky] == "flaky"
+    assert isinstance(results[failing], RetryableError)
+    assert task.get_retry_counts() == {steady: 0, flaky: 2, failing: 3}
+
+def test_async_slots_admit_waiters_by_priority():
+    scheduler = Scheduler(1)
+    order = []
+
+    async def request(name):
+        async with scheduler.aslot():
+            order.append(name)
+            await asyncio.sleep(0)
+
+    async def main():
+        task = Task(8, scheduler=scheduler)
+        for priority, name in [((2, 1, 0), "late"), ((1, 1, -1), "sub chapter"), ((1, 1, 0), "chunk"), ((1, 2, 0), "next")]:
+            task.add_prioritized_subtask(priority, request, name)
+        async with scheduler.aslot((0, 0, 0)):
+            # Every subtask queues up behind the held slot
+            running = asyncio.create_task(task.arun_subtasks())
+            await asyncio.sleep(0.01)
+            assert len(scheduler._async_waiters) == 4
+        return await running
+
+    results = asyncio.run(main())
+    assert all(result is None for result in results.values())
+    assert order == ["sub chapter", "chunk", "next", "late"]
+    assert scheduler._async_active == 0
@@ -0,0 +1,41 @@
+import pytest
+
+term_sheet = pytest.importorskip("gptwntranslator.models.term_sheet")
+
+from gptwntranslator.models.term import Term
+
+
+def make_sheet(original_terms):
+    sheet = term_sheet.TermSheet("o", "n", {})
+    for original_term in original_terms:
+        sheet.terms[original_term] = Term(original_term, original_term)
+        sheet._add_to_automaton(original_term)
+    return sheet
+
+def test_snapshot_shares_the_automaton():
+    sheet = make_sheet(["魔王", "魔王城"])
+    automaton, _ = sheet._get_automaton()
+    snapshot = sheet.snapshot()
+
+    assert snapshot._automaton is automaton
+    assert sorted(snapshot._find_terms("魔王城の魔王")) == ["魔王", "魔王城"]
+
+def test_snapshot_ignores_terms_added_to_its_sheet():
+    sheet = make_sheet(["魔王"])
+    snapshot = sheet.snapshot()
+    sheet.terms["王城"] = Term("王城", "oujou")
+    sheet._add_to_automaton("王城")
+
+    assert sorted(sheet._find_terms("魔王城")) == ["王城", "魔王"]
+    assert snapshot._find_terms("魔王城") == ["魔王"]
+    assert snapshot._count_terms("魔王城の魔王") == {"魔王": 2}
+
+def test_snapshot_rebuilds_for_its_own_terms():
+    sheet = make_sheet(["魔王"])
+    snapshot = sheet.snapshot()
+    snapshot.terms["勇者"] = Term("勇者", "yuusha")
+    snapshot._add_to_automaton("勇者")
+
+    assert sorted(snapshot._find_terms("勇者と魔王")) == ["勇者", "魔王"]
+    assert snapshot._automaton is not sheet._automaton
+    assert sheet._find_terms("勇者と魔王") == ["魔王"]